@@ -0,0 +1,79 @@
+"""
+Compares the throughput of AsyncHandTracker (pipeline.aio) with the
+synchronous loop of pipeline.batch on video files.
+
+The videos are written like those of bench_server. Both runners open a
+Hands instance per video, and the time to open it is included. Reports
+frames per second for one video, and for several videos processed one
+after the other (sync) or concurrently on one event loop (async).
+
+Run from the project root:
+    python -m benchmarks.bench_async
+"""
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.bench_server import SCREENSHOTS, write_stream
+from pipeline.aio import AsyncHandTracker
+from pipeline.batch import process
+
+
+def run_sync(paths):
+    frames = 0
+    started = time.perf_counter()
+    for path in paths:
+        for _ in process(path):
+            frames += 1
+    return frames / (time.perf_counter() - started)
+
+
+def run_async(paths):
+    tracker = AsyncHandTracker()
+
+    async def follow(path):
+        return len([r async for r in tracker.stream(path)])
+
+    async def main():
+        return await asyncio.gather(*(follow(p) for p in paths))
+
+    started = time.perf_counter()
+    frames = sum(asyncio.run(main()))
+    return frames / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare the asyncio runner with the sync loop."
+    )
+    parser.add_argument("--streams", type=int, default=3)
+    parser.add_argument("--frames", type=int, default=90)
+    args = parser.parse_args()
+
+    report = {"cpu_count": os.cpu_count()}
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for i in range(args.streams):
+            path = Path(tmp) / f"stream{i}.avi"
+            write_stream(path, SCREENSHOTS[i % len(SCREENSHOTS)], args.frames)
+            paths.append(str(path))
+
+        # Load the model once so the first case is not penalized
+        run_sync(paths[:1])
+
+        cases = {"1_video": paths[:1], f"{len(paths)}_videos": paths}
+        for name, subset in cases.items():
+            report[name] = {
+                "sync_fps": round(run_sync(subset), 1),
+                "async_fps": round(run_async(subset), 1),
+            }
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Compares what a downstream consumer receives from the transitions
+fixture with per-frame results (one pipeline.batch JSONL record per
+frame) and with gesture events (pipeline.events).
+
+Reports, for each output, the number of messages, the bytes written
+and the time per frame to produce them, after classification and
+smoothing.
+
+Run from the project root:
+    python -m benchmarks.bench_events
+"""
+import io
+import json
+
+from benchmarks.bench_suite import bench
+from benchmarks.fixtures import load_fixture
+from gestures.classifier import GESTURES, classify_batch
+from gestures.state import GestureStateBank
+from pipeline.batch import make_record
+from pipeline.events import GestureEventEmitter, JsonlEventSink
+
+
+def main():
+    fixture = load_fixture("transitions")
+    points = fixture["points"]
+    timestamps = fixture["timestamps"]
+
+    # Classification and smoothing are the same for both outputs
+    matches = classify_batch(points)
+    bank = GestureStateBank()
+    shows = []
+    for m in matches:
+        bank.update(m)
+        shows.append(bank.show.copy())
+    handedness = [("Right", 0.98)]
+
+    def per_frame(out):
+        for i, (p, m) in enumerate(zip(points, matches)):
+            record = make_record(
+                i, p[None], m[None], handedness,
+                timestamp_ms=timestamps[i] * 1000.0,
+            )
+            record["active"] = [g for g, s in zip(GESTURES, shows[i][0]) if s]
+            out.write(json.dumps(record) + "\n")
+
+    def events(out):
+        emitter = GestureEventEmitter(GESTURES)
+        emitter.add_listener(JsonlEventSink(out))
+        for t, show in zip(timestamps, shows):
+            emitter.update(show, t, 0.98)
+        emitter.finish(timestamps[-1])
+
+    report = {"frames": len(points)}
+    for name, produce in (("per_frame", per_frame), ("events", events)):
+        out = io.StringIO()
+        produce(out)
+        text = out.getvalue()
+        report[name] = {
+            "messages": text.count("\n"),
+            "bytes": len(text.encode()),
+            "us_per_frame": bench(
+                lambda: produce(io.StringIO()), len(points)
+            ),
+        }
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
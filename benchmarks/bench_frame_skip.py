@@ -0,0 +1,103 @@
+"""
+Measures how much inference adaptive frame skipping saves and how much
+accuracy it costs, on a synthetic 30 FPS landmark sequence with still
+holds, slow drift and fast swipes.
+
+The hand model is simulated: "running inference" returns the true
+landmarks and costs `--inference-ms` of simulated time.
+
+Run from the project root:
+    python -m benchmarks.bench_frame_skip
+"""
+import argparse
+import json
+
+import numpy as np
+
+from benchmarks.synthetic import gesture_sequence
+from gestures.classifier import GESTURES, classify_batch
+from gestures.state import GestureStateBank
+from pipeline.scheduler import AdaptiveInferenceScheduler
+
+FPS = 30.0
+
+
+def make_sequence():
+    """
+    All six gestures with transitions, a slow drift, and a fast
+    left-right swipe during the second half.
+    """
+    names = list(GESTURES) + ["NONE"] + list(reversed(GESTURES))
+    points, labels = gesture_sequence(names, hold_frames=45, motion=0.03)
+
+    # Fast swipe: 0.3 frame widths per half second, back and forth
+    n = len(points)
+    t = np.arange(n) / FPS
+    swipe = np.where(t > t[n // 2], 0.15 * np.sin(2 * np.pi * t), 0.0)
+    points[:, :, 0] += swipe[:, None].astype(np.float32)
+    return points, labels
+
+
+def run(points, scheduler, inference_ms):
+    """
+    Replays `points` through the scheduler and returns the landmarks the
+    classifiers would see on each frame.
+    """
+    seen = np.empty_like(points)
+    for i, truth in enumerate(points):
+        t = i / FPS
+        if scheduler.should_infer(t):
+            scheduler.observe(truth[None], t, inference_ms / 1000.0)
+            seen[i] = truth
+        else:
+            seen[i] = scheduler.predict(t)[0]
+    return seen
+
+
+def smoothed(detections):
+    """
+    Returns the displayed gesture index per frame after smoothing.
+    """
+    state = GestureStateBank()
+    out = np.empty(len(detections), dtype=np.int8)
+    for i, d in enumerate(detections):
+        state.update(d)
+        out[i] = state.active()[0]
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--inference-ms", type=float, default=12.0,
+        help="simulated model run time per frame"
+    )
+    parser.add_argument("--max-skip", type=int, default=4)
+    args = parser.parse_args()
+
+    points, _ = make_sequence()
+    scheduler = AdaptiveInferenceScheduler(max_skip=args.max_skip)
+    seen = run(points, scheduler, args.inference_ms)
+
+    truth_raw = classify_batch(points)
+    seen_raw = classify_batch(seen)
+    truth_shown = smoothed(truth_raw)
+    seen_shown = smoothed(seen_raw)
+
+    # Landmark error in normalized image units
+    error = np.linalg.norm(seen[..., :2] - points[..., :2], axis=-1)
+
+    report = {
+        "frames": len(points),
+        "inference_ratio": round(scheduler.inference_ratio, 4),
+        "inference_cpu_saved": round(1 - scheduler.inference_ratio, 4),
+        "landmark_error_mean": round(float(error.mean()), 5),
+        "landmark_error_p95": round(float(np.percentile(error, 95)), 5),
+        "raw_agreement": round(float((seen_raw == truth_raw).all(1).mean()), 4),
+        "shown_agreement": round(float((seen_shown == truth_shown).mean()), 4),
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
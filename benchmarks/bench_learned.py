@@ -0,0 +1,116 @@
+"""
+Compares the learned gesture classifier (gestures.learned) with the
+rule-based path, raw and normalized.
+
+The model is trained on the single-gesture fixtures, randomly tilted by
+up to 30 degrees and rescaled, and tested on the transitions fixture,
+which it never sees: at fixed tilts, and with the wobbling tilt and
+distance of bench_normalize. Reports:
+- the fraction of held frames given the held gesture (the rules are
+  resolved by display priority, like the demo),
+- the classification time per frame with one hand, and per hand in a
+  batch of 1000 hands,
+- the training time.
+
+Run from the project root:
+    python -m benchmarks.bench_learned
+"""
+import json
+import time
+
+import numpy as np
+
+from benchmarks.bench_normalize import transform, wobble
+from benchmarks.bench_suite import bench
+from benchmarks.fixtures import FIXTURES, load_fixture
+from gestures.classifier import GESTURES, finger_features_batch
+from gestures.learned import NONE, LearnedClassifier
+from gestures.normalize import normalized_features_batch
+from gestures.registry import default_registry
+
+ANGLES = (0, 15, 30, 45)
+BATCH_HANDS = 1000
+COPIES = 4
+
+
+def training_set(rng):
+    """
+    Returns (points, labels) from the single-gesture fixtures, with
+    COPIES randomly tilted and rescaled copies of each.
+    """
+    points = []
+    labels = []
+    for name in FIXTURES:
+        if name == "transitions":
+            continue
+        fixture = load_fixture(name)
+        n = len(fixture["points"])
+
+        # Frames without a held gesture are the NONE class
+        label = fixture["labels"]
+        label = np.where(label >= 0, label, len(GESTURES))
+
+        for _ in range(COPIES):
+            angles = np.radians(rng.uniform(-30, 30, n))
+            points.append(
+                transform(fixture["points"], angles, rng.uniform(0.5, 1.5, n))
+            )
+            labels.append(label)
+    return np.concatenate(points), np.concatenate(labels)
+
+
+def main():
+    rng = np.random.default_rng(0)
+    points, labels = training_set(rng)
+
+    started = time.perf_counter()
+    model = LearnedClassifier.fit(points, labels, GESTURES + (NONE,))
+    train_s = time.perf_counter() - started
+
+    registry = default_registry()
+    classifiers = {
+        "rules_raw": lambda p: registry.match_best(finger_features_batch(p)),
+        "rules_normalized": lambda p: registry.match_best(
+            normalized_features_batch(p)
+        ),
+        "learned": model.predict,
+    }
+
+    fixture = load_fixture("transitions")
+    test = fixture["points"]
+    held = fixture["labels"] >= 0
+    expected = fixture["labels"][held]
+
+    cases = {
+        f"{angle}deg": transform(
+            test, np.full(len(test), np.radians(angle)), np.ones(len(test))
+        )
+        for angle in ANGLES
+    }
+    cases["wobble"] = transform(test, *wobble(len(test)))
+
+    frames = [p[None] for p in cases["wobble"]]
+    hands = cases["wobble"][rng.integers(0, len(test), BATCH_HANDS)]
+
+    report = {"training_hands": len(points), "train_s": round(train_s, 3)}
+    for name, predict in classifiers.items():
+        def per_frame():
+            for p in frames:
+                predict(p)
+
+        report[name] = {
+            "accuracy": {
+                case: round(float((predict(p)[held] == expected).mean()), 3)
+                for case, p in cases.items()
+            },
+            "us_per_frame": bench(per_frame, len(frames)),
+            "us_per_hand_batched": bench(
+                lambda: predict(hands), BATCH_HANDS
+            ),
+        }
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+Compares the raw-coordinate gesture rules with the same rules on
+normalized landmarks (gestures.normalize).
+
+The transitions fixture is replayed with the hand tilted and moved
+closer to or further from the camera, first at fixed angles and scales,
+then with a slowly wobbling tilt and distance. For each classifier it
+reports:
+- the fraction of held frames where the highest-priority gesture is the
+  held one, per tilt and scale,
+- after smoothing with several on_frames values, the number of changes
+  of the displayed gesture and the fraction of held frames shown
+  with the right gesture,
+- the classification time per frame.
+
+Run from the project root:
+    python -m benchmarks.bench_normalize
+"""
+import json
+
+import numpy as np
+
+from benchmarks.bench_suite import bench
+from benchmarks.fixtures import FPS, load_fixture
+from gestures.classifier import finger_features_batch
+from gestures.normalize import normalized_features_batch
+from gestures.registry import default_registry
+from gestures.state import GestureStateBank
+
+ANGLES = (0, 15, 30)
+SCALES = (0.5, 1.0, 1.5)
+ON_FRAMES = (1, 2, 3)
+
+CLASSIFIERS = {
+    "raw": finger_features_batch,
+    "normalized": normalized_features_batch,
+}
+
+
+def transform(points, angles, scales):
+    """
+    Rotates each frame of a (frames, 21, 3) sequence about its wrist by
+    `angles` (radians) and scales it by `scales`, both per frame.
+    """
+    wrist = points[:, :1, :]
+    offsets = points - wrist
+    c = np.cos(angles)[:, None]
+    s = np.sin(angles)[:, None]
+    k = np.asarray(scales, dtype=np.float64)[:, None]
+
+    x = offsets[..., 0]
+    y = offsets[..., 1]
+
+    out = points.copy()
+    out[..., 0] = wrist[..., 0] + k * (c * x - s * y)
+    out[..., 1] = wrist[..., 1] + k * (s * x + c * y)
+    out[..., 2] = wrist[..., 2] + k * offsets[..., 2]
+    return out
+
+
+def wobble(num_frames):
+    """
+    Per-frame tilt (up to 25 degrees either way) and scale (0.6 to 1.4)
+    drifting at different rates, like a hand that is never held still.
+    """
+    t = np.arange(num_frames) / FPS
+    angles = np.radians(25) * np.sin(2 * np.pi * t / 3.1)
+    scales = 1.0 + 0.4 * np.sin(2 * np.pi * t / 4.3 + 1.0)
+    return angles, scales
+
+
+def shown_gestures(registry, features, on_frames):
+    """
+    Runs a GestureStateBank over per-frame features and returns the
+    gesture shown on each frame, -1 for none.
+    """
+    state = GestureStateBank(
+        registry.names, registry.priority_order,
+        on_frames=on_frames, off_frames=5,
+    )
+    shown = np.empty(len(features), dtype=np.int16)
+    for i, detected in enumerate(registry.match(features)):
+        state.update(detected)
+        shown[i] = state.active()[0]
+    return shown
+
+
+def main():
+    fixture = load_fixture("transitions")
+    points = fixture["points"]
+    labels = fixture["labels"]
+    held = labels >= 0
+
+    registry = default_registry()
+    report = {}
+
+    for name, features_fn in CLASSIFIERS.items():
+        accuracy = {}
+        for angle in ANGLES:
+            for scale in SCALES:
+                n = len(points)
+                moved = transform(
+                    points, np.full(n, np.radians(angle)), np.full(n, scale)
+                )
+                best = registry.match_best(features_fn(moved))
+                accuracy[f"{angle}deg_x{scale}"] = round(
+                    float((best[held] == labels[held]).mean()), 3
+                )
+
+        moved = transform(points, *wobble(len(points)))
+        features = features_fn(moved)
+        smoothing = {}
+        for on_frames in ON_FRAMES:
+            shown = shown_gestures(registry, features, on_frames)
+            smoothing[f"on_frames_{on_frames}"] = {
+                "changes": int((shown[1:] != shown[:-1]).sum()),
+                "held_correct": round(
+                    float((shown[held] == labels[held]).mean()), 3
+                ),
+            }
+
+        frames = [p[None] for p in moved]
+
+        def per_frame():
+            for p in frames:
+                registry.match(features_fn(p))
+
+        report[name] = {
+            "accuracy": accuracy,
+            "wobble": smoothing,
+            "us_per_frame": bench(per_frame, len(frames)),
+        }
+
+    # Reference: changes of the held-gesture labels, transitions included
+    report["label_changes"] = int((labels[1:] != labels[:-1]).sum())
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
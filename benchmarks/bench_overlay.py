@@ -0,0 +1,74 @@
+"""
+Compares the float overlay_image path with the cached fixed-point
+sprite path on a 1080p frame. Both blend the icon at the size
+overlay_icon draws it (at most ICON_SIZE).
+
+Run from the project root:
+    python -m benchmarks.bench_overlay
+"""
+import timeit
+
+import cv2
+import numpy as np
+
+from gestures.utils import (
+    ICON_SIZE,
+    Sprite,
+    load_image,
+    load_sprite,
+    overlay_icon,
+    overlay_image,
+    overlay_sprite,
+)
+
+FRAME_SIZE = (1080, 1920)
+ICONS = ("fist.png", "one.png", "peace.png", "stop.png",
+         "thumbs_up.png", "thumbs_down.png")
+
+
+def bench(fn, number=200):
+    """
+    Returns the best average time per call in microseconds.
+    """
+    best = min(timeit.repeat(fn, number=number, repeat=5))
+    return best / number * 1e6
+
+
+def main():
+    rng = np.random.default_rng(0)
+    frame = rng.integers(0, 256, FRAME_SIZE + (3,), dtype=np.uint8)
+
+    print(f"{'icon':<16}{'float':>16}{'sprite':>16}{'speedup':>10}")
+    for name in ICONS:
+        # Warm up the sprite cache so only blending is measured
+        overlay_icon(frame, name, 20, 20)
+        sprite = load_sprite(name, ICON_SIZE)
+        img = cv2.resize(
+            load_image(name), (sprite.width, sprite.height),
+            interpolation=cv2.INTER_AREA,
+        )
+
+        t_float = bench(lambda: overlay_image(frame, img, 20, 20))
+        t_sprite = bench(lambda: overlay_icon(frame, name, 20, 20))
+        print(
+            f"{name:<16}{t_float:>13.1f} us{t_sprite:>13.1f} us"
+            f"{t_float / t_sprite:>9.2f}x"
+        )
+
+    # The bundled icons have no alpha channel; also measure a BGRA sprite
+    # to cover the per-pixel fixed-point path
+    img = load_image("peace.png")
+    alpha = rng.integers(0, 256, img.shape[:2] + (1,), dtype=np.uint8)
+    bgra = np.concatenate([img, alpha], axis=2)
+    sprite = Sprite(bgra)
+
+    t_float = bench(lambda: overlay_image(frame, bgra, 20, 20))
+    t_sprite = bench(lambda: overlay_sprite(frame, sprite, 20, 20))
+    print(
+        f"{'peace (BGRA)':<16}{t_float:>13.1f} us{t_sprite:>13.1f} us"
+        f"{t_float / t_sprite:>9.2f}x"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Measures the cost of StageProfiler instrumentation: one timed stage with
+profiling disabled and enabled, summaries, and drawing the HUD.
+
+Run from the project root:
+    python -m benchmarks.bench_profiler
+"""
+import json
+import time
+
+import numpy as np
+
+from pipeline.profiler import StageProfiler, draw_hud
+
+STAGES = (
+    "capture", "flip", "to_rgb", "inference", "landmarks",
+    "classify", "smoothing", "overlay", "display",
+)
+ITERATIONS = 20000
+
+
+def time_us(fn, iterations=ITERATIONS):
+    """
+    Returns the mean run time of fn() in microseconds.
+    """
+    started = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - started) / iterations * 1e6
+
+
+def main():
+    disabled = StageProfiler(enabled=False)
+    enabled = StageProfiler()
+
+    def stage(profiler):
+        with profiler.stage("inference"):
+            pass
+
+    def frame(profiler):
+        for name in STAGES:
+            with profiler.stage(name):
+                pass
+        profiler.frame_done()
+
+    frame(enabled)
+    canvas = np.zeros((720, 1280, 3), dtype=np.uint8)
+
+    report = {
+        "stage_disabled_us": round(time_us(lambda: stage(disabled)), 3),
+        "stage_enabled_us": round(time_us(lambda: stage(enabled)), 3),
+        "frame_disabled_us": round(time_us(lambda: frame(disabled)), 3),
+        "frame_enabled_us": round(time_us(lambda: frame(enabled)), 3),
+        "summary_us": round(time_us(enabled.summary, 1000), 3),
+        "hud_us": round(time_us(lambda: draw_hud(canvas, enabled), 1000), 3),
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
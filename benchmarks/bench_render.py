@@ -0,0 +1,118 @@
+"""
+Measures how much a slow display holds back the camera loop, with
+rendering inline (draw, show, then the next frame) and on an
+AsyncRenderer.
+
+Inference is simulated by a fixed wait per frame, and the display by
+a wait per shown frame (standing in for cv2.imshow, waitKey and a
+vsync-limited screen); the overlays are really drawn on 720p frames.
+For each display cost, reports the loop rate and, for the async
+renderer, how many frames were shown or skipped.
+
+Run from the project root:
+    python -m benchmarks.bench_render
+"""
+import argparse
+import json
+import time
+
+import cv2
+import numpy as np
+
+from gestures.registry import default_registry
+from gestures.utils import overlay_icon
+from pipeline.render import AsyncRenderer
+
+FRAME_SIZE = (720, 1280)
+DISPLAY_MS = (5, 20, 40)
+
+
+def make_draw(registry):
+    def draw(frame, active):
+        registry.draw(frame, active)
+        cv2.putText(
+            frame, "bench", (20, 120), cv2.FONT_HERSHEY_SIMPLEX,
+            1.2, (0, 255, 0), 3,
+        )
+    return draw
+
+
+def make_show(display_ms):
+    def show(frame):
+        time.sleep(display_ms / 1000.0)
+        return -1
+    return show
+
+
+def run_inline(frames, draw, show, inference_ms):
+    """
+    Returns the loop rate with drawing and display after each frame.
+    """
+    started = time.perf_counter()
+    for i, frame in enumerate(frames):
+        time.sleep(inference_ms / 1000.0)
+        draw(frame, i % 6)
+        show(frame)
+    return {"loop_fps": round(len(frames) / (time.perf_counter() - started), 1)}
+
+
+def run_async(frames, draw, show, inference_ms, max_fps):
+    """
+    Returns the loop rate and render counters with an AsyncRenderer.
+    """
+    renderer = AsyncRenderer(draw, max_fps=max_fps, show=show).start()
+
+    started = time.perf_counter()
+    for i, frame in enumerate(frames):
+        time.sleep(inference_ms / 1000.0)
+        renderer.submit(frame, i % 6)
+    elapsed = time.perf_counter() - started
+
+    # Let the last frame be shown before reading the counters
+    time.sleep(0.1)
+    renderer.stop()
+
+    stats = renderer.stats()
+    return {
+        "loop_fps": round(len(frames) / elapsed, 1),
+        "frames_rendered": stats["frames_rendered"],
+        "frames_skipped": stats["frames_skipped"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare inline and asynchronous rendering."
+    )
+    parser.add_argument("--frames", type=int, default=120)
+    parser.add_argument("--inference-ms", type=float, default=15.0)
+    parser.add_argument("--max-fps", type=float, default=60.0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    background = rng.integers(0, 256, FRAME_SIZE + (3,), dtype=np.uint8)
+    frames = [background.copy() for _ in range(args.frames)]
+
+    registry = default_registry()
+    draw = make_draw(registry)
+
+    # Decode the icons before timing
+    for spec in registry:
+        if spec.icon is not None:
+            overlay_icon(background.copy(), spec.icon, 20, 20)
+
+    report = {"inference_ms": args.inference_ms}
+    for display_ms in DISPLAY_MS:
+        show = make_show(display_ms)
+        report[f"display_{display_ms}ms"] = {
+            "inline": run_inline(frames, draw, show, args.inference_ms),
+            "async": run_async(
+                frames, draw, show, args.inference_ms, args.max_fps
+            ),
+        }
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
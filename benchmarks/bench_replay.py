@@ -0,0 +1,65 @@
+"""
+Measures landmark recording and replay on a synthetic one-hour session
+(the transitions fixture looped at 30 FPS, one hand per frame).
+
+Run from the project root:
+    python -m benchmarks.bench_replay
+"""
+import json
+import os
+import tempfile
+import time
+
+from benchmarks.fixtures import load_fixture
+from gestures.classifier import classify_batch
+from pipeline.recording import LandmarkRecorder, LandmarkRecording
+from pipeline.replay import replay
+
+FPS = 30.0
+HOURS = 1.0
+
+
+def main():
+    points = load_fixture("transitions")["points"]
+    num_frames = int(HOURS * 3600 * FPS)
+    handedness = [("Right", 0.98)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "session.lmk")
+
+        started = time.perf_counter()
+        with LandmarkRecorder(path, max_num_hands=1) as recorder:
+            for i in range(num_frames):
+                p = points[i % len(points)]
+                recorder.write(i / FPS, p[None], handedness)
+        write_s = time.perf_counter() - started
+
+        started = time.perf_counter()
+        recording = LandmarkRecording(path)
+        open_s = time.perf_counter() - started
+
+        started = time.perf_counter()
+        classify_batch(recording.points)
+        classify_s = time.perf_counter() - started
+
+        started = time.perf_counter()
+        for _ in replay(recording):
+            pass
+        replay_s = time.perf_counter() - started
+
+        report = {
+            "frames": num_frames,
+            "file_mb": round(os.path.getsize(path) / 2**20, 2),
+            "write_fps": round(num_frames / write_s),
+            "open_ms": round(open_s * 1000, 2),
+            "bulk_classify_fps": round(num_frames / classify_s),
+            "replay_records_fps": round(num_frames / replay_s),
+            "session_speedup": round(num_frames / FPS / replay_s, 1),
+        }
+        recording.close()
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
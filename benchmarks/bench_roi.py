@@ -0,0 +1,83 @@
+"""
+Compares full-resolution inference with RoiHandTracker on 1080p and 4K
+frames, using a demo screenshot pasted onto a larger canvas and moved a
+few pixels per frame.
+
+Run from the project root:
+    python -m benchmarks.bench_roi
+"""
+import json
+import time
+
+import cv2
+import mediapipe as mp
+import numpy as np
+
+from gestures.classifier import multi_hand_to_array
+from gestures.utils import ROOT_DIR
+from pipeline.roi import RoiHandTracker
+
+FRAME_SIZES = ((1080, 1920), (2160, 3840))
+NUM_FRAMES = 90
+
+
+def make_frames(height, width):
+    """
+    Returns frames with a hand moving 6 pixels per frame to the right.
+    """
+    img = cv2.imread(str(ROOT_DIR / "screenshots" / "demo_stop.png"))
+    img = cv2.resize(img, None, fx=0.5, fy=0.5)
+
+    canvas = np.full((height, width, 3), 60, dtype=np.uint8)
+    canvas[200:200 + img.shape[0], 300:300 + img.shape[1]] = img
+    return [np.roll(canvas, 6 * i, axis=1) for i in range(NUM_FRAMES)]
+
+
+def run(frames, roi):
+    """
+    Returns (landmarks per frame, mean ms per frame).
+    """
+    out = []
+    with mp.solutions.hands.Hands(max_num_hands=1) as hands:
+        tracker = RoiHandTracker(hands) if roi else None
+
+        started = time.perf_counter()
+        for frame in frames:
+            if tracker is not None:
+                result = tracker.process(frame)
+            else:
+                result = hands.process(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+
+            hands_lm = result.multi_hand_landmarks
+            out.append(multi_hand_to_array(hands_lm)[0] if hands_lm else None)
+        elapsed = time.perf_counter() - started
+
+    return out, elapsed / len(frames) * 1000
+
+
+def main():
+    report = []
+    for height, width in FRAME_SIZES:
+        frames = make_frames(height, width)
+        full, full_ms = run(frames, roi=False)
+        cropped, roi_ms = run(frames, roi=True)
+
+        # Landmark difference to the full-resolution result, in pixels
+        diff = [
+            np.abs(a[:, :2] - b[:, :2]).max() * width
+            for a, b in zip(full, cropped) if a is not None and b is not None
+        ]
+        report.append({
+            "frame_size": f"{width}x{height}",
+            "full_ms": round(full_ms, 2),
+            "roi_ms": round(roi_ms, 2),
+            "full_detected": sum(p is not None for p in full),
+            "roi_detected": sum(p is not None for p in cropped),
+            "landmark_diff_px": round(float(np.mean(diff)), 2),
+        })
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
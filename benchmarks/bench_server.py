@@ -0,0 +1,103 @@
+"""
+Measures the throughput of pipeline.server.GestureServer with several
+video streams and a growing number of hand-model workers.
+
+Each stream is a short 640x480 video written to a temporary directory,
+with one of the demo screenshots moving a few pixels per frame. For each
+worker count, reports the frames processed per second over all streams,
+the mean inference time per frame in the workers, and how evenly the
+frames were spread over the streams. Workers only run in parallel with
+as many CPU cores; the core count is part of the report.
+
+Run from the project root:
+    python -m benchmarks.bench_server
+    python -m benchmarks.bench_server --streams 4 --workers 1 2 4
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from gestures.utils import ROOT_DIR
+from pipeline.server import GestureServer
+
+FRAME_SIZE = (480, 640)
+SCREENSHOTS = ("demo_stop", "demo_peace", "demo_fist", "demo_finger")
+
+
+def write_stream(path, screenshot, num_frames):
+    """
+    Writes a video with a screenshot moving 4 pixels per frame.
+    """
+    height, width = FRAME_SIZE
+    img = cv2.imread(str(ROOT_DIR / "screenshots" / f"{screenshot}.png"))
+    scale = min(0.8 * height / img.shape[0], 0.6 * width / img.shape[1])
+    img = cv2.resize(img, None, fx=scale, fy=scale)
+
+    canvas = np.full((height, width, 3), 60, dtype=np.uint8)
+    y = (height - img.shape[0]) // 2
+    canvas[y:y + img.shape[0], 20:20 + img.shape[1]] = img
+
+    writer = cv2.VideoWriter(
+        str(path), cv2.VideoWriter_fourcc(*"MJPG"), 30.0, (width, height)
+    )
+    for i in range(num_frames):
+        writer.write(np.roll(canvas, 4 * i, axis=1))
+    writer.release()
+
+
+def run(paths, workers):
+    """
+    Returns the throughput and per-stream frame counts of one server.
+    """
+    counts = [0] * len(paths)
+    with GestureServer(paths, workers=workers) as server:
+        # Timed after the models are loaded
+        started = time.perf_counter()
+        for record in server:
+            counts[record["stream"]] += 1
+        elapsed = time.perf_counter() - started
+
+        inference_ms = (
+            server.inference_seconds / max(1, server.frames_processed) * 1000
+        )
+
+    return {
+        "fps": round(sum(counts) / elapsed, 1),
+        "inference_ms": round(inference_ms, 2),
+        "frames_per_stream": counts,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Measure GestureServer throughput per worker count."
+    )
+    parser.add_argument("--streams", type=int, default=3)
+    parser.add_argument("--frames", type=int, default=60)
+    parser.add_argument(
+        "--workers", type=int, nargs="+", default=[1, 2, 4]
+    )
+    args = parser.parse_args()
+
+    report = {"cpu_count": os.cpu_count(), "streams": args.streams}
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for i in range(args.streams):
+            path = Path(tmp) / f"stream{i}.avi"
+            write_stream(path, SCREENSHOTS[i % len(SCREENSHOTS)], args.frames)
+            paths.append(str(path))
+
+        for workers in args.workers:
+            report[f"workers_{workers}"] = run(paths, workers)
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
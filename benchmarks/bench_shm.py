@@ -0,0 +1,133 @@
+"""
+Compares two ways of handing frames to another process: pickling them
+through a multiprocessing.Queue, and writing them into a
+SharedFrameRing (pipeline.shm) and sending only the slot index.
+
+The consumer converts every frame to RGB, like the first step of
+inference, and answers with a few bytes; up to SLOTS frames are in
+flight. For each frame size, reports frames per second and the frame
+bytes moved per second.
+
+Run from the project root:
+    python -m benchmarks.bench_shm
+"""
+import argparse
+import json
+import multiprocessing
+import time
+
+import cv2
+import numpy as np
+
+from pipeline.shm import SharedFrameRing
+
+FRAME_SIZES = ((720, 1280), (1080, 1920), (2160, 3840))
+SLOTS = 4
+
+
+def consume(tasks, results):
+    """
+    Consumer process: converts each frame and answers with its mean.
+    """
+    rgb = None
+    ring = None
+    while True:
+        job = tasks.get()
+        if job is None:
+            break
+
+        if isinstance(job, np.ndarray):
+            frame, slot = job, None
+        else:
+            spec, slot = job
+            if ring is None or ring.spec != spec:
+                ring = SharedFrameRing.attach(spec)
+            frame = ring[slot]
+
+        if rgb is None or rgb.shape != frame.shape:
+            rgb = np.empty_like(frame)
+        cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=rgb)
+        results.put((slot, float(rgb[::64, ::64].mean())))
+
+    if ring is not None:
+        ring.close()
+
+
+def run(ctx, frames, shared):
+    """
+    Returns frames per second through a consumer process.
+    """
+    tasks = ctx.Queue()
+    results = ctx.Queue()
+    worker = ctx.Process(target=consume, args=(tasks, results), daemon=True)
+    worker.start()
+
+    ring = SharedFrameRing(frames[0].shape, SLOTS) if shared else None
+    try:
+        # Warm up the consumer (and its attachment to the ring)
+        if ring is None:
+            tasks.put(frames[0])
+        else:
+            tasks.put((ring.spec, ring.write(frames[0])))
+        slot, _ = results.get()
+        if ring is not None:
+            ring.release(slot)
+
+        started = time.perf_counter()
+        in_flight = 0
+        for frame in frames:
+            if in_flight == SLOTS:
+                slot, _ = results.get()
+                in_flight -= 1
+                if ring is not None:
+                    ring.release(slot)
+
+            if ring is None:
+                tasks.put(frame)
+            else:
+                tasks.put((ring.spec, ring.write(frame)))
+            in_flight += 1
+
+        for _ in range(in_flight):
+            results.get()
+        elapsed = time.perf_counter() - started
+    finally:
+        tasks.put(None)
+        worker.join()
+        if ring is not None:
+            ring.close()
+
+    return len(frames) / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare pickled and shared-memory frame transport."
+    )
+    parser.add_argument("--frames", type=int, default=120)
+    args = parser.parse_args()
+
+    ctx = multiprocessing.get_context("spawn")
+    rng = np.random.default_rng(0)
+
+    report = []
+    for height, width in FRAME_SIZES:
+        # A few distinct frames, so nothing stays hot in the cache
+        distinct = [
+            rng.integers(0, 256, (height, width, 3), dtype=np.uint8)
+            for _ in range(SLOTS + 1)
+        ]
+        frames = [distinct[i % len(distinct)] for i in range(args.frames)]
+        mb = frames[0].nbytes / 1e6
+
+        row = {"frame": f"{width}x{height}", "frame_mb": round(mb, 1)}
+        for name, shared in (("pickle", False), ("shared", True)):
+            fps = run(ctx, frames, shared)
+            row[name] = {"fps": round(fps, 1), "mb_per_s": round(fps * mb)}
+        report.append(row)
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Measures cold-start time: each case runs in a fresh Python process, the
+way spawned batch workers start. Reports the median wall time of the
+whole process, including interpreter start-up.
+
+Run from the project root:
+    python -m benchmarks.bench_startup
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+
+CASES = {
+    "python": "pass",
+    "import_classifier": "import gestures.classifier",
+    "import_handTracker": "import handTracker",
+    "import_batch": "import pipeline.batch",
+    "import_replay": "import pipeline.replay",
+    "import_mediapipe": "import mediapipe",
+    "first_draw": (
+        "import numpy as np\n"
+        "import handTracker\n"
+        "from gestures.registry import default_registry\n"
+        "frame = np.zeros((720, 1280, 3), np.uint8)\n"
+        "for spec in default_registry():\n"
+        "    spec.draw(frame)\n"
+    ),
+    "hands_ready": (
+        "import mediapipe as mp\n"
+        "mp.solutions.hands.Hands().close()\n"
+    ),
+}
+
+# Printed by each case to tell whether MediaPipe got imported
+PROBE = "\nimport sys\nprint('mediapipe' in sys.modules)\n"
+
+
+def run_case(code):
+    """
+    Returns (seconds, whether mediapipe was imported) for one fresh
+    process running `code`.
+    """
+    started = time.perf_counter()
+    out = subprocess.run(
+        [sys.executable, "-c", code + PROBE],
+        capture_output=True, text=True, check=True,
+    ).stdout
+    elapsed = time.perf_counter() - started
+    return elapsed, out.strip().endswith("True")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    report = {}
+    for name, code in CASES.items():
+        times = []
+        for _ in range(args.runs):
+            elapsed, mediapipe = run_case(code)
+            times.append(elapsed)
+        report[name] = {
+            "median_ms": round(statistics.median(times) * 1000, 1),
+            "min_ms": round(min(times) * 1000, 1),
+            "imports_mediapipe": mediapipe,
+        }
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,367 @@
+"""
+Benchmark suite over the synthetic landmark fixtures in benchmarks/data.
+
+Measures:
+- each is_* predicate on every fixture (microseconds per call),
+- the vectorized classifier per frame and per fixture, and the
+  registry's priority-resolved lookup per frame,
+- each *Gesture.update and GestureStateBank.update,
+- overlay_image and overlay_icon at several frame sizes,
+- an end-to-end replay of the transitions fixture through the demo's
+  per-frame work (landmark drawing, classification, smoothing and
+  overlay), with both the per-gesture classes and the vectorized path.
+
+No camera or hand model is needed. Results are printed or written as
+JSON; pass an earlier result to --compare to list the metrics that got
+slower:
+
+    python -m benchmarks.bench_suite -o before.json
+    python -m benchmarks.bench_suite --compare before.json
+"""
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+import timeit
+
+import cv2
+import mediapipe as mp
+import numpy as np
+
+from benchmarks.fixtures import FIXTURES, load_fixture, to_hand_landmarks
+from gestures.classifier import GESTURES, classify_batch
+from gestures.fistHand import FistGesture, is_fist
+from gestures.oneFingerHand import OneFingerGesture, is_one_finger
+from gestures.peaceHand import PeaceGesture, is_peace_sign
+from gestures.registry import default_registry
+from gestures.state import DEFAULT_PRIORITY, GestureStateBank
+from gestures.stopHand import StopGesture, is_open_palm
+from gestures.thumbsDownHand import ThumbsDownGesture, is_thumbs_down
+from gestures.thumbsUpHand import ThumbsUpGesture, is_thumbs_up
+from gestures.utils import load_image, overlay_icon, overlay_image
+from handTracker import array_to_landmarks
+
+mp_hands = mp.solutions.hands
+mp_drawing = mp.solutions.drawing_utils
+mp_styles = mp.solutions.drawing_styles
+
+# Predicates and smoothing classes, in the same order as GESTURES
+PREDICATES = (
+    is_open_palm,
+    is_peace_sign,
+    is_fist,
+    is_one_finger,
+    is_thumbs_up,
+    is_thumbs_down,
+)
+GESTURE_CLASSES = (
+    StopGesture,
+    PeaceGesture,
+    FistGesture,
+    OneFingerGesture,
+    ThumbsUpGesture,
+    ThumbsDownGesture,
+)
+
+# Indices into the tuples above, in the original if/elif priority
+PRIORITY_ORDER = tuple(GESTURES.index(name) for name in DEFAULT_PRIORITY)
+
+FRAME_SIZES = {
+    "480p": (480, 640),
+    "720p": (720, 1280),
+    "1080p": (1080, 1920),
+    "2160p": (2160, 3840),
+}
+REPLAY_SIZE = (720, 1280)
+
+
+def bench(fn, calls=1, repeat=5, min_time=0.05):
+    """
+    Returns the best time of fn() divided by `calls`, in microseconds.
+    `calls` is the number of operations one fn() call performs.
+
+    Each of the `repeat` measurements runs fn() often enough to take at
+    least `min_time` seconds, which keeps short benchmarks stable.
+    """
+    timer = timeit.Timer(fn)
+    number = 1
+    while timer.timeit(number) < min_time:
+        number *= 2
+    best = min(timer.repeat(number=number, repeat=repeat))
+    return round(best / number / calls * 1e6, 3)
+
+
+def bench_predicates(fixtures, repeat):
+    out = {}
+    for fn in PREDICATES:
+        out[fn.__name__] = {}
+        for name, lms in fixtures.items():
+            def run():
+                for lm in lms:
+                    fn(lm, mp_hands)
+            out[fn.__name__][name] = bench(run, len(lms), repeat=repeat)
+    return out
+
+
+def bench_classifier(points, repeat):
+    frames = [p[None] for p in points]
+
+    def per_frame():
+        for p in frames:
+            classify_batch(p)
+
+    registry = default_registry()
+
+    def registry_best():
+        for p in frames:
+            registry.best(p)
+
+    return {
+        "per_frame": bench(per_frame, len(frames), repeat=repeat),
+        "per_fixture": bench(lambda: classify_batch(points), repeat=repeat),
+        "registry_best_per_frame": bench(
+            registry_best, len(frames), repeat=repeat
+        ),
+    }
+
+
+def bench_smoothing(detected, repeat):
+    out = {}
+    for g, cls in enumerate(GESTURE_CLASSES):
+        column = detected[:, g].tolist()
+
+        def run():
+            gesture = cls()
+            for d in column:
+                gesture.update(d)
+        out[cls.__name__] = bench(run, len(column), repeat=repeat)
+
+    rows = list(detected)
+
+    def run_bank():
+        bank = GestureStateBank()
+        for d in rows:
+            bank.update(d)
+    out["GestureStateBank"] = bench(run_bank, len(rows), repeat=repeat)
+    return out
+
+
+def bench_overlay(repeat):
+    img = load_image("peace.png")
+    out = {}
+    for label, size in FRAME_SIZES.items():
+        frame = np.zeros(size + (3,), dtype=np.uint8)
+        overlay_icon(frame, "peace.png", 20, 20)
+        out[label] = {
+            "overlay_image": bench(
+                lambda: overlay_image(frame, img, 20, 20), repeat=repeat
+            ),
+            "overlay_icon": bench(
+                lambda: overlay_icon(frame, "peace.png", 20, 20),
+                repeat=repeat,
+            ),
+        }
+    return out
+
+
+def draw_landmarks(frame, hand_lm):
+    mp_drawing.draw_landmarks(
+        frame,
+        hand_lm,
+        mp_hands.HAND_CONNECTIONS,
+        mp_styles.get_default_hand_landmarks_style(),
+        mp_styles.get_default_hand_connections_style()
+    )
+
+
+def replay_classes(points, background):
+    """
+    Per-frame work of the original demo loop: six predicates and six
+    smoothing classes. Returns frames per second.
+    """
+    frame = np.empty_like(background)
+    gestures = [cls() for cls in GESTURE_CLASSES]
+
+    started = time.perf_counter()
+    for p in points:
+        np.copyto(frame, background)
+        hand_lm = array_to_landmarks(p)
+        draw_landmarks(frame, hand_lm)
+        for fn, gesture in zip(PREDICATES, gestures):
+            gesture.update(fn(hand_lm, mp_hands))
+
+        # The original loop drew the highest-priority active gesture only
+        for g in PRIORITY_ORDER:
+            if gestures[g].show:
+                gestures[g].draw(frame)
+                break
+    elapsed = time.perf_counter() - started
+    return round(len(points) / elapsed, 1)
+
+
+def replay_vectorized(points, background):
+    """
+    Per-frame work of handTracker.main: gesture registry and state
+    bank. Returns frames per second.
+    """
+    frame = np.empty_like(background)
+    registry = default_registry()
+    state = GestureStateBank(registry.names, registry.priority_order)
+
+    started = time.perf_counter()
+    for p in points:
+        np.copyto(frame, background)
+        draw_landmarks(frame, array_to_landmarks(p))
+        state.update(registry.classify(p[None]).any(axis=0))
+        active = state.active()[0]
+        if active >= 0:
+            registry.draw(frame, active)
+    elapsed = time.perf_counter() - started
+    return round(len(points) / elapsed, 1)
+
+
+def bench_replay(points, repeat):
+    rng = np.random.default_rng(0)
+    background = rng.integers(0, 256, REPLAY_SIZE + (3,), dtype=np.uint8)
+
+    # Best of `repeat` runs, like the microbenchmarks
+    return {
+        "classes_fps": max(
+            replay_classes(points, background) for _ in range(repeat)
+        ),
+        "vectorized_fps": max(
+            replay_vectorized(points, background) for _ in range(repeat)
+        ),
+        "frames": len(points),
+    }
+
+
+def metadata():
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        "commit": commit,
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "opencv": cv2.__version__,
+        "mediapipe": mp.__version__,
+        "machine": platform.machine(),
+    }
+
+
+def run(repeat=5):
+    fixtures = {name: load_fixture(name) for name in FIXTURES}
+    landmarks = {
+        name: to_hand_landmarks(f["points"]) for name, f in fixtures.items()
+    }
+    transitions = fixtures["transitions"]["points"]
+
+    return {
+        "meta": metadata(),
+        "results": {
+            "predicates_us": bench_predicates(landmarks, repeat),
+            "classifier_us": bench_classifier(transitions, repeat),
+            "smoothing_us": bench_smoothing(
+                classify_batch(transitions), repeat
+            ),
+            "overlay_us": bench_overlay(repeat),
+            "replay": bench_replay(transitions, repeat),
+        },
+    }
+
+
+def flatten(tree, prefix=""):
+    """
+    Flattens nested result dicts into {"a.b.c": value}.
+    """
+    out = {}
+    for key, value in tree.items():
+        path = f"{prefix}.{key}" if prefix else key
+        if isinstance(value, dict):
+            out.update(flatten(value, path))
+        else:
+            out[path] = value
+    return out
+
+
+def compare(baseline, current, threshold):
+    """
+    Prints the metrics that differ from the baseline by more than
+    `threshold` (a fraction) and returns the number of regressions.
+    Metrics under "*_us" are times (lower is better), "*_fps" are rates
+    (higher is better); other values are not compared.
+    """
+    old = flatten(baseline["results"])
+    new = flatten(current["results"])
+
+    regressions = 0
+    print(f"{'metric':<52}{'baseline':>12}{'current':>12}{'change':>9}")
+    for key in sorted(old.keys() & new.keys()):
+        if "_us" in key:
+            change = new[key] / old[key] - 1
+        elif key.endswith("_fps"):
+            change = old[key] / new[key] - 1
+        else:
+            continue
+
+        if abs(change) <= threshold:
+            continue
+
+        regressions += change > 0
+        flag = "slower" if change > 0 else "faster"
+        print(
+            f"{key:<52}{old[key]:>12}{new[key]:>12}"
+            f"{change:>+8.0%} {flag}"
+        )
+
+    print(f"{regressions} regression(s) above {threshold:.0%}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Run the benchmark suite on the synthetic fixtures."
+    )
+    parser.add_argument(
+        "-o", "--output", help="write results to this JSON file"
+    )
+    parser.add_argument(
+        "--compare", metavar="BASELINE",
+        help="JSON results of an earlier run to compare against"
+    )
+    parser.add_argument(
+        "--threshold", type=float, default=0.15,
+        help="relative change reported by --compare (default: 0.15)"
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=5,
+        help="timing repeats; the best one is kept"
+    )
+    args = parser.parse_args(argv)
+
+    results = run(repeat=args.repeat)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    elif not args.compare:
+        print(json.dumps(results, indent=2))
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if compare(baseline, results, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
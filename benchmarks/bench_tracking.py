@@ -0,0 +1,115 @@
+"""
+Measures per-hand gesture smoothing with two hands whose order in the
+MediaPipe results changes from frame to frame.
+
+A synthetic left hand shows PEACE and then FIST while a right hand
+holds STOP; both drift with some jitter, their order is shuffled on
+every frame, and each hand is missed on a few frames. The gesture
+events of three smoothers are counted:
+- any_hand: one smoothing row for all hands (the default),
+- by_order: one row per position in the results,
+- tracked: one row per hand id (gestures.tracking).
+The expected result is 6 events: STOP, PEACE, the switch from PEACE to
+FIST (two events) and the ends of FIST and STOP. Also reports the time
+per frame of HandIdentityTracker.update.
+
+Run from the project root:
+    python -m benchmarks.bench_tracking
+"""
+import json
+
+import numpy as np
+
+from benchmarks.bench_suite import bench
+from benchmarks.synthetic import hand_pose
+from gestures.classifier import GESTURES, classify_batch
+from gestures.state import GestureStateBank
+from gestures.tracking import HandIdentityTracker
+from pipeline.events import GestureEventEmitter
+
+NUM_FRAMES = 300
+SWITCH_FRAME = 150
+MISS_RATE = 0.05
+
+
+def two_hand_frames(seed=0):
+    """
+    Returns per-frame (landmarks, handedness) with shuffled hand order.
+    """
+    rng = np.random.default_rng(seed)
+    frames = []
+    for i in range(NUM_FRAMES):
+        drift = 0.05 * np.sin(i / 40)
+        left = hand_pose(
+            "PEACE" if i < SWITCH_FRAME else "FIST", (0.3 + drift, 0.75)
+        )
+        right = hand_pose("STOP", (0.7 - drift, 0.75))
+        hands = [
+            (pose + rng.normal(0, 0.003, pose.shape).astype(np.float32), label)
+            for pose, label in ((left, "Left"), (right, "Right"))
+            if rng.random() >= MISS_RATE
+        ]
+        rng.shuffle(hands)
+
+        batch = np.array([p for p, _ in hands], dtype=np.float32)
+        handedness = [(label, 0.95) for _, label in hands]
+        frames.append((batch.reshape(-1, 21, 3), handedness))
+    return frames
+
+
+def count_events(frames, mode):
+    """
+    Returns the gesture events of one smoothing mode.
+    """
+    rows = 1 if mode == "any_hand" else 2
+    state = GestureStateBank(num_hands=rows)
+    identities = HandIdentityTracker(2)
+    emitter = GestureEventEmitter(GESTURES)
+    events = []
+    emitter.add_listener(events.append)
+
+    ids = None
+    for i, (batch, handedness) in enumerate(frames):
+        matches = (
+            classify_batch(batch) if len(batch)
+            else np.zeros((0, len(GESTURES)), dtype=bool)
+        )
+        if mode == "any_hand":
+            detected = matches.any(axis=0)
+        elif mode == "by_order":
+            detected = np.zeros((rows, len(GESTURES)), dtype=bool)
+            detected[:len(matches)] = matches
+        else:
+            slots = identities.update(batch, handedness)
+            state.reset(identities.evicted)
+            detected = identities.to_slots(slots, matches)
+            ids = identities.ids
+
+        state.update(detected)
+        emitter.update(state.show, i / 30.0, ids=ids)
+    emitter.finish(NUM_FRAMES / 30.0)
+    return events
+
+
+def main():
+    frames = two_hand_frames()
+
+    report = {}
+    for mode in ("any_hand", "by_order", "tracked"):
+        events = count_events(frames, mode)
+        report[mode] = {
+            "events": len(events),
+            "hands": sorted({e["hand"] for e in events}),
+        }
+
+    def track():
+        identities = HandIdentityTracker(2)
+        for batch, handedness in frames:
+            identities.update(batch, handedness)
+
+    report["tracker_us_per_frame"] = bench(track, len(frames))
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
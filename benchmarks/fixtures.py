@@ -0,0 +1,106 @@
+"""
+Synthetic landmark fixtures for benchmarks.
+
+Fixtures are .npz files in benchmarks/data with:
+    points      (frames, 21, 3) float32 normalized landmarks
+    labels      (frames,) int8 index in GESTURES of the held gesture,
+                -1 during transitions and for no gesture
+    timestamps  (frames,) float64 capture times in seconds
+
+There is one fixture per gesture (no gesture, the gesture held, no
+gesture again) and a "transitions" fixture that goes through every
+ordered pair of gestures. They are generated from benchmarks.synthetic
+with fixed seeds and committed, so results stay comparable between
+commits. To regenerate them, run from the project root:
+    python -m benchmarks.fixtures
+"""
+from pathlib import Path
+
+import numpy as np
+from mediapipe.framework.formats import landmark_pb2
+
+from benchmarks.synthetic import gesture_sequence
+from gestures.classifier import GESTURES, classify_batch
+
+DATA_DIR = Path(__file__).resolve().parent / "data"
+FPS = 30.0
+
+# Fixture names, in the same order as GESTURES, then the transitions
+FIXTURES = tuple(g.lower() for g in GESTURES) + ("transitions",)
+
+
+def transition_tour(names):
+    """
+    Returns a sequence of names that goes through every ordered pair of
+    distinct names exactly once (an Eulerian circuit of the complete
+    directed graph).
+    """
+    unused = {v: [u for u in names if u != v] for v in names}
+    stack = [names[0]]
+    tour = []
+    while stack:
+        v = stack[-1]
+        if unused[v]:
+            stack.append(unused[v].pop())
+        else:
+            tour.append(stack.pop())
+    return tour[::-1]
+
+
+def make_fixture(name, seed=0):
+    """
+    Builds a fixture as a dict of arrays.
+    """
+    if name == "transitions":
+        names = transition_tour(list(GESTURES))
+        hold_frames = 15
+    else:
+        names = ["NONE", name.upper(), "NONE"]
+        hold_frames = 30
+
+    points, labels = gesture_sequence(
+        names, hold_frames=hold_frames, motion=0.02, seed=seed
+    )
+    timestamps = np.arange(len(points)) / FPS
+    return {"points": points, "labels": labels, "timestamps": timestamps}
+
+
+def load_fixture(name):
+    """
+    Loads a fixture by name, e.g. "peace" or "transitions".
+    """
+    with np.load(DATA_DIR / f"{name}.npz") as data:
+        return {key: data[key] for key in data.files}
+
+
+def to_hand_landmarks(points):
+    """
+    Converts (frames, 21, 3) landmarks into MediaPipe landmark lists, the
+    input of the is_* predicates and mp_drawing.
+    """
+    out = []
+    for frame in points.tolist():
+        hand_lm = landmark_pb2.NormalizedLandmarkList()
+        for x, y, z in frame:
+            hand_lm.landmark.add(x=x, y=y, z=z)
+        out.append(hand_lm)
+    return out
+
+
+def main():
+    DATA_DIR.mkdir(exist_ok=True)
+    for i, name in enumerate(FIXTURES):
+        fixture = make_fixture(name, seed=i)
+
+        # Held frames must classify as their label
+        held = fixture["labels"] >= 0
+        detected = classify_batch(fixture["points"][held])
+        assert detected[np.arange(held.sum()), fixture["labels"][held]].all()
+
+        path = DATA_DIR / f"{name}.npz"
+        np.savez_compressed(path, **fixture)
+        print(f"{path.name}: {len(fixture['points'])} frames")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Synthetic hand landmark poses and sequences for benchmarks.
+
+Poses are hand-built skeletons in normalized image coordinates that
+satisfy the rules of each gesture; they are meant for timing and replay,
+not as a realistic hand model.
+"""
+import numpy as np
+
+from gestures.classifier import GESTURES, NUM_LANDMARKS
+
+# Finger MCP joints relative to the wrist (index, middle, ring, pinky)
+_MCPS = np.array([
+    [-0.05, -0.18],
+    [0.00, -0.19],
+    [0.045, -0.175],
+    [0.085, -0.15],
+])
+
+# Joint offsets (PIP, DIP, TIP) for an extended and a folded finger
+_EXTENDED = np.array([[0.0, -0.07], [0.0, -0.05], [0.0, -0.04]])
+_FOLDED = np.array([[0.0, -0.04], [0.0, 0.03], [0.0, 0.03]])
+
+# Thumb joints (CMC, MCP, IP, TIP) relative to the wrist
+_THUMBS = {
+    "spread": [[-0.06, -0.04], [-0.12, -0.08], [-0.17, -0.11], [-0.21, -0.13]],
+    "tucked": [[-0.04, -0.04], [-0.06, -0.09], [-0.04, -0.12], [-0.01, -0.13]],
+    "up": [[-0.05, -0.05], [-0.08, -0.12], [-0.09, -0.20], [-0.09, -0.27]],
+    "down": [[-0.05, -0.03], [-0.08, 0.02], [-0.09, 0.07], [-0.09, 0.12]],
+}
+
+# (fingers extended for index..pinky, thumb shape) per gesture
+_POSES = {
+    "STOP": ((1, 1, 1, 1), "spread"),
+    "PEACE": ((1, 1, 0, 0), "tucked"),
+    "FIST": ((0, 0, 0, 0), "tucked"),
+    "ONE": ((1, 0, 0, 0), "tucked"),
+    "THUMBS_UP": ((0, 0, 0, 0), "up"),
+    "THUMBS_DOWN": ((0, 0, 0, 0), "down"),
+    "NONE": ((1, 0, 0, 1), "spread"),
+}
+
+POSE_NAMES = tuple(_POSES)
+
+
+def hand_pose(name, center=(0.5, 0.75), scale=1.0):
+    """
+    Returns a (21, 3) float32 landmark array for a gesture name (or
+    "NONE" for a pose that matches no gesture), with the wrist at
+    `center`.
+    """
+    fingers, thumb = _POSES[name]
+    pts = np.zeros((NUM_LANDMARKS, 2))
+
+    pts[1:5] = _THUMBS[thumb]
+    for f, (mcp, extended) in enumerate(zip(_MCPS, fingers)):
+        base = 5 + 4 * f
+        pts[base] = mcp
+        offsets = _EXTENDED if extended else _FOLDED
+        pts[base + 1:base + 4] = mcp + np.cumsum(offsets, axis=0)
+
+    out = np.zeros((NUM_LANDMARKS, 3), dtype=np.float32)
+    out[:, :2] = pts * scale + center
+    return out
+
+
+def gesture_sequence(
+    names,
+    hold_frames=30,
+    transition_frames=6,
+    motion=0.0,
+    noise=0.002,
+    seed=0,
+):
+    """
+    Builds a (frames, 21, 3) sequence that holds each pose in `names`
+    for `hold_frames` and blends linearly between consecutive poses.
+
+    `motion` is the amplitude of a slow circular drift of the whole hand
+    and `noise` the landmark jitter, both in normalized units.
+
+    Returns (points, labels), where labels[i] is the index in GESTURES
+    of the held gesture, or -1 during transitions and for "NONE".
+    """
+    rng = np.random.default_rng(seed)
+    poses = [hand_pose(n) for n in names]
+
+    frames = []
+    labels = []
+    for i, (name, pose) in enumerate(zip(names, poses)):
+        label = GESTURES.index(name) if name in GESTURES else -1
+        frames.extend([pose] * hold_frames)
+        labels.extend([label] * hold_frames)
+
+        if i + 1 < len(poses):
+            nxt = poses[i + 1]
+            for k in range(1, transition_frames + 1):
+                w = k / (transition_frames + 1)
+                frames.append((1 - w) * pose + w * nxt)
+                labels.append(-1)
+
+    points = np.stack(frames).astype(np.float32)
+
+    # Slow circular drift of the whole hand
+    t = np.arange(len(points)) / 30.0
+    drift = motion * np.stack([np.cos(t), np.sin(t)], axis=1)
+    points[:, :, :2] += drift[:, None, :].astype(np.float32)
+
+    points += rng.normal(0, noise, points.shape).astype(np.float32)
+    return points, np.array(labels, dtype=np.int8)
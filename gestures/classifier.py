@@ -0,0 +1,234 @@
+import numpy as np
+
+# Landmark indices (same numbering as mp.solutions.hands.HandLandmark)
+WRIST = 0
+THUMB_IP = 3
+THUMB_TIP = 4
+INDEX_FINGER_MCP = 5
+INDEX_FINGER_PIP = 6
+INDEX_FINGER_TIP = 8
+MIDDLE_FINGER_MCP = 9
+MIDDLE_FINGER_PIP = 10
+MIDDLE_FINGER_TIP = 12
+RING_FINGER_PIP = 14
+RING_FINGER_TIP = 16
+PINKY_MCP = 17
+PINKY_PIP = 18
+PINKY_TIP = 20
+
+NUM_LANDMARKS = 21
+
+# Finger tips and their PIP joints (index, middle, ring, pinky)
+FINGER_TIPS = np.array(
+    [INDEX_FINGER_TIP, MIDDLE_FINGER_TIP, RING_FINGER_TIP, PINKY_TIP]
+)
+FINGER_PIPS = np.array(
+    [INDEX_FINGER_PIP, MIDDLE_FINGER_PIP, RING_FINGER_PIP, PINKY_PIP]
+)
+
+# Thumb distance thresholds used by is_open_palm / is_fist
+THUMB_SPREAD_MIN = 0.10
+THUMB_CLOSE_MAX = 0.08
+
+# Layout of the shared finger-state feature vector
+FEATURES = (
+    "INDEX_UP", "MIDDLE_UP", "RING_UP", "PINKY_UP",
+    "INDEX_DOWN", "MIDDLE_DOWN", "RING_DOWN", "PINKY_DOWN",
+    "THUMB_UP", "THUMB_DOWN",
+    "THUMB_ABOVE_INDEX_BASE", "THUMB_BELOW_INDEX_BASE",
+    "THUMB_SPREAD", "THUMB_CLOSE",
+)
+FEATURE_INDEX = {name: i for i, name in enumerate(FEATURES)}
+
+# Gesture names, in the order returned by classify()
+GESTURES = ("STOP", "PEACE", "FIST", "ONE", "THUMBS_UP", "THUMBS_DOWN")
+
+
+# Required features of each built-in gesture, keyed by gesture name.
+# These mirror the is_* functions in the gesture modules exactly.
+GESTURE_RULES = {
+    # STOP: all four fingers up, thumb spread away from the wrist
+    "STOP": ("INDEX_UP", "MIDDLE_UP", "RING_UP", "PINKY_UP", "THUMB_SPREAD"),
+    # PEACE: index and middle up, ring and pinky folded
+    "PEACE": ("INDEX_UP", "MIDDLE_UP", "RING_DOWN", "PINKY_DOWN"),
+    # FIST: all four fingers folded, thumb close to the wrist
+    "FIST": ("INDEX_DOWN", "MIDDLE_DOWN", "RING_DOWN", "PINKY_DOWN",
+             "THUMB_CLOSE"),
+    # ONE: index up, the others folded, thumb ignored
+    "ONE": ("INDEX_UP", "MIDDLE_DOWN", "RING_DOWN", "PINKY_DOWN"),
+    # THUMBS UP: thumb up and above the index base, fingers folded
+    "THUMBS_UP": ("INDEX_DOWN", "MIDDLE_DOWN", "RING_DOWN", "PINKY_DOWN",
+                  "THUMB_UP", "THUMB_ABOVE_INDEX_BASE"),
+    # THUMBS DOWN: thumb down and below the index base, fingers folded
+    "THUMBS_DOWN": ("INDEX_DOWN", "MIDDLE_DOWN", "RING_DOWN", "PINKY_DOWN",
+                    "THUMB_DOWN", "THUMB_BELOW_INDEX_BASE"),
+}
+
+
+def _rule(*features):
+    """
+    Builds a boolean mask of the features that must all be set
+    for a gesture to match.
+    """
+    unknown = [name for name in features if name not in FEATURE_INDEX]
+    if unknown:
+        raise ValueError(f"Unknown features: {unknown}")
+
+    mask = np.zeros(len(FEATURES), dtype=bool)
+    for name in features:
+        mask[FEATURE_INDEX[name]] = True
+    return mask
+
+
+# One row per gesture: the gesture matches when every required feature is set
+RULES = np.stack([_rule(*GESTURE_RULES[name]) for name in GESTURES])
+
+# Bit of each feature in an integer feature code (see feature_codes)
+FEATURE_BITS = 1 << np.arange(len(FEATURES), dtype=np.int64)
+
+# Number of distinct feature codes
+NUM_CODES = 1 << len(FEATURES)
+
+
+def landmarks_to_array(hand_landmarks, out=None):
+    """
+    Converts MediaPipe hand landmarks into a (21, 3) float32 array of
+    normalized (x, y, z) coordinates.
+
+    An existing array can be passed as `out` to avoid an allocation.
+    """
+    if out is None:
+        out = np.empty((NUM_LANDMARKS, 3), dtype=np.float32)
+
+    for i, p in enumerate(hand_landmarks.landmark):
+        out[i, 0] = p.x
+        out[i, 1] = p.y
+        out[i, 2] = p.z
+
+    return out
+
+
+def multi_hand_to_array(multi_hand_landmarks, out=None):
+    """
+    Converts a list of MediaPipe hand landmarks (for example
+    result.multi_hand_landmarks) into an (N, 21, 3) float32 array.
+    """
+    n = len(multi_hand_landmarks)
+    if out is None:
+        out = np.empty((n, NUM_LANDMARKS, 3), dtype=np.float32)
+
+    for i, hand_landmarks in enumerate(multi_hand_landmarks):
+        landmarks_to_array(hand_landmarks, out[i])
+
+    return out
+
+
+def finger_features_batch(points):
+    """
+    Computes finger-state feature vectors for a batch of hands.
+
+    `points` has shape (..., 21, 3), for example (N, 21, 3) for N hands
+    or (frames, hands, 21, 3). Returns a boolean array of shape
+    (..., len(FEATURES)).
+    """
+    points = np.asarray(points)
+    y = points[..., 1]
+    tips = y[..., FINGER_TIPS]
+    pips = y[..., FINGER_PIPS]
+
+    thumb_tip = y[..., THUMB_TIP]
+    thumb_ip = y[..., THUMB_IP]
+    index_base = y[..., INDEX_FINGER_MCP]
+
+    # The thumb distance is compared in float64, like the original
+    # predicates which read the landmarks as Python floats
+    spread = np.abs(
+        points[..., THUMB_TIP, 0].astype(np.float64) - points[..., WRIST, 0]
+    )
+
+    features = np.empty(points.shape[:-2] + (len(FEATURES),), dtype=bool)
+    features[..., 0:4] = tips < pips
+    features[..., 4:8] = tips > pips
+    features[..., 8] = thumb_tip < thumb_ip
+    features[..., 9] = thumb_tip > thumb_ip
+    features[..., 10] = thumb_tip < index_base
+    features[..., 11] = thumb_tip > index_base
+    features[..., 12] = spread > THUMB_SPREAD_MIN
+    features[..., 13] = spread < THUMB_CLOSE_MAX
+
+    return features
+
+
+def feature_codes(features):
+    """
+    Packs feature vectors of shape (..., len(FEATURES)) into integers,
+    with bit i set when feature i is set.
+    """
+    return features @ FEATURE_BITS
+
+
+def code_features(codes):
+    """
+    Unpacks integer feature codes into boolean feature vectors of shape
+    (..., len(FEATURES)); the inverse of feature_codes().
+    """
+    codes = np.asarray(codes)
+    return (codes[..., None] & FEATURE_BITS) != 0
+
+
+def compile_rules(rules):
+    """
+    Compiles a (gestures, features) rule matrix into a lookup table of
+    shape (NUM_CODES, gestures): row `code` holds the gestures matched
+    by the feature vector packed into `code`.
+    """
+    all_features = code_features(np.arange(NUM_CODES))
+    missing = rules[None, :, :] & ~all_features[:, None, :]
+    return ~missing.any(axis=-1)
+
+
+def match_rules(features):
+    """
+    Evaluates RULES against feature vectors of shape (..., len(FEATURES)).
+
+    Returns a boolean array of shape (..., len(GESTURES)).
+    """
+    # A gesture matches when none of its required features is missing
+    missing = RULES & ~features[..., None, :]
+    return ~missing.any(axis=-1)
+
+
+# Gestures matched by every possible feature code
+MATCH_TABLE = compile_rules(RULES)
+
+
+def classify_batch(points):
+    """
+    Evaluates every gesture rule for a batch of hands.
+
+    `points` has shape (..., 21, 3); the result is a boolean matrix of
+    shape (..., len(GESTURES)) with one column per gesture.
+
+    The features of each hand are packed into one integer code and the
+    result is read from MATCH_TABLE, so the cost per hand does not grow
+    with the number of rules.
+    """
+    return MATCH_TABLE[feature_codes(finger_features_batch(points))]
+
+
+def finger_features(points):
+    """
+    Computes the shared finger-state feature vector (see FEATURES)
+    from a (21, 3) landmark array.
+    """
+    return finger_features_batch(points)
+
+
+def classify(points):
+    """
+    Evaluates every gesture rule on a (21, 3) landmark array in one pass.
+
+    Returns a boolean array ordered like GESTURES, matching the results
+    of the individual is_* functions.
+    """
+    return classify_batch(points)
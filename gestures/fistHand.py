@@ -1,8 +1,9 @@
 import cv2
-from gestures.utils import load_image, overlay_image
+from gestures.utils import overlay_icon
+from gestures.state import GestureView
 
-# Load the fist icon that will be displayed on screen
-FIST_IMG = load_image("../assets/fist.png")
+# Icon shown when the fist gesture is active
+FIST_ICON = "fist.png"
 
 
 def is_fist(hand_landmarks, mp_hands):
@@ -35,54 +36,26 @@ def is_fist(hand_landmarks, mp_hands):
     return all(fingers_down) and thumb_close
 
 
-class FistGesture:
+def draw_fist(frame):
     """
-    Handles temporal smoothing and visualization of the fist gesture.
+    Draws the fist icon and label on the frame.
     """
-    def __init__(self, on_frames=3, off_frames=5):
-        # Number of consecutive frames required to activate/deactivate the gesture
-        self.on_frames = on_frames
-        self.off_frames = off_frames
-
-        # Whether the gesture is currently shown
-        self.show = False
-
-        # Counters for gesture stability
-        self._on = 0
-        self._off = 0
-
-    def update(self, detected: bool):
-        """
-        Updates internal state based on whether the fist was detected
-        in the current frame.
-        """
-        if detected:
-            self._on += 1
-            self._off = 0
-        else:
-            self._off += 1
-            self._on = 0
-
-        # Activate gesture after enough consecutive detections
-        if not self.show and self._on >= self.on_frames:
-            self.show = True
-
-        # Deactivate gesture after enough consecutive misses
-        if self.show and self._off >= self.off_frames:
-            self.show = False
-
-    def draw(self, frame):
-        """
-        Draws the fist icon and label on the frame if the gesture is active.
-        """
-        if self.show:
-            overlay_image(frame, FIST_IMG, 20, 20)
-            cv2.putText(
-                frame,
-                "FIST",
-                (20, 60),
-                cv2.FONT_HERSHEY_SIMPLEX,
-                1.2,
-                (255, 255, 255),
-                3
-            )
+    overlay_icon(frame, FIST_ICON, 20, 20)
+    cv2.putText(
+        frame,
+        "FIST",
+        (20, 60),
+        cv2.FONT_HERSHEY_SIMPLEX,
+        1.2,
+        (255, 255, 255),
+        3
+    )
+
+
+class FistGesture(GestureView):
+    """
+    Handles temporal smoothing and visualization of the fist gesture,
+    as a one-gesture view over a GestureStateBank.
+    """
+    name = "FIST"
+    draw_gesture = staticmethod(draw_fist)
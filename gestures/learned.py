@@ -0,0 +1,205 @@
+"""
+Gesture classifier learned from recorded landmarks.
+
+A multinomial logistic regression over normalized landmarks: each hand
+becomes a feature vector (see hand_vectors), and the class scores of a
+whole batch of hands are a single matrix product with the weights. The
+input standardization is folded into the weights when training ends, so
+inference needs nothing else.
+
+The classes are gesture names plus "NONE" for hands that show no
+gesture. Train with pipeline.train, or with LearnedClassifier.fit on
+(hands, 21, 3) landmarks and per-hand class indices.
+"""
+import numpy as np
+
+from gestures.classifier import (
+    GESTURES,
+    INDEX_FINGER_MCP,
+    NUM_LANDMARKS,
+    PINKY_MCP,
+    WRIST,
+    landmarks_to_array,
+)
+from gestures.normalize import hand_frame
+
+# Class of hands that show no gesture
+NONE = "NONE"
+
+# Landmarks used as features; the wrist is always at the origin
+FEATURE_LANDMARKS = np.array([i for i in range(NUM_LANDMARKS) if i != WRIST])
+
+# Landmark coordinates, then the palm axis in the image
+NUM_INPUTS = len(FEATURE_LANDMARKS) * 3 + 2
+
+
+def hand_vectors(points, aspect=1.0):
+    """
+    Builds the model input of a (..., 21, 3) batch of hands: float32
+    vectors of shape (..., NUM_INPUTS).
+
+    The landmarks are taken in the hand frame (gestures.normalize), so
+    the vector does not depend on the hand's size or position. Left
+    hands are mirrored onto right hands. The palm axis is appended, so
+    that gestures that differ only by orientation (thumbs up and down)
+    stay apart.
+    """
+    hand, axis = hand_frame(points, aspect)
+
+    # Put the thumb side of the palm on +x for either hand
+    x = hand[..., 0]
+    side = np.where(x[..., INDEX_FINGER_MCP] < x[..., PINKY_MCP], -1, 1)
+    side = side.astype(np.float32)
+
+    out = np.empty(hand.shape[:-2] + (NUM_INPUTS,), dtype=np.float32)
+    coords = out[..., :-2].reshape(hand.shape[:-2] + (-1, 3))
+    coords[...] = hand[..., FEATURE_LANDMARKS, :]
+    coords[..., 0] *= side[..., None]
+    out[..., -2] = axis[..., 0] * side
+    out[..., -1] = axis[..., 1]
+    return out
+
+
+def _softmax(scores):
+    scores = scores - scores.max(axis=-1, keepdims=True)
+    np.exp(scores, out=scores)
+    scores /= scores.sum(axis=-1, keepdims=True)
+    return scores
+
+
+class LearnedClassifier:
+    """
+    Linear softmax classifier over hand_vectors().
+
+    `weights` has shape (NUM_INPUTS, len(classes)) and `bias` shape
+    (len(classes),). A hand is given the class with the highest score,
+    or no gesture when that class is NONE or its probability is below
+    `min_confidence`.
+    """
+    def __init__(self, classes, weights, bias, min_confidence=0.6):
+        self.classes = tuple(classes)
+        self.weights = np.ascontiguousarray(weights, dtype=np.float32)
+        self.bias = np.asarray(bias, dtype=np.float32)
+        self.min_confidence = min_confidence
+
+        if self.weights.shape != (NUM_INPUTS, len(self.classes)):
+            raise ValueError(
+                f"Weights of shape {self.weights.shape} do not match "
+                f"{NUM_INPUTS} inputs and {len(self.classes)} classes"
+            )
+
+    @classmethod
+    def fit(
+        cls,
+        points,
+        labels,
+        classes,
+        aspect=1.0,
+        epochs=500,
+        learning_rate=0.5,
+        l2=1e-4,
+        **kwargs,
+    ):
+        """
+        Trains a classifier on a (hands, 21, 3) landmark array and the
+        index in `classes` of each hand's class, with full-batch
+        gradient descent on the cross-entropy loss.
+        """
+        labels = np.asarray(labels)
+        if len(labels) != len(points):
+            raise ValueError("Need one label per hand")
+        if len(labels) == 0:
+            raise ValueError("No training hands")
+
+        x = hand_vectors(points, aspect).astype(np.float64)
+        mean = x.mean(axis=0)
+        std = x.std(axis=0)
+        std[std < 1e-6] = 1.0
+        x = (x - mean) / std
+
+        targets = np.zeros((len(x), len(classes)))
+        targets[np.arange(len(x)), labels] = 1.0
+
+        weights = np.zeros((x.shape[1], len(classes)))
+        bias = np.zeros(len(classes))
+        for _ in range(epochs):
+            error = _softmax(x @ weights + bias) - targets
+            weights -= learning_rate * (x.T @ error / len(x) + l2 * weights)
+            bias -= learning_rate * error.mean(axis=0)
+
+        # Fold the standardization into the weights
+        weights = weights / std[:, None]
+        bias = bias - mean @ weights
+        return cls(classes, weights, bias, **kwargs)
+
+    def scores(self, points, aspect=1.0):
+        """
+        Returns the class scores (logits) of a (..., 21, 3) batch of
+        hands, of shape (..., len(classes)).
+        """
+        return hand_vectors(points, aspect) @ self.weights + self.bias
+
+    def predict(self, points, aspect=1.0):
+        """
+        Returns the index in `classes` of the most likely class of each
+        hand, or -1 when it is not confident enough.
+        """
+        probs = _softmax(self.scores(points, aspect))
+        best = probs.argmax(axis=-1)
+        confident = np.take_along_axis(probs, best[..., None], -1)[..., 0]
+        return np.where(confident >= self.min_confidence, best, -1)
+
+    def classify_batch(self, points, aspect=1.0, names=GESTURES):
+        """
+        Drop-in replacement for classifier.classify_batch(): a boolean
+        array of shape (..., len(names)) with at most one gesture set per
+        hand. Names the model does not know are never set.
+        """
+        columns = np.array(
+            [self.classes.index(n) if n in self.classes else -2
+             for n in names],
+            dtype=np.int64,
+        )
+        return self.predict(points, aspect)[..., None] == columns
+
+    def predicate(self, name, aspect=1.0):
+        """
+        Returns a function with the signature of the is_* functions,
+        (hand_landmarks, mp_hands) -> bool, that detects gesture `name`.
+        """
+        index = self.classes.index(name)
+
+        def is_gesture(hand_landmarks, mp_hands=None):
+            points = landmarks_to_array(hand_landmarks)
+            return bool(self.predict(points, aspect) == index)
+
+        is_gesture.__name__ = f"is_{name.lower()}"
+        return is_gesture
+
+    def save(self, path):
+        """
+        Saves the model to an .npz file.
+        """
+        np.savez(
+            path,
+            classes=np.array(self.classes),
+            weights=self.weights,
+            bias=self.bias,
+            min_confidence=self.min_confidence,
+        )
+
+    @classmethod
+    def load(cls, path):
+        """
+        Loads a model saved with save().
+        """
+        with np.load(path) as data:
+            return cls(
+                data["classes"].tolist(),
+                data["weights"],
+                data["bias"],
+                float(data["min_confidence"]),
+            )
+
+    def __repr__(self):
+        return f"LearnedClassifier(classes={self.classes})"
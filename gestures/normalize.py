@@ -0,0 +1,166 @@
+"""
+Rotation- and scale-invariant landmark normalization.
+
+The rules in gestures.classifier compare raw image coordinates, so they
+depend on how far the hand is from the camera and on how much it is
+tilted. This module maps landmarks into a hand frame first:
+
+- the wrist is the origin,
+- the palm axis (wrist to middle finger MCP) points up, along -y,
+- one unit is the palm length (wrist to middle finger MCP).
+
+Finger states are read in that frame, and so is the thumb spread: how
+far the thumb tip reaches out past the index base, on the thumb side of
+the palm whichever hand it is. The thumb direction features keep the
+image orientation (a thumbs up points up in the image, whatever the
+tilt of the palm) but are measured in palm lengths too. Every
+comparison has a small dead zone, so a joint sitting on the boundary
+sets neither feature instead of flickering between them.
+
+The features use the same layout as classifier.FEATURES, so the six
+gesture rules, the registry and the compiled lookup tables apply to them
+unchanged.
+"""
+import numpy as np
+
+from gestures.classifier import (
+    FEATURES,
+    FINGER_PIPS,
+    FINGER_TIPS,
+    INDEX_FINGER_MCP,
+    MATCH_TABLE,
+    MIDDLE_FINGER_MCP,
+    PINKY_MCP,
+    THUMB_IP,
+    THUMB_TIP,
+    WRIST,
+    feature_codes,
+)
+
+# Dead zone between a finger up and down, in palm lengths
+FINGER_MARGIN = 0.10
+
+# Dead zone between the thumb tip above and below its IP joint, in palm
+# lengths
+THUMB_MARGIN = 0.05
+
+# How far the thumb tip must reach above (or below) the index base, in
+# palm lengths; a thumb folded over a fist stays within it
+THUMB_BASE_MARGIN = 0.30
+
+# Thumb tip distance out past the index base, in palm lengths
+THUMB_SPREAD_MIN = 0.38
+THUMB_CLOSE_MAX = 0.33
+
+# Smallest palm length, in normalized image units, before a hand is
+# considered degenerate
+MIN_PALM_SIZE = 1e-6
+
+
+def _palm_frame(points, aspect):
+    """
+    Returns the wrist-centered landmarks in units of the image height,
+    the unit palm axis (..., 2) and the palm length (...).
+    """
+    points = np.asarray(points, dtype=np.float32)
+    offsets = points - points[..., WRIST:WRIST + 1, :]
+
+    # MediaPipe scales x (and roughly z) by the image width and y by its
+    # height; rotations need the same unit on both axes
+    if aspect != 1.0:
+        offsets[..., 0] *= aspect
+        offsets[..., 2] *= aspect
+
+    palm = offsets[..., MIDDLE_FINGER_MCP, :2]
+    size = np.maximum(np.hypot(palm[..., 0], palm[..., 1]), MIN_PALM_SIZE)
+    axis = palm / size[..., None]
+    return offsets, axis, size
+
+
+def normalize_batch(points, aspect=1.0):
+    """
+    Maps a (..., 21, 3) batch of landmarks into the hand frame: wrist at
+    the origin, palm axis along -y, scaled by the palm length.
+
+    `aspect` is the width / height ratio of the frame the landmarks were
+    detected in. The result is a float32 array of the same shape.
+    """
+    return _rotate(*_palm_frame(points, aspect))
+
+
+def hand_frame(points, aspect=1.0):
+    """
+    Like normalize_batch(), but also returns the unit palm axis in the
+    image, of shape (..., 2): the hand's orientation that normalization
+    removes.
+    """
+    offsets, axis, size = _palm_frame(points, aspect)
+    return _rotate(offsets, axis, size), axis
+
+
+def _rotate(offsets, axis, size):
+    """
+    Rotates wrist-centered landmarks so the palm axis points along -y,
+    and scales them by the palm length.
+    """
+    ux = axis[..., None, 0]
+    uy = axis[..., None, 1]
+    x = offsets[..., 0]
+    y = offsets[..., 1]
+
+    # Rotation that takes the palm axis (ux, uy) to (0, -1)
+    out = np.empty_like(offsets)
+    out[..., 0] = -uy * x + ux * y
+    out[..., 1] = -ux * x - uy * y
+    out[..., 2] = offsets[..., 2]
+    out /= size[..., None, None]
+    return out
+
+
+def normalized_features_batch(points, aspect=1.0):
+    """
+    Computes finger-state feature vectors (see classifier.FEATURES) for
+    a (..., 21, 3) batch of hands in the hand frame.
+
+    Returns a boolean array of shape (..., len(FEATURES)).
+    """
+    offsets, axis, size = _palm_frame(points, aspect)
+    hand = _rotate(offsets, axis, size)
+
+    # Finger tips against their PIP joints, along the palm axis
+    y = hand[..., 1]
+    bend = y[..., FINGER_TIPS] - y[..., FINGER_PIPS]
+
+    # Thumb tip in the image orientation, in palm lengths
+    image_y = offsets[..., 1] / size[..., None]
+    thumb_tip = image_y[..., THUMB_TIP]
+    thumb_rise = image_y[..., THUMB_IP] - thumb_tip
+    base_rise = image_y[..., INDEX_FINGER_MCP] - thumb_tip
+
+    # The thumb is on the index side of the palm, left or right
+    x = hand[..., 0]
+    side = np.sign(x[..., INDEX_FINGER_MCP] - x[..., PINKY_MCP])
+    spread = (x[..., THUMB_TIP] - x[..., INDEX_FINGER_MCP]) * side
+
+    features = np.empty(hand.shape[:-2] + (len(FEATURES),), dtype=bool)
+    features[..., 0:4] = bend < -FINGER_MARGIN
+    features[..., 4:8] = bend > FINGER_MARGIN
+    features[..., 8] = thumb_rise > THUMB_MARGIN
+    features[..., 9] = thumb_rise < -THUMB_MARGIN
+    features[..., 10] = base_rise > THUMB_BASE_MARGIN
+    features[..., 11] = base_rise < -THUMB_BASE_MARGIN
+    features[..., 12] = spread > THUMB_SPREAD_MIN
+    features[..., 13] = spread < THUMB_CLOSE_MAX
+
+    return features
+
+
+def classify_normalized_batch(points, aspect=1.0):
+    """
+    Evaluates the six gesture rules on normalized landmarks.
+
+    `points` has shape (..., 21, 3); the result is a boolean matrix of
+    shape (..., len(GESTURES)), like classifier.classify_batch().
+    """
+    features = normalized_features_batch(points, aspect)
+    return MATCH_TABLE[feature_codes(features)]
@@ -1,8 +1,9 @@
 import cv2
-from gestures.utils import load_image, overlay_image
+from gestures.utils import overlay_icon
+from gestures.state import GestureView
 
-# Load the icon that represents the "one finger" gesture
-ONE_IMG = load_image("../assets/one.png")
+# The icon that represents the "one finger" gesture
+ONE_ICON = "one.png"
 
 
 def is_one_finger(hand_landmarks, mp_hands):
@@ -36,55 +37,26 @@ def is_one_finger(hand_landmarks, mp_hands):
     return index_up and middle_down and ring_down and pinky_down
 
 
-class OneFingerGesture:
+def draw_one_finger(frame):
     """
-    Handles temporal smoothing and visualization
-    of the one-finger gesture.
+    Draws the one-finger icon and label on the frame.
     """
-    def __init__(self, on_frames=3, off_frames=5):
-        # Number of consecutive frames required to turn the gesture on/off
-        self.on_frames = on_frames
-        self.off_frames = off_frames
-
-        # Whether the gesture is currently active
-        self.show = False
-
-        # Frame counters for stability
-        self._on = 0
-        self._off = 0
-
-    def update(self, detected: bool):
-        """
-        Updates gesture state based on detection
-        in the current frame.
-        """
-        if detected:
-            self._on += 1
-            self._off = 0
-        else:
-            self._off += 1
-            self._on = 0
-
-        # Activate gesture after enough consecutive detections
-        if not self.show and self._on >= self.on_frames:
-            self.show = True
+    overlay_icon(frame, ONE_ICON, 20, 20)
+    cv2.putText(
+        frame,
+        "ONE",
+        (20, 60),
+        cv2.FONT_HERSHEY_SIMPLEX,
+        1.2,
+        (255, 255, 255),
+        3
+    )
 
-        # Deactivate gesture after enough consecutive missed detections
-        if self.show and self._off >= self.off_frames:
-            self.show = False
 
-    def draw(self, frame):
-        """
-        Draws the gesture icon and label if the gesture is active.
-        """
-        if self.show:
-            overlay_image(frame, ONE_IMG, 20, 20)
-            cv2.putText(
-                frame,
-                "ONE",
-                (20, 60),
-                cv2.FONT_HERSHEY_SIMPLEX,
-                1.2,
-                (255, 255, 255),
-                3
-            )
+class OneFingerGesture(GestureView):
+    """
+    Handles temporal smoothing and visualization of the one-finger gesture,
+    as a one-gesture view over a GestureStateBank.
+    """
+    name = "ONE"
+    draw_gesture = staticmethod(draw_one_finger)
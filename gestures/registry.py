@@ -0,0 +1,262 @@
+import cv2
+import numpy as np
+
+from gestures.classifier import (
+    FEATURE_INDEX,
+    FEATURES,
+    GESTURE_RULES,
+    compile_rules,
+    feature_codes,
+    finger_features_batch,
+)
+from gestures.utils import overlay_icon
+from gestures.stopHand import STOP_ICON, draw_stop
+from gestures.peaceHand import PEACE_ICON, draw_peace
+from gestures.fistHand import FIST_ICON, draw_fist
+from gestures.oneFingerHand import ONE_ICON, draw_one_finger
+from gestures.thumbsUpHand import THUMBS_UP_ICON, draw_thumbs_up
+from gestures.thumbsDownHand import THUMBS_DOWN_ICON, draw_thumbs_down
+
+
+class GestureSpec:
+    """
+    A gesture declared as data: the features it requires (see
+    classifier.FEATURES), its icon, label and display priority.
+
+    A gesture matches a hand when every required feature is set. When
+    several gestures are active, the one with the highest priority is
+    shown. `draw`, if given, replaces the default icon-and-label drawing.
+    """
+    def __init__(
+        self,
+        name,
+        requires,
+        icon=None,
+        label=None,
+        priority=0,
+        draw=None,
+    ):
+        unknown = [f for f in requires if f not in FEATURE_INDEX]
+        if unknown:
+            raise ValueError(f"Unknown features for {name}: {unknown}")
+
+        self.name = name
+        self.requires = tuple(requires)
+        self.icon = icon
+        self.label = name if label is None else label
+        self.priority = priority
+        self._draw = draw
+
+        # Required features as a boolean mask over FEATURES
+        self.mask = np.zeros(len(FEATURES), dtype=bool)
+        self.mask[[FEATURE_INDEX[f] for f in self.requires]] = True
+
+    def draw(self, frame):
+        """
+        Draws the gesture icon and label on the frame.
+        """
+        if self._draw is not None:
+            self._draw(frame)
+            return
+
+        if self.icon is not None:
+            overlay_icon(frame, self.icon, 20, 20)
+        cv2.putText(
+            frame,
+            self.label,
+            (20, 60),
+            cv2.FONT_HERSHEY_SIMPLEX,
+            1.2,
+            (0, 255, 0),
+            3
+        )
+
+    def __repr__(self):
+        return f"GestureSpec({self.name!r}, priority={self.priority})"
+
+
+class GestureRegistry:
+    """
+    Ordered collection of GestureSpecs.
+
+    Gesture indices follow registration order, so classify() columns
+    line up with `names`, and a GestureStateBank built from `names` and
+    `priority_order` resolves which gesture to draw.
+
+    The rules are compiled into lookup tables indexed by the packed
+    feature code of a hand (finger and thumb states; see
+    classifier.feature_codes): one row of matched gestures per code, and
+    the highest-priority match per code. Classifying a hand is a single
+    table read, whatever the number of gestures. The tables are rebuilt
+    lazily after the registry changes.
+    """
+    def __init__(self, specs=()):
+        self._specs = []
+        self._table = None
+        self._best = None
+        for spec in specs:
+            self.add(spec)
+
+    def add(self, spec):
+        """
+        Adds a GestureSpec. Returns it.
+        """
+        if spec.name in self.names:
+            raise ValueError(f"Gesture already registered: {spec.name}")
+        self._specs.append(spec)
+        self._table = None
+        return spec
+
+    def register(self, name, requires, **kwargs):
+        """
+        Declares and adds a gesture; see GestureSpec for the arguments.
+        """
+        return self.add(GestureSpec(name, requires, **kwargs))
+
+    def remove(self, name):
+        """
+        Removes a gesture by name.
+        """
+        self._specs.pop(self.index(name))
+        self._table = None
+
+    def index(self, name):
+        """
+        Returns the index of a gesture by name.
+        """
+        for i, spec in enumerate(self._specs):
+            if spec.name == name:
+                return i
+        raise KeyError(name)
+
+    def __len__(self):
+        return len(self._specs)
+
+    def __iter__(self):
+        return iter(self._specs)
+
+    def __getitem__(self, i):
+        return self._specs[i]
+
+    @property
+    def names(self):
+        """
+        Gesture names, in registration order.
+        """
+        return tuple(spec.name for spec in self._specs)
+
+    @property
+    def priority_order(self):
+        """
+        Gesture names by display priority, highest first. Ties keep
+        registration order.
+        """
+        ranked = sorted(self._specs, key=lambda spec: -spec.priority)
+        return tuple(spec.name for spec in ranked)
+
+    def compile(self):
+        """
+        Builds the lookup tables; called automatically when needed.
+        """
+        rules = np.zeros((len(self._specs), len(FEATURES)), dtype=bool)
+        for g, spec in enumerate(self._specs):
+            rules[g] = spec.mask
+        table = compile_rules(rules)
+
+        # Highest-priority match per code, -1 when nothing matches
+        rank = np.empty(len(self._specs), dtype=np.int32)
+        for r, name in enumerate(self.priority_order):
+            rank[self.index(name)] = r
+        best = np.full(len(table), -1, dtype=np.int16)
+        hit = table.any(axis=1)
+        if hit.any():
+            best[hit] = np.where(table[hit], rank, len(rank)).argmin(axis=1)
+
+        self._table = table
+        self._best = best
+
+    def codes(self, points):
+        """
+        Returns the packed feature codes of a (..., 21, 3) batch of hands.
+        """
+        return feature_codes(finger_features_batch(points))
+
+    def classify(self, points):
+        """
+        Evaluates the registered gestures for a batch of hands.
+
+        `points` has shape (..., 21, 3); the result is a boolean array of
+        shape (..., len(self)) with one column per gesture.
+        """
+        return self.match(finger_features_batch(points))
+
+    def match(self, features):
+        """
+        Evaluates the registered gestures on precomputed feature vectors
+        of shape (..., len(FEATURES)), for example from
+        normalize.normalized_features_batch().
+        """
+        if self._table is None:
+            self.compile()
+        return self._table[feature_codes(features)]
+
+    def best(self, points):
+        """
+        Returns, for a (..., 21, 3) batch of hands, the index of the
+        highest-priority matching gesture of each hand, or -1.
+
+        Unlike classify(), the result is mutually exclusive, so no
+        priority chain is needed to pick the gesture to show.
+        """
+        return self.match_best(finger_features_batch(points))
+
+    def match_best(self, features):
+        """
+        Like best(), on precomputed feature vectors of shape
+        (..., len(FEATURES)).
+        """
+        if self._table is None:
+            self.compile()
+        return self._best[feature_codes(features)]
+
+    def draw(self, frame, index):
+        """
+        Draws gesture `index`, as returned by GestureStateBank.active().
+        """
+        self._specs[index].draw(frame)
+
+
+def default_registry():
+    """
+    Returns a new registry with the six built-in gestures. Their
+    priorities reproduce the original if/elif display order.
+    """
+    return GestureRegistry([
+        GestureSpec(
+            "STOP", GESTURE_RULES["STOP"],
+            icon=STOP_ICON, label="STOP", priority=10, draw=draw_stop,
+        ),
+        GestureSpec(
+            "PEACE", GESTURE_RULES["PEACE"],
+            icon=PEACE_ICON, label="PEACE", priority=20, draw=draw_peace,
+        ),
+        GestureSpec(
+            "FIST", GESTURE_RULES["FIST"],
+            icon=FIST_ICON, label="FIST", priority=30, draw=draw_fist,
+        ),
+        GestureSpec(
+            "ONE", GESTURE_RULES["ONE"],
+            icon=ONE_ICON, label="ONE", priority=40,
+            draw=draw_one_finger,
+        ),
+        GestureSpec(
+            "THUMBS_UP", GESTURE_RULES["THUMBS_UP"],
+            icon=THUMBS_UP_ICON, label="THUMBS UP", priority=60,
+            draw=draw_thumbs_up,
+        ),
+        GestureSpec(
+            "THUMBS_DOWN", GESTURE_RULES["THUMBS_DOWN"],
+            icon=THUMBS_DOWN_ICON, label="THUMBS DOWN", priority=50,
+            draw=draw_thumbs_down,
+        ),
+    ])
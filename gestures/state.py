@@ -0,0 +1,263 @@
+import time
+
+import numpy as np
+
+from gestures.classifier import GESTURES
+
+# Display priority, highest first (same order as the original if/elif chain)
+DEFAULT_PRIORITY = ("THUMBS_UP", "THUMBS_DOWN", "ONE", "FIST", "PEACE", "STOP")
+
+
+class GestureStateBank:
+    """
+    Temporal smoothing for many gestures and hands at once.
+
+    Holds the on/off counters of every (hand, gesture) pair in NumPy
+    arrays and applies the same rule as the *Gesture classes: a gesture
+    turns on after `on_frames` consecutive detections and off after
+    `off_frames` consecutive misses. The gesture to display for each
+    hand is resolved from a priority table.
+    """
+    def __init__(
+        self,
+        gestures=GESTURES,
+        priority=DEFAULT_PRIORITY,
+        num_hands=1,
+        on_frames=3,
+        off_frames=5,
+    ):
+        self.gestures = tuple(gestures)
+        self.num_hands = num_hands
+        shape = (num_hands, len(self.gestures))
+
+        # Thresholds may be given per gesture
+        self.on_frames = np.broadcast_to(
+            np.asarray(on_frames, dtype=np.int32), (len(self.gestures),)
+        )
+        self.off_frames = np.broadcast_to(
+            np.asarray(off_frames, dtype=np.int32), (len(self.gestures),)
+        )
+
+        # Whether each gesture is currently shown, per hand
+        self.show = np.zeros(shape, dtype=bool)
+
+        # Counters for gesture stability
+        self._on = np.zeros(shape, dtype=np.int32)
+        self._off = np.zeros(shape, dtype=np.int32)
+
+        self.set_priority(priority)
+
+    def set_priority(self, priority):
+        """
+        Sets the display priority from a sequence of gesture names,
+        highest first. Gestures missing from the table are never chosen.
+        """
+        index = {name: i for i, name in enumerate(self.gestures)}
+        unknown = [name for name in priority if name not in index]
+        if unknown:
+            raise ValueError(f"Unknown gestures in priority table: {unknown}")
+
+        # Lower rank wins; unranked gestures get a rank past the end
+        never = len(self.gestures)
+        self._rank = np.full(len(self.gestures), never, dtype=np.int32)
+        for rank, name in enumerate(priority):
+            self._rank[index[name]] = rank
+        self._never = never
+
+    def update(self, detected):
+        """
+        Updates all counters from a boolean detection array of shape
+        (num_hands, num_gestures), or (num_gestures,) for a single hand.
+        """
+        detected = np.asarray(detected, dtype=bool)
+        if detected.ndim == 1:
+            detected = detected[None, :]
+
+        # Consecutive-frame counters: increment, then reset where broken
+        self._on += 1
+        self._on *= detected
+        self._off += 1
+        self._off *= ~detected
+
+        # Activate after enough detections, deactivate after enough misses
+        self.show |= self._on >= self.on_frames
+        self.show &= self._off < self.off_frames
+
+    def active(self):
+        """
+        Returns, for each hand, the index of the highest-priority gesture
+        being shown, or -1 when none is.
+        """
+        ranks = np.where(self.show, self._rank, self._never)
+        best = ranks.argmin(axis=1)
+        return np.where(ranks[np.arange(self.num_hands), best] < self._never,
+                        best, -1)
+
+    def top(self):
+        """
+        Returns the index of the highest-priority gesture shown by any
+        hand, or -1 when none is.
+        """
+        ranks = np.where(self.show.any(axis=0), self._rank, self._never)
+        best = int(ranks.argmin())
+        return best if ranks[best] < self._never else -1
+
+    def active_names(self):
+        """
+        Returns, for each hand, the name of the gesture to display or None.
+        """
+        return [
+            self.gestures[i] if i >= 0 else None for i in self.active()
+        ]
+
+    def reset(self, hands=None):
+        """
+        Clears the state of the given hands (all hands by default).
+        """
+        if hands is None:
+            hands = slice(None)
+        self.show[hands] = False
+        self._on[hands] = 0
+        self._off[hands] = 0
+
+
+class TimedGestureStateBank(GestureStateBank):
+    """
+    Frame-rate-independent variant of GestureStateBank.
+
+    A gesture turns on once it has been detected continuously for
+    `on_ms` milliseconds and off once it has been missed for `off_ms`,
+    measured on monotonic timestamps instead of frame counts. A streak
+    counts from the timestamp of the frame before it, so at 30 FPS the
+    defaults behave like on_frames=3, off_frames=5.
+
+    With `decay_ms`, raw detections are first smoothed into a per-gesture
+    confidence that decays exponentially with time constant `decay_ms`;
+    a gesture counts as detected while its confidence is at least
+    `threshold`.
+    """
+    # Tolerance for timestamp comparisons, in seconds
+    _EPS = 1e-6
+
+    def __init__(
+        self,
+        gestures=GESTURES,
+        priority=DEFAULT_PRIORITY,
+        num_hands=1,
+        on_ms=100,
+        off_ms=150,
+        decay_ms=None,
+        threshold=0.5,
+    ):
+        super().__init__(gestures, priority, num_hands)
+        shape = self.show.shape
+
+        self.on_ms = on_ms
+        self.off_ms = off_ms
+        self.decay_ms = decay_ms
+        self.threshold = threshold
+
+        # Smoothed detection confidence, only used with decay_ms
+        self.confidence = np.zeros(shape, dtype=np.float32)
+
+        # Start of the current detection / miss streak (NaN if none)
+        self._on_since = np.full(shape, np.nan)
+        self._off_since = np.full(shape, np.nan)
+        self._last = None
+
+    def update(self, detected, timestamp=None):
+        """
+        Updates all gestures from a boolean detection array of shape
+        (num_hands, num_gestures), or (num_gestures,) for a single hand.
+
+        `timestamp` is in seconds on a monotonic clock and defaults to
+        time.monotonic().
+        """
+        now = time.monotonic() if timestamp is None else timestamp
+        first = self._last is None
+        prev = now if first else self._last
+        self._last = now
+
+        detected = np.asarray(detected, dtype=bool)
+        if detected.ndim == 1:
+            detected = detected[None, :]
+
+        if self.decay_ms is not None:
+            # Exponential moving average over time
+            if first:
+                weight = 1.0
+            else:
+                weight = 1.0 - np.exp(-(now - prev) * 1000.0 / self.decay_ms)
+            self.confidence += weight * (detected - self.confidence)
+            detected = self.confidence >= self.threshold
+
+        # Streaks start at the previous frame and end on the first change
+        self._on_since[detected & np.isnan(self._on_since)] = prev
+        self._on_since[~detected] = np.nan
+        self._off_since[~detected & np.isnan(self._off_since)] = prev
+        self._off_since[detected] = np.nan
+
+        # Activate after on_ms of detections, deactivate after off_ms of misses
+        eps = self._EPS
+        with np.errstate(invalid="ignore"):
+            on = now - self._on_since >= self.on_ms / 1000.0 - eps
+            off = now - self._off_since >= self.off_ms / 1000.0 - eps
+        self.show |= on
+        self.show &= ~off
+
+    def reset(self, hands=None):
+        """
+        Clears the state of the given hands (all hands by default).
+        """
+        if hands is None:
+            hands = slice(None)
+            self._last = None
+        self.show[hands] = False
+        self.confidence[hands] = 0.0
+        self._on_since[hands] = np.nan
+        self._off_since[hands] = np.nan
+
+
+class GestureView:
+    """
+    Temporal smoothing and visualization of a single gesture, with the
+    interface of the original per-gesture classes: update(detected),
+    `show` and draw(frame).
+
+    The counters live in a one-gesture GestureStateBank, so the rule is
+    the bank's. Subclasses set the gesture `name` and `draw_gesture`, a
+    function that draws it on a frame.
+    """
+    name = None
+    draw_gesture = None
+
+    def __init__(self, on_frames=3, off_frames=5):
+        if self.name is None or self.draw_gesture is None:
+            raise TypeError(
+                f"{type(self).__name__} must set name and draw_gesture"
+            )
+        self.bank = GestureStateBank(
+            (self.name,), (self.name,),
+            on_frames=on_frames, off_frames=off_frames,
+        )
+
+    @property
+    def show(self):
+        """
+        Whether the gesture is currently active.
+        """
+        return bool(self.bank.show[0, 0])
+
+    def update(self, detected):
+        """
+        Updates the gesture state from its detection in the current
+        frame.
+        """
+        self.bank.update((detected,))
+
+    def draw(self, frame):
+        """
+        Draws the gesture icon and label if the gesture is active.
+        """
+        if self.show:
+            self.draw_gesture(frame)
@@ -1,8 +1,9 @@
 import cv2
-from .utils import load_image, overlay_image
+from .utils import overlay_icon
+from .state import GestureView
 
-# Load the icon that represents the thumbs-up gesture
-THUMBS_UP_IMG = load_image("thumbs_up.png")
+# The icon that represents the thumbs-up gesture
+THUMBS_UP_ICON = "thumbs_up.png"
 
 
 def is_thumbs_up(hand_landmarks, mp_hands):
@@ -53,55 +54,26 @@ def is_thumbs_up(hand_landmarks, mp_hands):
     )
 
 
-class ThumbsUpGesture:
+def draw_thumbs_up(frame):
     """
-    Handles temporal smoothing and visualization
-    of the thumbs-up gesture.
+    Draws the thumbs-up icon and label on the frame.
     """
-    def __init__(self, on_frames=3, off_frames=5):
-        # Number of consecutive frames required to activate/deactivate the gesture
-        self.on_frames = on_frames
-        self.off_frames = off_frames
-
-        # Whether the gesture is currently active
-        self.show = False
-
-        # Frame counters for gesture stability
-        self._on = 0
-        self._off = 0
-
-    def update(self, detected: bool):
-        """
-        Updates gesture state based on detection
-        in the current frame.
-        """
-        if detected:
-            self._on += 1
-            self._off = 0
-        else:
-            self._off += 1
-            self._on = 0
-
-        # Activate gesture after enough consecutive detections
-        if not self.show and self._on >= self.on_frames:
-            self.show = True
+    overlay_icon(frame, THUMBS_UP_ICON, 20, 20)
+    cv2.putText(
+        frame,
+        "THUMBS UP",
+        (20, 60),
+        cv2.FONT_HERSHEY_SIMPLEX,
+        1.0,
+        (0, 255, 0),
+        3
+    )
 
-        # Deactivate gesture after enough consecutive missed detections
-        if self.show and self._off >= self.off_frames:
-            self.show = False
 
-    def draw(self, frame):
-        """
-        Draws the gesture icon and label if the gesture is active.
-        """
-        if self.show:
-            overlay_image(frame, THUMBS_UP_IMG, 20, 20)
-            cv2.putText(
-                frame,
-                "THUMBS UP",
-                (20, 60),
-                cv2.FONT_HERSHEY_SIMPLEX,
-                1.0,
-                (0, 255, 0),
-                3
-            )
+class ThumbsUpGesture(GestureView):
+    """
+    Handles temporal smoothing and visualization of the thumbs-up gesture,
+    as a one-gesture view over a GestureStateBank.
+    """
+    name = "THUMBS_UP"
+    draw_gesture = staticmethod(draw_thumbs_up)
@@ -0,0 +1,198 @@
+import itertools
+from functools import lru_cache
+
+import numpy as np
+
+from gestures.classifier import (
+    INDEX_FINGER_MCP,
+    MIDDLE_FINGER_MCP,
+    NUM_LANDMARKS,
+    PINKY_MCP,
+    WRIST,
+)
+
+# Landmarks averaged into the palm centroid
+PALM = np.array([WRIST, INDEX_FINGER_MCP, MIDDLE_FINGER_MCP, PINKY_MCP])
+
+# Handedness labels as stored per slot (-1 when unknown)
+HANDEDNESS = ("Left", "Right")
+
+# Largest number of candidate assignments tried exhaustively; bigger
+# problems are matched greedily
+MAX_PERMUTATIONS = 5040
+
+
+@lru_cache(maxsize=None)
+def _permutations(n, k):
+    # Every ordered choice of k of n indices, one per row
+    perms = np.array(list(itertools.permutations(range(n), k)), dtype=np.intp)
+    return perms.reshape(-1, k)
+
+
+def match_hands(cost, max_cost):
+    """
+    Matches rows to columns of a cost matrix with the lowest total cost,
+    leaving pairs that cost `max_cost` or more unmatched. Returns the
+    (rows, cols) of the matched pairs.
+
+    Hand counts are small, so every assignment is tried at once; past
+    MAX_PERMUTATIONS, pairs are taken greedily from the cheapest.
+    """
+    n, m = cost.shape
+    if n == 0 or m == 0:
+        return np.zeros(0, dtype=np.intp), np.zeros(0, dtype=np.intp)
+
+    # Leaving a pair unmatched costs max_cost
+    clipped = np.minimum(cost, max_cost)
+    k = min(n, m)
+    count = 1
+    for i in range(k):
+        count *= max(n, m) - i
+
+    if count <= MAX_PERMUTATIONS:
+        if n <= m:
+            perms = _permutations(m, n)
+            best = perms[clipped[np.arange(n), perms].sum(axis=1).argmin()]
+            rows, cols = np.arange(n), best
+        else:
+            perms = _permutations(n, m)
+            best = perms[clipped[perms, np.arange(m)].sum(axis=1).argmin()]
+            rows, cols = best, np.arange(m)
+    else:
+        order = np.argsort(clipped, axis=None)
+        used_rows = np.zeros(n, dtype=bool)
+        used_cols = np.zeros(m, dtype=bool)
+        rows, cols = [], []
+        for r, c in zip(*np.unravel_index(order, cost.shape)):
+            if not used_rows[r] and not used_cols[c]:
+                used_rows[r] = used_cols[c] = True
+                rows.append(r)
+                cols.append(c)
+        rows, cols = np.array(rows), np.array(cols)
+
+    keep = cost[rows, cols] < max_cost
+    return rows[keep], cols[keep]
+
+
+class HandIdentityTracker:
+    """
+    Gives the hands of consecutive frames stable ids, since MediaPipe
+    returns them in no particular order.
+
+    Tracked hands live in `capacity` slots of fixed-size arrays: their
+    id, handedness, wrist and palm-centroid position and the number of
+    frames since they were last seen. Each frame, the detected hands
+    are matched to the tracked ones by position (the mean distance of
+    the wrist and the palm centroid), with a `handedness_cost` added
+    when MediaPipe reports the other hand; matches farther than
+    `max_distance` (in normalized image coordinates) are new hands. A
+    hand missing for more than `max_missed` frames is evicted and its
+    slot freed.
+
+    Per-hand state can be kept in arrays indexed by slot, such as a
+    GestureStateBank with num_hands=capacity; reset the rows listed in
+    `evicted` after each update().
+    """
+    def __init__(
+        self,
+        capacity=2,
+        max_distance=0.2,
+        max_missed=5,
+        handedness_cost=0.1,
+    ):
+        self.capacity = capacity
+        self.max_distance = max_distance
+        self.max_missed = max_missed
+        self.handedness_cost = handedness_cost
+
+        # Id of the hand in each slot, -1 for a free slot
+        self.ids = np.full(capacity, -1, dtype=np.int64)
+        self.labels = np.full(capacity, -1, dtype=np.int8)
+        self.positions = np.zeros((capacity, 4), dtype=np.float32)
+        self.missed = np.zeros(capacity, dtype=np.int32)
+
+        # Slots freed by the last update()
+        self.evicted = np.zeros(0, dtype=np.intp)
+        self._next_id = 0
+
+    def update(self, batch, handedness=()):
+        """
+        Matches the (hands, 21, 3) landmarks of one frame to the tracked
+        hands and returns the slot of each detected hand (-1 when all
+        slots are taken). `handedness` holds (label, score) pairs for
+        the first hands, as in MediaPipe's multi_handedness.
+        """
+        batch = np.asarray(batch, dtype=np.float32).reshape(
+            -1, NUM_LANDMARKS, 3
+        )
+        num = len(batch)
+        positions = np.concatenate(
+            [batch[:, WRIST, :2], batch[:, PALM, :2].mean(axis=1)], axis=1
+        )
+        labels = np.full(num, -1, dtype=np.int8)
+        for i, (label, _) in enumerate(handedness[:num]):
+            if label in HANDEDNESS:
+                labels[i] = HANDEDNESS.index(label)
+
+        tracked = np.flatnonzero(self.ids >= 0)
+        slots = np.full(num, -1, dtype=np.intp)
+
+        if len(tracked) and num:
+            # Mean of the wrist and palm-centroid distances
+            delta = self.positions[tracked, None, :] - positions[None, :, :]
+            cost = (
+                np.hypot(delta[..., 0], delta[..., 1])
+                + np.hypot(delta[..., 2], delta[..., 3])
+            ) / 2
+            known = (self.labels[tracked, None] >= 0) & (labels[None, :] >= 0)
+            differ = known & (self.labels[tracked, None] != labels[None, :])
+            cost += self.handedness_cost * differ
+
+            rows, cols = match_hands(cost, self.max_distance)
+            slots[cols] = tracked[rows]
+
+        # New hands take free slots
+        free = np.flatnonzero(self.ids < 0)
+        new = np.flatnonzero(slots < 0)[:len(free)]
+        slots[new] = free[:len(new)]
+        self.ids[free[:len(new)]] = self._next_id + np.arange(len(new))
+        self._next_id += len(new)
+
+        # Remember where the seen hands are
+        seen = slots >= 0
+        self.positions[slots[seen]] = positions[seen]
+        self.missed[slots[seen]] = 0
+        known = seen & (labels >= 0)
+        self.labels[slots[known]] = labels[known]
+
+        # Age the others and evict the ones gone for too long
+        unseen = self.ids >= 0
+        unseen[slots[seen]] = False
+        self.missed[unseen] += 1
+        self.evicted = np.flatnonzero(unseen & (self.missed > self.max_missed))
+        self.ids[self.evicted] = -1
+        self.labels[self.evicted] = -1
+        self.missed[self.evicted] = 0
+
+        return slots
+
+    def to_slots(self, slots, values):
+        """
+        Scatters per-hand `values` (one row per detected hand) into an
+        array with one row per slot, zero for slots without a hand in
+        this frame.
+        """
+        values = np.asarray(values)
+        out = np.zeros((self.capacity,) + values.shape[1:], dtype=values.dtype)
+        seen = slots >= 0
+        out[slots[seen]] = values[seen]
+        return out
+
+    def reset(self):
+        """
+        Forgets every tracked hand.
+        """
+        self.evicted = np.flatnonzero(self.ids >= 0)
+        self.ids[:] = -1
+        self.labels[:] = -1
+        self.missed[:] = 0
@@ -9,6 +9,23 @@ ASSETS_DIR = ROOT_DIR / "assets"
 # Cache for loaded images to avoid reloading every frame
 _IMAGE_CACHE = {}  # path -> image
 
+# In headless mode icons are never drawn, so assets are never decoded
+_HEADLESS = False
+
+# Largest (width, height) of a gesture icon on the frame
+ICON_SIZE = (200, 200)
+
+
+def set_headless(headless=True):
+    """
+    Turns headless mode on or off and returns the previous setting. In
+    headless mode overlay_icon draws nothing and never loads its image.
+    """
+    global _HEADLESS
+    previous = _HEADLESS
+    _HEADLESS = headless
+    return previous
+
 
 def load_image(filename: str):
     """
@@ -69,3 +86,123 @@ def overlay_image(bg_bgr, overlay_img, x, y, alpha_fallback=0.85):
 
     bg_bgr[y:y+h, x:x+w] = roi
     return bg_bgr
+
+
+# Cache for overlay sprites prepared for blending
+_SPRITE_CACHE = {}  # (path, max_size, alpha_fallback) -> Sprite
+
+
+class Sprite:
+    """
+    Overlay image prepared for fast blending.
+
+    Images with an alpha channel are stored premultiplied by alpha, with
+    the complement of alpha alongside, both in 8.8 fixed point (uint16),
+    so blending needs no float conversion. Images without one are
+    blended with cv2.addWeighted and a constant alpha.
+    """
+    def __init__(self, img, alpha_fallback=0.85):
+        h, w = img.shape[:2]
+        self.width = w
+        self.height = h
+
+        if img.shape[2] == 4:
+            # Map alpha 0..255 to 0..256 so that 255 is fully opaque,
+            # expanded to all three channels for fast element-wise math
+            alpha = img[:, :, 3].astype(np.uint16)
+            alpha += alpha >> 7
+            alpha = np.repeat(alpha[:, :, None], 3, axis=2)
+
+            self.image = None
+            self.alpha = None
+            self.premultiplied = img[:, :, :3].astype(np.uint16) * alpha
+            self.inv_alpha = 256 - alpha
+
+            # Scratch buffer reused by every blend
+            self._work = np.empty((h, w, 3), dtype=np.uint16)
+        else:
+            # No alpha channel: use a constant fallback transparency
+            self.image = np.ascontiguousarray(img)
+            self.alpha = alpha_fallback
+            self.premultiplied = None
+            self.inv_alpha = None
+            self._work = None
+
+
+def load_sprite(filename: str, max_size=None, alpha_fallback=0.85):
+    """
+    Loads an image from the assets/ directory as a Sprite.
+
+    If `max_size` (width, height) is given, the image is scaled down to
+    fit inside it, keeping its aspect ratio. Sprites are cached per size,
+    so the image is only loaded and scaled on the first call.
+    """
+    key = (str((ASSETS_DIR / filename).resolve()), max_size, alpha_fallback)
+    sprite = _SPRITE_CACHE.get(key)
+    if sprite is not None:
+        return sprite
+
+    img = load_image(filename)
+    if max_size is not None:
+        h, w = img.shape[:2]
+        scale = min(max_size[0] / w, max_size[1] / h)
+        if scale < 1:
+            size = (max(1, int(w * scale)), max(1, int(h * scale)))
+            img = cv2.resize(img, size, interpolation=cv2.INTER_AREA)
+
+    sprite = Sprite(img, alpha_fallback)
+    _SPRITE_CACHE[key] = sprite
+    return sprite
+
+
+def overlay_sprite(bg_bgr, sprite, x, y):
+    """
+    Blends a Sprite on top of a background frame at position (x, y).
+
+    Uses uint16 fixed-point math in preallocated buffers, so no
+    per-frame allocations are made.
+    """
+    H, W = bg_bgr.shape[:2]
+
+    # Clip sprite size to fit inside the frame
+    w = min(sprite.width, W - x)
+    h = min(sprite.height, H - y)
+    if x < 0 or y < 0 or w <= 0 or h <= 0:
+        return bg_bgr
+
+    roi = bg_bgr[y:y+h, x:x+w]
+
+    if sprite.image is not None:
+        # Constant alpha: blend the ROI in place
+        a = sprite.alpha
+        cv2.addWeighted(sprite.image[:h, :w], a, roi, 1 - a, 0, dst=roi)
+        return bg_bgr
+
+    work = sprite._work[:h, :w]
+
+    # out = (fg * a + bg * (256 - a)) >> 8
+    np.multiply(roi, sprite.inv_alpha[:h, :w], out=work)
+    np.add(work, sprite.premultiplied[:h, :w], out=work)
+    np.right_shift(work, 8, out=work)
+    np.copyto(roi, work, casting="unsafe")
+
+    return bg_bgr
+
+
+def overlay_icon(
+    bg_bgr, filename: str, x, y, alpha_fallback=0.85, size=ICON_SIZE
+):
+    """
+    Draws an icon from the assets/ directory at position (x, y), scaled
+    down to fit inside `size` (width, height), and inside the frame
+    instead of being clipped.
+
+    The icon is decoded on first use (not at import) and cached.
+    """
+    H, W = bg_bgr.shape[:2]
+    if _HEADLESS or x >= W or y >= H:
+        return bg_bgr
+
+    max_size = (min(size[0], W - x), min(size[1], H - y))
+    sprite = load_sprite(filename, max_size, alpha_fallback)
+    return overlay_sprite(bg_bgr, sprite, x, y)
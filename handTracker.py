@@ -1,65 +1,179 @@
+import threading
+import time
+
 import cv2
-import mediapipe as mp
-
-from gestures.stopHand import StopGesture, is_open_palm
-from gestures.peaceHand import PeaceGesture, is_peace_sign
-from gestures.fistHand import FistGesture, is_fist
-from gestures.oneFingerHand import OneFingerGesture, is_one_finger
-from gestures.thumbsUpHand import ThumbsUpGesture, is_thumbs_up
-from gestures.thumbsDownHand import ThumbsDownGesture, is_thumbs_down
-
-
-# MediaPipe Hands setup
-mp_hands = mp.solutions.hands
-mp_drawing = mp.solutions.drawing_utils
-mp_styles = mp.solutions.drawing_styles
-
-
-def main():
-    # Open default webcam
-    cap = cv2.VideoCapture(0)
-
-    # Initialize gesture handlers
-    stop_gesture = StopGesture(on_frames=3, off_frames=5)
-    peace_gesture = PeaceGesture(on_frames=3, off_frames=5)
-    fist_gesture = FistGesture(on_frames=3, off_frames=5)
-    one_gesture = OneFingerGesture(on_frames=3, off_frames=5)
-    thumbs_up_gesture = ThumbsUpGesture(on_frames=3, off_frames=5)
-    thumbs_down_gesture = ThumbsDownGesture(on_frames=3, off_frames=5)
-
-    # Initialize MediaPipe Hands
-    with mp_hands.Hands(
-        static_image_mode=False,
-        max_num_hands=1,
-        model_complexity=1,
-        min_detection_confidence=0.6,
-        min_tracking_confidence=0.6
-    ) as hands:
-
-        while True:
-            ok, frame = cap.read()
-            if not ok:
-                break
-
-            # Mirror image for natural interaction
-            frame = cv2.flip(frame, 1)
-
-            # Convert frame to RGB for MediaPipe
-            rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            result = hands.process(rgb)
-
-            # Detection flags for each gesture
-            detected_stop = False
-            detected_peace = False
-            detected_fist = False
-            detected_one = False
-            detected_thumbs_up = False
-            detected_thumbs_down = False
-
-            if result.multi_hand_landmarks:
-                hand_lm = result.multi_hand_landmarks[0]
-
-                # Draw hand landmarks and connections
+import numpy as np
+
+from gestures.classifier import NUM_LANDMARKS, multi_hand_to_array
+from gestures.normalize import normalized_features_batch
+from gestures.registry import default_registry
+from gestures.state import GestureStateBank, TimedGestureStateBank
+from gestures.tracking import HandIdentityTracker
+from gestures.utils import set_headless
+from pipeline.capture import ThreadedCapture
+from pipeline.events import GestureEventEmitter, SocketEventSink
+from pipeline.preprocess import FramePreprocessor
+from pipeline.profiler import MetricsExporter, StageProfiler, draw_hud
+from pipeline.recording import LandmarkRecorder
+from pipeline.render import AsyncRenderer
+from pipeline.roi import RoiHandTracker
+from pipeline.scheduler import AdaptiveInferenceScheduler
+
+
+def array_to_landmarks(points):
+    """
+    Converts a (21, 3) landmark array back into a MediaPipe landmark
+    list, so extrapolated hands can be drawn with mp_drawing.
+    """
+    from mediapipe.framework.formats import landmark_pb2
+
+    hand_lm = landmark_pb2.NormalizedLandmarkList()
+    for x, y, z in points.tolist():
+        hand_lm.landmark.add(x=x, y=y, z=z)
+    return hand_lm
+
+
+def main(
+    max_num_hands=1,
+    on_ms=None,
+    off_ms=None,
+    adaptive=False,
+    roi=False,
+    profile=False,
+    metrics_path=None,
+    metrics_port=None,
+    record_path=None,
+    headless=False,
+    registry=None,
+    normalize=False,
+    model=None,
+    async_render=False,
+    max_render_fps=60.0,
+    events=None,
+    events_port=None,
+    track_hands=False,
+):
+    """
+    Runs the webcam gesture demo.
+
+    The gestures, their rules, icons, labels and display priorities come
+    from `registry` (default: gestures.registry.default_registry()).
+    With more than one hand, a gesture counts as detected when any
+    tracked hand shows it; with `track_hands`, each hand is smoothed on
+    its own instead, under an id that follows it from frame to frame
+    (see gestures.tracking), and a gesture is shown while any hand
+    holds it. Passing `on_ms`/`off_ms` switches smoothing
+    from frame counts to capture timestamps, so gesture latency does
+    not depend on the frame rate. With `adaptive`, the hand model only
+    runs on some frames and landmarks are extrapolated in between.
+    With `roi`, inference runs on a downscaled frame or on a crop around
+    the tracked hands instead of the full-resolution frame.
+
+    With `profile`, every stage of the loop is timed and an FPS/latency
+    HUD is drawn on the frame. `metrics_path` also writes the stage
+    latencies to a JSON file every few seconds, and `metrics_port`
+    serves them in the Prometheus text format on localhost; either one
+    turns profiling on.
+
+    With `record_path`, the landmarks, handedness and capture time of
+    every frame are written to a landmark recording that
+    pipeline.replay can run through the classifiers again.
+
+    With `headless`, no window is opened and nothing is drawn (icons are
+    never even decoded); the active gesture is printed whenever it
+    changes. Stop it with Ctrl-C.
+
+    With `normalize`, gestures are classified on landmarks mapped into a
+    wrist-centered, palm-aligned frame scaled by the palm length (see
+    gestures.normalize), so the decisions do not depend on the distance
+    to the camera or the tilt of the hand.
+
+    `model`, a gestures.learned.LearnedClassifier, replaces the rules:
+    each registered gesture is detected when the model predicts it.
+
+    With `async_render`, drawing and the window run on the main thread
+    while the camera loop runs on another one (see AsyncRenderer), so
+    inference never waits for the display. Frames that arrive while the
+    previous one is still being drawn, or faster than `max_render_fps`,
+    are not displayed. `headless` turns rendering off entirely.
+
+    `events`, a pipeline.events.GestureEventEmitter, receives a
+    gesture_started / gesture_ended event whenever a smoothed gesture
+    turns on or off, timestamped on the capture clock; add listeners to
+    it before calling main(). `events_port` also serves the events as
+    JSON lines to clients of that local TCP port. With `track_hands`,
+    events carry the id of the hand.
+    """
+    # Importing MediaPipe takes about a second; only pay for it when the
+    # demo actually runs
+    import mediapipe as mp
+
+    mp_hands = mp.solutions.hands
+    mp_drawing = mp.solutions.drawing_utils
+    mp_styles = mp.solutions.drawing_styles
+
+    # Open default webcam, read on a background thread so the loop
+    # always gets the newest frame
+    cap = ThreadedCapture(0).start()
+
+    if registry is None:
+        registry = default_registry()
+
+    # Temporal smoothing for all registered gestures; the display
+    # priority comes from the registry
+    # (one row per tracked hand with track_hands)
+    timed = on_ms is not None or off_ms is not None
+    num_rows = max_num_hands if track_hands else 1
+    if timed:
+        gesture_state = TimedGestureStateBank(
+            registry.names,
+            registry.priority_order,
+            num_hands=num_rows,
+            on_ms=100 if on_ms is None else on_ms,
+            off_ms=150 if off_ms is None else off_ms,
+        )
+    else:
+        gesture_state = GestureStateBank(
+            registry.names,
+            registry.priority_order,
+            num_hands=num_rows,
+            on_frames=3,
+            off_frames=5,
+        )
+
+    # Stable hand ids for per-hand smoothing
+    identities = HandIdentityTracker(max_num_hands) if track_hands else None
+
+    # Optional frame skipping for the hand model
+    scheduler = AdaptiveInferenceScheduler() if adaptive else None
+
+    # Per-stage timers; a disabled profiler makes the stages no-ops
+    profile = profile or metrics_path is not None or metrics_port is not None
+    profiler = StageProfiler(enabled=profile)
+    exporter = MetricsExporter(profiler, path=metrics_path, port=metrics_port)
+
+    # Optional landmark recording of the session
+    recorder = None
+    if record_path is not None:
+        recorder = LandmarkRecorder(record_path, max_num_hands)
+
+    # Gesture transitions for other consumers than the window
+    event_sink = None
+    if events_port is not None:
+        if events is None:
+            events = GestureEventEmitter(registry.names)
+        event_sink = events.add_listener(SocketEventSink(events_port))
+
+    # Reusable landmark buffer for the classifier, one row per hand
+    points = np.empty((max_num_hands, NUM_LANDMARKS, 3), dtype=np.float32)
+
+    # Last gesture reported in headless mode
+    shown = -1
+
+    def draw(frame, hands_lm, active, hud=None):
+        # Draw hand landmarks and connections
+        with profiler.stage("landmarks"):
+            for hand_lm in hands_lm:
                 mp_drawing.draw_landmarks(
                     frame,
                     hand_lm,
@@ -68,45 +182,212 @@ def main():
                     mp_styles.get_default_hand_connections_style()
                 )
 
-                # Run gesture detection functions
-                detected_stop = is_open_palm(hand_lm, mp_hands)
-                detected_peace = is_peace_sign(hand_lm, mp_hands)
-                detected_fist = is_fist(hand_lm, mp_hands)
-                detected_one = is_one_finger(hand_lm, mp_hands)
-                detected_thumbs_up = is_thumbs_up(hand_lm, mp_hands)
-                detected_thumbs_down = is_thumbs_down(hand_lm, mp_hands)
-
-            # Update gesture state machines
-            stop_gesture.update(detected_stop)
-            peace_gesture.update(detected_peace)
-            fist_gesture.update(detected_fist)
-            one_gesture.update(detected_one)
-            thumbs_up_gesture.update(detected_thumbs_up)
-            thumbs_down_gesture.update(detected_thumbs_down)
-
-            # Gesture rendering priority (highest first)
-            if thumbs_up_gesture.show:
-                thumbs_up_gesture.draw(frame)
-            elif thumbs_down_gesture.show:
-                thumbs_down_gesture.draw(frame)
-            elif one_gesture.show:
-                one_gesture.draw(frame)
-            elif fist_gesture.show:
-                fist_gesture.draw(frame)
-            elif peace_gesture.show:
-                peace_gesture.draw(frame)
-            elif stop_gesture.show:
-                stop_gesture.draw(frame)
-
-            # Display the result
-            cv2.imshow("Hand Tracking", frame)
-
-            # Exit on ESC key
-            if cv2.waitKey(1) & 0xFF == 27:
-                break
+        # Draw the highest-priority active gesture
+        with profiler.stage("overlay"):
+            if active >= 0:
+                registry.draw(frame, active)
+
+        if profile:
+            draw_hud(frame, profiler, summary=hud)
+
+    # Optional rendering on its own thread
+    renderer = None
+    if async_render and not headless:
+        renderer = AsyncRenderer(
+            draw, max_fps=max_render_fps, profiler=profiler
+        )
+    stopped = threading.Event()
+
+    def loop():
+        nonlocal shown
+
+        # Initialize MediaPipe Hands
+        with mp_hands.Hands(
+            static_image_mode=False,
+            max_num_hands=max_num_hands,
+            model_complexity=1,
+            min_detection_confidence=0.6,
+            min_tracking_confidence=0.6
+        ) as hands:
+            roi_tracker = RoiHandTracker(hands) if roi else None
+
+            # Reusable buffers for the mirrored and RGB frames
+            preprocess = FramePreprocessor()
+
+            while not stopped.is_set():
+                with profiler.stage("capture"):
+                    ok, frame = cap.read()
+                if not ok:
+                    break
+
+                # Mirror image for natural interaction
+                with profiler.stage("flip"):
+                    frame = preprocess.flip(frame)
+
+                inferred = (
+                    scheduler is None or scheduler.should_infer(cap.timestamp)
+                )
+                if inferred:
+                    started = time.perf_counter()
+                    if roi_tracker is not None:
+                        with profiler.stage("inference"):
+                            result = roi_tracker.process(frame)
+                    else:
+                        # Convert frame to RGB for MediaPipe
+                        with profiler.stage("to_rgb"):
+                            rgb = preprocess.to_rgb(frame)
+                        with profiler.stage("inference"):
+                            result = hands.process(rgb)
+                    elapsed = time.perf_counter() - started
+
+                    hands_lm = result.multi_hand_landmarks or []
+                    batch = multi_hand_to_array(
+                        hands_lm, points[:len(hands_lm)]
+                    )
+                    if scheduler is not None:
+                        scheduler.observe(batch, cap.timestamp, elapsed)
+
+                    handedness = [
+                        (h.classification[0].label, h.classification[0].score)
+                        for h in result.multi_handedness or []
+                    ]
+                else:
+                    # Skipped frame: extrapolate from the last inferences
+                    with profiler.stage("predict"):
+                        batch = scheduler.predict(cap.timestamp)
+                        if batch is None:
+                            batch = points[:0]
+                        handedness = []
+                        if not headless:
+                            hands_lm = [array_to_landmarks(p) for p in batch]
+
+                if recorder is not None:
+                    if recorder.frame_size is None:
+                        recorder.frame_size = frame.shape[1::-1]
+                    recorder.write(
+                        cap.timestamp, batch, handedness,
+                        extrapolated=not inferred,
+                    )
+
+                # Detection flags for each hand and gesture
+                matches = np.zeros((len(batch), len(registry)), dtype=bool)
+
+                if len(batch):
+                    # Evaluate the registered gestures for every hand
+                    with profiler.stage("classify"):
+                        height, width = frame.shape[:2]
+                        aspect = width / height
+                        if model is not None:
+                            matches = model.classify_batch(
+                                batch, aspect, registry.names
+                            )
+                        elif normalize:
+                            matches = registry.match(
+                                normalized_features_batch(batch, aspect)
+                            )
+                        else:
+                            matches = registry.classify(batch)
+
+                # Update gesture state machines
+                with profiler.stage("smoothing"):
+                    if identities is not None:
+                        # Each hand is smoothed in the row of its slot
+                        slots = identities.update(batch, handedness)
+                        gesture_state.reset(identities.evicted)
+                        detected = identities.to_slots(slots, matches)
+                    else:
+                        detected = matches.any(axis=0)
+
+                    if timed:
+                        gesture_state.update(detected, cap.timestamp)
+                    else:
+                        gesture_state.update(detected)
+
+                if events is not None:
+                    if identities is not None:
+                        # Detection score of each hand, in its slot
+                        scores = np.full(len(batch), np.nan)
+                        scores[:len(handedness)] = [
+                            s for _, s in handedness[:len(batch)]
+                        ]
+                        events.update(
+                            gesture_state.show, cap.timestamp,
+                            identities.to_slots(slots, scores),
+                            ids=identities.ids,
+                        )
+                    else:
+                        # Detection score of the most confident hand
+                        score = max((s for _, s in handedness), default=None)
+                        events.update(gesture_state.show, cap.timestamp, score)
+
+                active = gesture_state.top()
+                if headless:
+                    # Report changes of the highest-priority gesture
+                    if active != shown:
+                        print(registry[active].name if active >= 0 else "NONE",
+                              flush=True)
+                        shown = active
+                    key = -1
+                elif renderer is not None:
+                    # Hand the frame over, with the HUD numbers taken on
+                    # this thread; ESC is read by the renderer
+                    hud = profiler.summary(max_age=0.5) if profile else None
+                    renderer.submit(frame, hands_lm, active, hud)
+                    key = 27 if renderer.closed else -1
+                else:
+                    draw(frame, hands_lm, active)
+
+                    # Display the result
+                    with profiler.stage("display"):
+                        cv2.imshow("Hand Tracking", frame)
+
+                        # Exit on ESC key
+                        key = cv2.waitKey(1) & 0xFF
+
+                profiler.frame_done()
+                exporter.maybe_export()
+
+                if key == 27:
+                    break
+
+    def run_loop():
+        try:
+            loop()
+        finally:
+            # The camera loop ended: let the renderer return too
+            if renderer is not None:
+                renderer.stop()
+
+    # Headless mode is process-wide: restore it when the demo returns
+    was_headless = set_headless() if headless else None
+    try:
+        if renderer is None:
+            loop()
+        else:
+            worker = threading.Thread(target=run_loop, name="inference")
+            worker.start()
+            try:
+                renderer.run()
+            finally:
+                stopped.set()
+                worker.join()
+    except KeyboardInterrupt:
+        # Ctrl-C ends the demo like ESC
+        pass
+    finally:
+        if headless:
+            set_headless(was_headless)
 
+    if events is not None:
+        events.finish(time.monotonic())
+    if event_sink is not None:
+        event_sink.close()
+    exporter.close()
+    if recorder is not None:
+        recorder.close()
     cap.release()
-    cv2.destroyAllWindows()
+    if not headless:
+        cv2.destroyAllWindows()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,225 @@
+"""
+Asyncio runner for the hand-tracking pipeline, for embedding gesture
+recognition in asyncio services.
+
+Usage:
+    tracker = AsyncHandTracker()
+    async for result in tracker.stream("session.mp4"):
+        ...
+
+Several sources run concurrently on one event loop:
+
+    async def follow(source):
+        async for result in tracker.stream(source):
+            ...
+
+    await asyncio.gather(follow(0), follow("door.mp4"))
+"""
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+import numpy as np
+
+from gestures.classifier import (
+    GESTURES,
+    NUM_LANDMARKS,
+    classify_batch,
+    multi_hand_to_array,
+)
+from gestures.normalize import classify_normalized_batch
+from gestures.state import GestureStateBank
+from pipeline.batch import make_record
+from pipeline.events import GestureEventEmitter
+from pipeline.preprocess import FramePreprocessor, mirror_landmarks
+
+
+class AsyncHandTracker:
+    """
+    Runs hand tracking and gesture classification from asyncio code.
+
+    stream(source) is an async generator of per-frame results, in the
+    pipeline.batch format plus the smoothed "active" gestures. Each
+    stream opens its own cv2.VideoCapture and Hands instance (tracking
+    mode). The blocking read and process calls run on two single-thread
+    executors per stream, so the event loop is never blocked and the
+    next frame is read while the current one goes through the model.
+
+    Leaving the `async for` loop, cancelling the task that runs it or
+    calling aclose() on the stream releases the capture and the Hands
+    instance, once the blocking calls in progress have returned.
+
+    `events` receives the gesture_started / gesture_ended events of all
+    streams, each with the "source" it came from.
+    """
+    def __init__(
+        self,
+        max_num_hands=2,
+        model_complexity=1,
+        min_detection_confidence=0.6,
+        min_tracking_confidence=0.6,
+        flip=False,
+        normalize=False,
+        model=None,
+        on_frames=3,
+        off_frames=5,
+        include_landmarks=False,
+    ):
+        self.max_num_hands = max_num_hands
+        self.hands_options = {
+            "static_image_mode": False,
+            "max_num_hands": max_num_hands,
+            "model_complexity": model_complexity,
+            "min_detection_confidence": min_detection_confidence,
+            "min_tracking_confidence": min_tracking_confidence,
+        }
+        self.flip = flip
+        self.normalize = normalize
+        self.model = model
+        self.on_frames = on_frames
+        self.off_frames = off_frames
+        self.include_landmarks = include_landmarks
+
+        self.events = GestureEventEmitter(GESTURES)
+
+    async def stream(self, source):
+        """
+        Yields one result per frame of `source`, a camera index or a
+        video path, until the source ends.
+        """
+        loop = asyncio.get_running_loop()
+        reader = ThreadPoolExecutor(1, thread_name_prefix="capture")
+        inferrer = ThreadPoolExecutor(1, thread_name_prefix="inference")
+        live = isinstance(source, int)
+
+        opening_cap = reader.submit(_open_capture, source)
+        opening_hands = inferrer.submit(self._open_hands)
+        try:
+            cap = await asyncio.wrap_future(opening_cap)
+            hands, preprocess = await asyncio.wrap_future(opening_hands)
+
+            state = GestureStateBank(
+                on_frames=self.on_frames, off_frames=self.off_frames
+            )
+            events = GestureEventEmitter(GESTURES)
+            events.add_listener(self.events.emit)
+            points = np.empty(
+                (self.max_num_hands, NUM_LANDMARKS, 3), dtype=np.float32
+            )
+
+            index = 0
+            timestamp = 0.0
+            pending = loop.run_in_executor(reader, _read, cap, live)
+            while True:
+                ok, frame, t = await pending
+                if not ok:
+                    break
+                timestamp = t
+
+                # Read the next frame while this one is processed
+                pending = loop.run_in_executor(reader, _read, cap, live)
+
+                batch, handedness = await loop.run_in_executor(
+                    inferrer, self._infer, hands, preprocess, frame, points
+                )
+
+                matches = None
+                if len(batch):
+                    height, width = frame.shape[:2]
+                    matches = self._classify(batch, width / height)
+
+                detected = (
+                    matches.any(axis=0) if matches is not None
+                    else np.zeros(len(GESTURES), dtype=bool)
+                )
+                state.update(detected)
+                events.update(
+                    state.show, timestamp,
+                    max((s for _, s in handedness), default=None),
+                    source=source,
+                )
+
+                record = make_record(
+                    index, batch, matches, handedness,
+                    timestamp_ms=timestamp * 1000.0,
+                    include_landmarks=self.include_landmarks,
+                )
+                hands_out = record.pop("hands")
+                record["active"] = [
+                    g for g, s in zip(GESTURES, state.show[0]) if s
+                ]
+                record["hands"] = hands_out
+                index += 1
+                yield record
+
+            events.finish(timestamp, source=source)
+        finally:
+            # Each executor runs its jobs in order: the closing jobs run
+            # after the read or inference in progress
+            closing = [
+                reader.submit(_close, opening_cap, lambda c: c.release()),
+                inferrer.submit(_close, opening_hands, lambda h: h[0].close()),
+            ]
+            reader.shutdown(wait=False)
+            inferrer.shutdown(wait=False)
+            await asyncio.wait([asyncio.wrap_future(f) for f in closing])
+
+    def _open_hands(self):
+        # Imported on first use, like the other pipelines
+        import mediapipe as mp
+
+        hands = mp.solutions.hands.Hands(**self.hands_options)
+        return hands, FramePreprocessor()
+
+    def _infer(self, hands, preprocess, frame, points):
+        """
+        Runs the model on one frame (on the inference executor); returns
+        the landmarks and (label, score) handedness of its hands.
+        """
+        result = hands.process(preprocess.to_rgb(frame))
+
+        # Mirror the landmarks rather than the pixels
+        if self.flip:
+            mirror_landmarks(result)
+
+        hands_lm = result.multi_hand_landmarks or []
+        batch = multi_hand_to_array(hands_lm, points[:len(hands_lm)])
+        handedness = [
+            (h.classification[0].label, h.classification[0].score)
+            for h in result.multi_handedness or []
+        ]
+        return batch, handedness
+
+    def _classify(self, batch, aspect):
+        if self.model is not None:
+            return self.model.classify_batch(batch, aspect)
+        if self.normalize:
+            return classify_normalized_batch(batch, aspect)
+        return classify_batch(batch)
+
+
+def _open_capture(source):
+    cap = cv2.VideoCapture(source)
+    if not cap.isOpened():
+        cap.release()
+        raise OSError(f"Cannot open video source: {source!r}")
+    return cap
+
+
+def _read(cap, live):
+    """
+    Returns (ok, frame, timestamp in seconds): the capture time for
+    cameras, the position in the file for videos.
+    """
+    ok, frame = cap.read()
+    if live:
+        return ok, frame, time.monotonic()
+    return ok, frame, cap.get(cv2.CAP_PROP_POS_MSEC) / 1000.0
+
+
+def _close(opening, close):
+    # Skips what was never opened (cancelled before it started, or failed)
+    if opening.cancelled() or opening.exception() is not None:
+        return
+    close(opening.result())
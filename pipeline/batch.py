@@ -0,0 +1,584 @@
+"""
+Headless batch processing of video files and image directories.
+
+Runs MediaPipe Hands and the gesture classifier over every frame and
+streams one result per frame to JSONL or CSV, without opening a window.
+
+Usage (from the project root):
+    python -m pipeline.batch session.mp4 -o session.jsonl
+    python -m pipeline.batch frames/ --format csv -o frames.csv
+    python -m pipeline.batch session.mp4 --workers 8 -o session.jsonl
+    python -m pipeline.batch session.mp4 --record session.lmk
+"""
+import argparse
+import csv
+import itertools
+import json
+import multiprocessing
+import sys
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from gestures.classifier import (
+    GESTURES,
+    NUM_LANDMARKS,
+    classify_batch,
+    multi_hand_to_array,
+)
+from gestures.learned import LearnedClassifier
+from gestures.normalize import classify_normalized_batch
+from gestures.state import GestureStateBank, TimedGestureStateBank
+from pipeline.preprocess import FramePreprocessor, mirror_landmarks
+from pipeline.recording import LandmarkRecorder
+from pipeline.roi import RoiHandTracker
+from pipeline.scheduler import AdaptiveInferenceScheduler
+
+IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".bmp", ".tif", ".tiff", ".webp"}
+
+
+def is_image_dir(source):
+    """
+    Returns True if the source is a directory of images.
+    """
+    return Path(source).is_dir()
+
+
+def list_images(source):
+    """
+    Returns the image files of a directory, sorted by file name.
+    """
+    return sorted(
+        p for p in Path(source).iterdir()
+        if p.suffix.lower() in IMAGE_EXTENSIONS
+    )
+
+
+def count_frames(source):
+    """
+    Returns the number of frames of a video, or of images in a directory.
+    Returns 0 when a video container does not report its length.
+    """
+    if is_image_dir(source):
+        return len(list_images(source))
+
+    cap = cv2.VideoCapture(str(source))
+    try:
+        return max(0, int(cap.get(cv2.CAP_PROP_FRAME_COUNT)))
+    finally:
+        cap.release()
+
+
+def iter_frames(source, start=0, stop=None):
+    """
+    Yields (index, name, timestamp_ms, frame) for the frames [start, stop)
+    of a video file or the images of a directory (sorted by file name).
+
+    For images, name is the file name and timestamp_ms is None.
+    """
+    if is_image_dir(source):
+        paths = list_images(source)[start:stop]
+        for i, path in enumerate(paths, start):
+            frame = cv2.imread(str(path), cv2.IMREAD_COLOR)
+            if frame is None:
+                print(f"Skipping unreadable image: {path}", file=sys.stderr)
+                continue
+            yield i, path.name, None, frame
+        return
+
+    cap = cv2.VideoCapture(str(source))
+    if not cap.isOpened():
+        raise FileNotFoundError(f"Cannot open video: {source}")
+
+    try:
+        if start > 0:
+            # Seeking is exact only for some codecs and containers: check
+            # where it landed, and otherwise skip frames from the start
+            seeked = cap.set(cv2.CAP_PROP_POS_FRAMES, start)
+            if not seeked or int(cap.get(cv2.CAP_PROP_POS_FRAMES)) != start:
+                cap.release()
+                cap = cv2.VideoCapture(str(source))
+                for _ in range(start):
+                    if not cap.grab():
+                        break
+
+        i = start
+        while stop is None or i < stop:
+            ok, frame = cap.read()
+            if not ok:
+                break
+            timestamp_ms = cap.get(cv2.CAP_PROP_POS_MSEC)
+            yield i, None, timestamp_ms, frame
+            i += 1
+    finally:
+        cap.release()
+
+
+def analyze(
+    source,
+    start=0,
+    stop=None,
+    warmup=0,
+    max_num_hands=2,
+    model_complexity=1,
+    min_detection_confidence=0.6,
+    min_tracking_confidence=0.6,
+    flip=False,
+    include_landmarks=False,
+    adaptive=False,
+    roi=False,
+    max_width=640,
+    normalize=False,
+    model=None,
+    raw=False,
+):
+    """
+    Runs hand tracking and gesture classification over frames
+    [start, stop) and yields one result dict per frame, without
+    temporal smoothing.
+
+    The `warmup` frames before `start` are processed but not reported,
+    so that MediaPipe's tracking state is re-established when a video is
+    split into chunks.
+
+    With `adaptive`, videos run the model only on the frames chosen by an
+    AdaptiveInferenceScheduler; landmarks on the other frames are
+    extrapolated and their records are marked "extrapolated".
+
+    With `roi`, inference runs on frames downscaled to at most
+    `max_width` pixels wide, or for videos on a crop around the tracked
+    hands (see RoiHandTracker).
+
+    With `normalize`, gestures are classified on landmarks in the
+    palm-aligned hand frame (see gestures.normalize). A `model`
+    (gestures.learned.LearnedClassifier) replaces the rules.
+
+    With `raw`, each record also holds the frame's float32 landmarks,
+    (label, score) handedness and (width, height) under "_raw", for
+    record_landmarks().
+    """
+    # Imported here so that modules reusing the record helpers (and
+    # pipeline.replay) start without loading MediaPipe
+    import mediapipe as mp
+
+    static = is_image_dir(source)
+    points = np.empty((max_num_hands, NUM_LANDMARKS, 3), dtype=np.float32)
+    scheduler = AdaptiveInferenceScheduler() if adaptive and not static else None
+
+    # Images are unrelated to each other, so they need no warm-up
+    first = start if static else max(0, start - warmup)
+
+    # Landmarks and (label, score) handedness of the hands in view
+    batch = points[:0]
+    handedness = []
+
+    with mp.solutions.hands.Hands(
+        static_image_mode=static,
+        max_num_hands=max_num_hands,
+        model_complexity=model_complexity,
+        min_detection_confidence=min_detection_confidence,
+        min_tracking_confidence=min_tracking_confidence,
+    ) as hands:
+        roi_tracker = RoiHandTracker(hands, max_width) if roi else None
+        preprocess = FramePreprocessor()
+
+        for index, name, timestamp_ms, frame in iter_frames(
+            source, first, stop
+        ):
+            t = (timestamp_ms or 0.0) / 1000.0
+            extrapolated = False
+
+            if scheduler is None or scheduler.should_infer(t):
+                started = time.perf_counter()
+                if roi_tracker is not None:
+                    # Unrelated images never share a crop
+                    if static:
+                        roi_tracker.reset()
+                    result = roi_tracker.process(frame)
+                else:
+                    result = hands.process(preprocess.to_rgb(frame))
+                elapsed = time.perf_counter() - started
+
+                # Mirror the landmarks rather than the pixels
+                if flip:
+                    mirror_landmarks(result)
+
+                batch = points[:0]
+                handedness = []
+                if result.multi_hand_landmarks:
+                    hands_lm = result.multi_hand_landmarks
+                    batch = multi_hand_to_array(
+                        hands_lm, points[:len(hands_lm)]
+                    )
+                    handedness = [
+                        (h.classification[0].label, h.classification[0].score)
+                        for h in result.multi_handedness or []
+                    ]
+
+                if scheduler is not None:
+                    scheduler.observe(batch, t, elapsed)
+            else:
+                predicted = scheduler.predict(t)
+                batch = points[:0] if predicted is None else predicted
+                extrapolated = True
+
+            # Warm-up frames only prime the tracker
+            if index < start:
+                continue
+
+            matches = None
+            if len(batch):
+                height, width = frame.shape[:2]
+                if model is not None:
+                    matches = model.classify_batch(batch, width / height)
+                elif normalize:
+                    matches = classify_normalized_batch(batch, width / height)
+                else:
+                    matches = classify_batch(batch)
+            record = make_record(
+                index, batch, matches, handedness,
+                name=name,
+                timestamp_ms=timestamp_ms,
+                extrapolated=extrapolated,
+                include_landmarks=include_landmarks,
+            )
+            if raw:
+                record["_raw"] = (
+                    batch.copy(), list(handedness), frame.shape[1::-1]
+                )
+            yield record
+
+
+def make_record(
+    index,
+    batch,
+    matches,
+    handedness,
+    name=None,
+    timestamp_ms=None,
+    extrapolated=False,
+    include_landmarks=False,
+):
+    """
+    Builds the result dict of one frame.
+
+    `batch` holds the (hands, 21, 3) landmarks of the frame, `matches`
+    their (hands, gestures) classification (None without hands) and
+    `handedness` a (label, score) pair for the first hands.
+    """
+    hands_out = []
+    detected = np.zeros(len(GESTURES), dtype=bool)
+
+    if matches is not None and len(matches):
+        detected = matches.any(axis=0)
+
+        for i, hand_matches in enumerate(matches):
+            hand = {
+                "gestures": [g for g, m in zip(GESTURES, hand_matches) if m],
+            }
+            if i < len(handedness):
+                hand["handedness"] = handedness[i][0]
+                hand["score"] = round(handedness[i][1], 4)
+            if include_landmarks:
+                hand["landmarks"] = batch[i].round(5).tolist()
+            hands_out.append(hand)
+
+    record = {"frame": index}
+    if name is not None:
+        record["image"] = name
+    if timestamp_ms is not None:
+        record["timestamp_ms"] = round(timestamp_ms, 3)
+    if extrapolated:
+        record["extrapolated"] = True
+    record["num_hands"] = len(hands_out)
+    record["detected"] = [g for g, d in zip(GESTURES, detected) if d]
+    record["hands"] = hands_out
+    return record
+
+
+def _analyze_chunk(job):
+    """
+    Process-pool entry point: analyzes one contiguous chunk of frames
+    with a Hands instance owned by the worker.
+    """
+    source, start, stop, options = job
+    return list(analyze(source, start, stop, **options))
+
+
+def split_chunks(num_frames, num_chunks):
+    """
+    Splits [0, num_frames) into contiguous (start, stop) ranges. The
+    last range has stop None and runs to the end of the stream, since
+    containers often report an estimate of their frame count.
+    """
+    bounds = np.linspace(0, num_frames, num_chunks + 1).astype(int)
+    chunks = [
+        (int(a), int(b)) for a, b in zip(bounds[:-1], bounds[1:]) if b > a
+    ]
+    if chunks:
+        chunks[-1] = (chunks[-1][0], None)
+    return chunks
+
+
+def smooth(records, on_frames=3, off_frames=5, on_ms=None, off_ms=None):
+    """
+    Runs the gesture smoothers over per-frame records in frame order and
+    adds the list of "active" gestures to each record.
+
+    If `on_ms` or `off_ms` is given, smoothing uses the video timestamps
+    instead of frame counts.
+    """
+    timed = on_ms is not None or off_ms is not None
+    if timed:
+        state = TimedGestureStateBank(
+            on_ms=100 if on_ms is None else on_ms,
+            off_ms=150 if off_ms is None else off_ms,
+        )
+    else:
+        state = GestureStateBank(on_frames=on_frames, off_frames=off_frames)
+    detected = np.zeros(len(GESTURES), dtype=bool)
+
+    for record in records:
+        names = record["detected"]
+        detected[:] = [g in names for g in GESTURES]
+        if timed:
+            state.update(detected, record["timestamp_ms"] / 1000.0)
+        else:
+            state.update(detected)
+
+        # Keep the per-hand details last
+        hands = record.pop("hands")
+        record["active"] = [g for g, s in zip(GESTURES, state.show[0]) if s]
+        record["hands"] = hands
+        yield record
+
+
+def process(
+    source,
+    workers=1,
+    overlap=5,
+    on_frames=3,
+    off_frames=5,
+    on_ms=None,
+    off_ms=None,
+    **options,
+):
+    """
+    Runs hand tracking and gesture classification over a video file or
+    an image directory and yields one result dict per frame.
+
+    Image directories are processed with static_image_mode=True, since
+    consecutive images are unrelated; videos use tracking mode. For
+    videos, "active" lists the gestures shown by the temporal smoothers.
+
+    With workers > 1, the frames are split into one contiguous chunk per
+    worker process, each with its own Hands instance. Each video chunk
+    starts `overlap` frames early to re-establish tracking. Results are
+    reassembled in frame order before smoothing, so the smoothed state
+    matches a serial run. Passing `on_ms`/`off_ms` smooths on the video
+    timestamps instead of frame counts.
+
+    Other keyword arguments are passed to analyze().
+    """
+    static = is_image_dir(source)
+    num_frames = count_frames(source) if workers > 1 else 0
+
+    if workers > 1 and num_frames > 1:
+        jobs = [
+            (source, start, stop, dict(options, warmup=overlap))
+            for start, stop in split_chunks(num_frames, workers)
+        ]
+        # Spawned workers start without any MediaPipe state from this process
+        ctx = multiprocessing.get_context("spawn")
+        with ctx.Pool(len(jobs)) as pool:
+            records = itertools.chain.from_iterable(
+                pool.imap(_analyze_chunk, jobs)
+            )
+            if static:
+                yield from records
+            else:
+                yield from smooth(records, on_frames, off_frames, on_ms, off_ms)
+        return
+
+    records = analyze(source, **options)
+    if static:
+        yield from records
+    else:
+        yield from smooth(records, on_frames, off_frames, on_ms, off_ms)
+
+
+def record_landmarks(records, recorder):
+    """
+    Writes the landmarks, handedness, timestamp and extrapolated flag of
+    each record to a LandmarkRecorder and yields the records. The size
+    of the first frame is recorded as the frame size.
+
+    The records must come from analyze(raw=True): the landmarks are
+    recorded at full precision, and the "_raw" entry is removed.
+    """
+    for record in records:
+        points, handedness, frame_size = record.pop("_raw")
+        if recorder.frame_size is None:
+            recorder.frame_size = frame_size
+        timestamp_ms = record.get("timestamp_ms")
+        recorder.write(
+            None if timestamp_ms is None else timestamp_ms / 1000.0,
+            points,
+            handedness,
+            extrapolated=record.get("extrapolated", False),
+        )
+        yield record
+
+
+def write_jsonl(records, out):
+    """
+    Writes one JSON object per line.
+    """
+    for record in records:
+        out.write(json.dumps(record, separators=(",", ":")))
+        out.write("\n")
+
+
+def write_csv(records, out):
+    """
+    Writes one row per frame, with one 0/1 column per gesture.
+    Per-hand details are only available in JSONL output.
+    """
+    writer = csv.writer(out)
+    writer.writerow(
+        ["frame", "image", "timestamp_ms", "num_hands"]
+        + list(GESTURES)
+        + ["active"]
+    )
+    for r in records:
+        detected = set(r["detected"])
+        writer.writerow(
+            [r["frame"], r.get("image", ""), r.get("timestamp_ms", ""),
+             r["num_hands"]]
+            + [int(g in detected) for g in GESTURES]
+            + ["|".join(r.get("active", []))]
+        )
+
+
+WRITERS = {"jsonl": write_jsonl, "csv": write_csv}
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Run gesture detection on a video file or image "
+                    "directory without opening a window."
+    )
+    parser.add_argument("source", help="video file or directory of images")
+    parser.add_argument(
+        "-o", "--output", help="output file (default: stdout)"
+    )
+    parser.add_argument(
+        "--format", choices=sorted(WRITERS),
+        help="output format (default: from the output extension, else jsonl)"
+    )
+    parser.add_argument("--max-hands", type=int, default=2)
+    parser.add_argument(
+        "--model-complexity", type=int, choices=(0, 1), default=1
+    )
+    parser.add_argument("--min-detection-confidence", type=float, default=0.6)
+    parser.add_argument("--min-tracking-confidence", type=float, default=0.6)
+    parser.add_argument(
+        "--flip", action="store_true",
+        help="mirror results horizontally, like the webcam demo"
+    )
+    parser.add_argument(
+        "--landmarks", action="store_true",
+        help="include the 21 landmarks per hand (JSONL only)"
+    )
+    parser.add_argument(
+        "--record", metavar="PATH",
+        help="also write the landmarks to a binary recording for "
+             "pipeline.replay"
+    )
+    parser.add_argument(
+        "--on-ms", type=float,
+        help="smooth on timestamps: activate after this many ms of detections"
+    )
+    parser.add_argument(
+        "--off-ms", type=float,
+        help="smooth on timestamps: deactivate after this many ms of misses"
+    )
+    parser.add_argument(
+        "--adaptive", action="store_true",
+        help="skip inference on some video frames and extrapolate landmarks"
+    )
+    parser.add_argument(
+        "--roi", action="store_true",
+        help="run inference on a downscaled frame or a crop around the hands"
+    )
+    parser.add_argument(
+        "--max-width", type=int, default=640,
+        help="largest inference input width with --roi"
+    )
+    parser.add_argument(
+        "--normalize", action="store_true",
+        help="classify rotation- and scale-invariant normalized landmarks"
+    )
+    parser.add_argument(
+        "--model", metavar="PATH",
+        help="classify with a learned model (see pipeline.train)"
+    )
+    parser.add_argument(
+        "--workers", type=int, default=1,
+        help="number of worker processes, each handling a contiguous chunk"
+    )
+    parser.add_argument(
+        "--overlap", type=int, default=5,
+        help="warm-up frames re-processed at the start of each video chunk"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    fmt = args.format
+    if fmt is None:
+        suffix = Path(args.output).suffix.lstrip(".") if args.output else ""
+        fmt = suffix if suffix in WRITERS else "jsonl"
+
+    records = process(
+        args.source,
+        max_num_hands=args.max_hands,
+        model_complexity=args.model_complexity,
+        min_detection_confidence=args.min_detection_confidence,
+        min_tracking_confidence=args.min_tracking_confidence,
+        flip=args.flip,
+        include_landmarks=args.landmarks,
+        adaptive=args.adaptive,
+        roi=args.roi,
+        raw=args.record is not None,
+        max_width=args.max_width,
+        normalize=args.normalize,
+        model=LearnedClassifier.load(args.model) if args.model else None,
+        workers=args.workers,
+        on_ms=args.on_ms,
+        off_ms=args.off_ms,
+        overlap=args.overlap,
+    )
+
+    recorder = None
+    if args.record:
+        recorder = LandmarkRecorder(args.record, max_num_hands=args.max_hands)
+        records = record_landmarks(records, recorder)
+
+    try:
+        if args.output:
+            with open(args.output, "w", newline="") as out:
+                WRITERS[fmt](records, out)
+        else:
+            WRITERS[fmt](records, sys.stdout)
+    finally:
+        if recorder is not None:
+            recorder.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+import threading
+import time
+from collections import deque
+
+import cv2
+
+
+class RateMeter:
+    """
+    Measures an event rate (events per second) over a sliding window.
+    """
+    def __init__(self, window=1.0):
+        self.window = window
+        self._times = deque()
+
+    def tick(self, now=None):
+        """
+        Records one event.
+        """
+        if now is None:
+            now = time.monotonic()
+        self._times.append(now)
+        self._trim(now)
+
+    def rate(self, now=None):
+        """
+        Returns the number of events per second in the last window.
+        """
+        if now is None:
+            now = time.monotonic()
+        self._trim(now)
+        return len(self._times) / self.window
+
+    def _trim(self, now):
+        while self._times and now - self._times[0] > self.window:
+            self._times.popleft()
+
+
+class ThreadedCapture:
+    """
+    Reads frames from a cv2.VideoCapture on a background thread.
+
+    Frames go into a small ring buffer. When the consumer falls behind,
+    the oldest frames are dropped, so read() always returns the newest
+    frame instead of a queued, stale one.
+    """
+    def __init__(self, source=0, buffer_size=2):
+        # Accept an existing VideoCapture or anything VideoCapture accepts
+        if isinstance(source, cv2.VideoCapture):
+            self.cap = source
+        else:
+            self.cap = cv2.VideoCapture(source)
+
+        # Bounded ring buffer of (frame_id, timestamp, frame)
+        self._buffer = deque(maxlen=buffer_size)
+        self._cond = threading.Condition()
+        self._thread = None
+        self._running = False
+        self._eof = False
+
+        # Counters
+        self.frames_captured = 0
+        self.frames_processed = 0
+        self.frames_dropped = 0
+        self._capture_rate = RateMeter()
+        self._process_rate = RateMeter()
+
+        # Id and capture time of the frame returned by the last read()
+        self.frame_id = -1
+        self.timestamp = None
+
+    def start(self):
+        """
+        Starts the capture thread. Returns self for chaining.
+        """
+        if self._thread is None:
+            self._running = True
+            self._thread = threading.Thread(
+                target=self._run, name="capture", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def _run(self):
+        while self._running:
+            ok, frame = self.cap.read()
+            now = time.monotonic()
+
+            with self._cond:
+                if not ok:
+                    self._eof = True
+                    self._cond.notify_all()
+                    break
+
+                # A full ring buffer silently evicts its oldest frame
+                if len(self._buffer) == self._buffer.maxlen:
+                    self.frames_dropped += 1
+
+                self._buffer.append((self.frames_captured, now, frame))
+                self.frames_captured += 1
+                self._capture_rate.tick(now)
+                self._cond.notify_all()
+
+    def read(self, timeout=None):
+        """
+        Returns (ok, frame) with the newest captured frame, waiting for
+        one if none is available yet. Older buffered frames are dropped.
+
+        ok is False once the source is exhausted or the wait times out.
+        """
+        with self._cond:
+            ready = self._cond.wait_for(
+                lambda: self._buffer or self._eof or not self._running,
+                timeout,
+            )
+            if not ready or not self._buffer:
+                return False, None
+
+            frame_id, timestamp, frame = self._buffer.pop()
+            self.frames_dropped += len(self._buffer)
+            self._buffer.clear()
+
+            self.frame_id = frame_id
+            self.timestamp = timestamp
+            self.frames_processed += 1
+            self._process_rate.tick()
+
+        return True, frame
+
+    @property
+    def finished(self):
+        """
+        True once the source is exhausted and every frame was read.
+        """
+        with self._cond:
+            return self._eof and not self._buffer
+
+    @property
+    def capture_fps(self):
+        """
+        Rate at which frames arrive from the camera.
+        """
+        with self._cond:
+            return self._capture_rate.rate()
+
+    @property
+    def processed_fps(self):
+        """
+        Rate at which frames are handed to the consumer.
+        """
+        with self._cond:
+            return self._process_rate.rate()
+
+    def stats(self):
+        """
+        Returns a snapshot of the capture counters.
+        """
+        return {
+            "capture_fps": self.capture_fps,
+            "processed_fps": self.processed_fps,
+            "frames_captured": self.frames_captured,
+            "frames_processed": self.frames_processed,
+            "frames_dropped": self.frames_dropped,
+        }
+
+    def stop(self):
+        """
+        Stops the capture thread and releases the camera.
+        """
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+        self.cap.release()
+
+    def release(self):
+        """
+        Alias of stop(), for symmetry with cv2.VideoCapture.
+        """
+        self.stop()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
@@ -0,0 +1,358 @@
+"""
+Gesture events: compact notifications emitted when a smoothed gesture
+turns on or off, instead of per-frame flags.
+
+A GestureEventEmitter compares the `show` flags of a GestureStateBank
+with those of the previous frame and emits one event per change:
+
+    {"event": "gesture_started", "gesture": "PEACE", "hand": 0,
+     "timestamp": 12.48, "confidence": 0.97}
+    {"event": "gesture_ended", "gesture": "PEACE", "hand": 0,
+     "timestamp": 14.02, "duration": 1.54}
+
+Events go to listeners: plain callbacks, a JsonlEventSink (stdout or a
+file), a SocketEventSink (JSONL to clients on a local TCP port), or an
+EventStream, which is an asyncio async iterator:
+
+    with emitter.stream() as events:
+        async for event in events:
+            ...
+"""
+import asyncio
+import json
+import socket
+import socketserver
+import sys
+import threading
+from collections import deque
+
+import numpy as np
+
+STARTED = "gesture_started"
+ENDED = "gesture_ended"
+
+
+class GestureEventEmitter:
+    """
+    Emits gesture_started / gesture_ended events on the transitions of
+    smoothed gesture flags.
+
+    `update()` is called once per frame with the (num_hands,
+    num_gestures) `show` array of a GestureStateBank; frames without a
+    transition cost one array comparison. Listeners are called on the
+    thread that calls update(), in the order they were added, with one
+    event dict each.
+    """
+    def __init__(self, gestures):
+        self.gestures = tuple(gestures)
+        self._listeners = []
+
+        # Flags of the previous frame, and start time and hand id of
+        # each shown gesture
+        self._show = None
+        self._since = None
+        self._hands = None
+
+        # Counters
+        self.events_emitted = 0
+
+    def add_listener(self, callback):
+        """
+        Calls `callback(event)` for every event. Returns the callback.
+        """
+        self._listeners.append(callback)
+        return callback
+
+    def remove_listener(self, callback):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def emit(self, event):
+        """
+        Sends one event to every listener.
+        """
+        self.events_emitted += 1
+        for listener in list(self._listeners):
+            listener(event)
+
+    def update(self, show, timestamp, confidence=None, ids=None, **fields):
+        """
+        Emits the transitions between the previous flags and `show`, a
+        boolean array of shape (num_hands, num_gestures), or
+        (num_gestures,) for a single hand. Returns the events.
+
+        `timestamp` is the capture time of the frame in seconds.
+        `confidence`, per hand or per (hand, gesture), is reported on
+        gesture_started events. Events name hands by their row in
+        `show`, or by `ids[row]` (see gestures.tracking) when given; a
+        gesture_ended event keeps the id its gesture started with.
+        `fields` are added to every event (for example the stream of a
+        multi-camera server).
+        """
+        show = np.asarray(show, dtype=bool)
+        if show.ndim == 1:
+            show = show[None, :]
+        if self._show is None or self._show.shape != show.shape:
+            self._show = np.zeros(show.shape, dtype=bool)
+            self._since = np.full(show.shape, np.nan)
+            self._hands = np.zeros(show.shape, dtype=np.int64)
+
+        changed = show != self._show
+        if not changed.any():
+            return []
+
+        if confidence is not None:
+            confidence = np.asarray(confidence, dtype=np.float64)
+            if confidence.ndim == 1:
+                confidence = confidence[:, None]
+            confidence = np.broadcast_to(confidence, show.shape)
+
+        events = []
+        # Endings first, so a switch reads as "A ended, B started"
+        for hand, g in zip(*np.nonzero(changed & self._show)):
+            events.append(self._ended(hand, g, timestamp, fields))
+        for hand, g in zip(*np.nonzero(changed & show)):
+            self._hands[hand, g] = hand if ids is None else ids[hand]
+            event = {
+                "event": STARTED,
+                "gesture": self.gestures[g],
+                "hand": int(self._hands[hand, g]),
+                "timestamp": round(float(timestamp), 4),
+            }
+            if confidence is not None and not np.isnan(confidence[hand, g]):
+                event["confidence"] = round(float(confidence[hand, g]), 4)
+            event.update(fields)
+            self._since[hand, g] = timestamp
+            events.append(event)
+
+        np.copyto(self._show, show)
+        for event in events:
+            self.emit(event)
+        return events
+
+    def finish(self, timestamp, **fields):
+        """
+        Ends every gesture still shown, for example when the source
+        closes. Returns the events.
+        """
+        if self._show is None or not self._show.any():
+            return []
+
+        events = [
+            self._ended(hand, g, timestamp, fields)
+            for hand, g in zip(*np.nonzero(self._show))
+        ]
+        self._show[:] = False
+        for event in events:
+            self.emit(event)
+        return events
+
+    def _ended(self, hand, g, timestamp, fields):
+        event = {
+            "event": ENDED,
+            "gesture": self.gestures[g],
+            "hand": int(self._hands[hand, g]),
+            "timestamp": round(float(timestamp), 4),
+            "duration": round(float(timestamp - self._since[hand, g]), 4),
+        }
+        event.update(fields)
+        self._since[hand, g] = np.nan
+        return event
+
+    def stream(self, maxsize=256):
+        """
+        Returns an EventStream of this emitter's events, for the running
+        asyncio event loop.
+        """
+        return EventStream(self, maxsize)
+
+
+class EventStream:
+    """
+    Async iterator over the events of a GestureEventEmitter.
+
+    Create it from a coroutine: events emitted on any thread are handed
+    to the event loop that was running at creation. At most `maxsize`
+    events wait in the queue; when the consumer falls behind, the oldest
+    are dropped (and counted in `dropped`). Iteration ends after close().
+    """
+    _CLOSED = object()
+
+    def __init__(self, emitter, maxsize=256):
+        self.emitter = emitter
+        self._loop = asyncio.get_running_loop()
+        self._queue = deque(maxlen=maxsize)
+        self._ready = asyncio.Event()
+        self._closed = False
+        self.dropped = 0
+        emitter.add_listener(self._push)
+
+    def _push(self, event):
+        try:
+            self._loop.call_soon_threadsafe(self._put, event)
+        except RuntimeError:
+            # The event loop is closed
+            self.emitter.remove_listener(self._push)
+
+    def _put(self, event):
+        if len(self._queue) == self._queue.maxlen:
+            self.dropped += 1
+        self._queue.append(event)
+        self._ready.set()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        while not self._queue:
+            if self._closed:
+                raise StopAsyncIteration
+            self._ready.clear()
+            await self._ready.wait()
+
+        event = self._queue.popleft()
+        if event is self._CLOSED:
+            self._closed = True
+            raise StopAsyncIteration
+        return event
+
+    def close(self):
+        """
+        Stops receiving events; iteration ends after the queued ones.
+        May be called from any thread.
+        """
+        self.emitter.remove_listener(self._push)
+        try:
+            self._loop.call_soon_threadsafe(self._finish)
+        except RuntimeError:
+            pass
+
+    def _finish(self):
+        self._queue.append(self._CLOSED)
+        self._ready.set()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class JsonlEventSink:
+    """
+    Writes events as JSON lines to a file (stdout by default), flushing
+    after each one so readers of a pipe see them immediately.
+    """
+    def __init__(self, file=None):
+        self.file = sys.stdout if file is None else file
+
+    def __call__(self, event):
+        self.file.write(json.dumps(event) + "\n")
+        self.file.flush()
+
+
+class SocketEventSink:
+    """
+    Serves events as JSON lines to every client connected to a local TCP
+    port (port 0 picks a free one; see `address`).
+
+    Clients only receive the events emitted while they are connected. A
+    client that does not take its events within `send_timeout` seconds
+    is disconnected, so a stuck reader cannot stall the pipeline.
+    """
+    def __init__(self, port=0, host="127.0.0.1", send_timeout=0.5):
+        self.send_timeout = send_timeout
+        self._clients = set()
+        self._lock = threading.Lock()
+        self._server = _serve_events(self, host, port)
+
+    @property
+    def address(self):
+        """
+        (host, port) of the event server.
+        """
+        return self._server.server_address
+
+    @property
+    def num_clients(self):
+        with self._lock:
+            return len(self._clients)
+
+    def __call__(self, event):
+        line = (json.dumps(event) + "\n").encode()
+        with self._lock:
+            clients = list(self._clients)
+
+        for conn in clients:
+            try:
+                conn.sendall(line)
+            except OSError:
+                self._drop(conn)
+
+    def _add(self, conn):
+        conn.settimeout(self.send_timeout)
+        with self._lock:
+            self._clients.add(conn)
+
+    def _drop(self, conn):
+        with self._lock:
+            if conn not in self._clients:
+                return
+            self._clients.discard(conn)
+        _disconnect(conn)
+
+    def close(self):
+        """
+        Disconnects the clients and stops the event server.
+        """
+        self._server.shutdown()
+        self._server.server_close()
+        with self._lock:
+            clients = list(self._clients)
+            self._clients.clear()
+        for conn in clients:
+            _disconnect(conn)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _disconnect(conn):
+    # Shutting down first wakes the handler thread blocked in recv() and
+    # sends the client an EOF even if a send timed out
+    try:
+        conn.shutdown(socket.SHUT_RDWR)
+    except OSError:
+        pass
+    try:
+        conn.close()
+    except OSError:
+        pass
+
+
+def _serve_events(sink, host, port):
+    class Handler(socketserver.BaseRequestHandler):
+        def handle(self):
+            sink._add(self.request)
+            try:
+                # Clients only listen; wait for them to hang up
+                while True:
+                    try:
+                        if not self.request.recv(1024):
+                            break
+                    except TimeoutError:
+                        continue
+            except OSError:
+                pass
+            finally:
+                sink._drop(self.request)
+
+    server = socketserver.ThreadingTCPServer((host, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(
+        target=server.serve_forever, name="events", daemon=True
+    ).start()
+    return server
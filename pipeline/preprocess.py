@@ -0,0 +1,72 @@
+import cv2
+import numpy as np
+
+
+class FramePreprocessor:
+    """
+    Mirrors frames and converts them to RGB into preallocated buffers.
+
+    cv2.flip and cv2.cvtColor write into buffers owned by the
+    preprocessor through their `dst` arguments, so no new frame-sized
+    array is allocated per frame. The buffers are reused on every call:
+    copy a returned array if it must outlive the next call.
+    """
+    def __init__(self):
+        self._flipped = None
+        self._rgb = None
+
+    def flip(self, frame_bgr):
+        """
+        Returns the frame mirrored horizontally.
+        """
+        self._flipped = buffer_like(self._flipped, frame_bgr.shape)
+        cv2.flip(frame_bgr, 1, dst=self._flipped)
+        return self._flipped
+
+    def to_rgb(self, frame_bgr):
+        """
+        Returns the frame converted from BGR to RGB.
+        """
+        self._rgb = buffer_like(self._rgb, frame_bgr.shape)
+        cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2RGB, dst=self._rgb)
+        return self._rgb
+
+    def __call__(self, frame_bgr):
+        """
+        Returns (mirrored BGR frame for display, mirrored RGB frame for
+        inference).
+        """
+        flipped = self.flip(frame_bgr)
+        return flipped, self.to_rgb(flipped)
+
+
+def buffer_like(buf, shape):
+    """
+    Returns `buf` if it has the requested shape, else a new uint8 array.
+    """
+    if buf is None or buf.shape != shape:
+        buf = np.empty(shape, dtype=np.uint8)
+    return buf
+
+
+def mirror_landmarks(result):
+    """
+    Mirrors a MediaPipe Hands result horizontally in place, as if the
+    input frame had been flipped with cv2.flip(frame, 1).
+
+    This replaces flipping the pixels when the mirrored frame itself is
+    not needed, for example in headless processing.
+    """
+    for hand_lm in result.multi_hand_landmarks or []:
+        for p in hand_lm.landmark:
+            p.x = 1.0 - p.x
+
+    # A mirrored left hand looks like a right hand
+    for handedness in result.multi_handedness or []:
+        for category in handedness.classification:
+            if category.label == "Left":
+                category.label = "Right"
+            elif category.label == "Right":
+                category.label = "Left"
+
+    return result
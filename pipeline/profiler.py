@@ -0,0 +1,345 @@
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import cv2
+import numpy as np
+
+from pipeline.capture import RateMeter
+
+# Quantiles reported for every stage
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+class _StageTimer:
+    """
+    Times one pipeline stage and keeps its last `window` durations.
+    Samples are recorded under the profiler's `lock`.
+    """
+    def __init__(self, window, lock):
+        self.samples = np.zeros(window)
+        self.count = 0
+        self.total = 0.0
+        self._lock = lock
+        self._started = 0.0
+
+    def __enter__(self):
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.record(time.perf_counter() - self._started)
+
+    def record(self, seconds):
+        with self._lock:
+            self.samples[self.count % len(self.samples)] = seconds
+            self.count += 1
+            self.total += seconds
+
+    def snapshot(self):
+        """
+        Returns (count, total, copy of the rolling window); call with
+        the profiler's lock held.
+        """
+        recent = self.samples[:min(self.count, len(self.samples))].copy()
+        return self.count, self.total, recent
+
+
+class _NullStage:
+    """
+    Stand-in timer used while profiling is disabled.
+    """
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+    def record(self, seconds):
+        pass
+
+
+_NULL_STAGE = _NullStage()
+
+
+class StageProfiler:
+    """
+    Per-stage latency profiler for the frame loop.
+
+    Each stage is timed with time.perf_counter (monotonic) by wrapping
+    it in `with profiler.stage(name):`. The last `window` durations of
+    every stage are kept in a ring buffer, and p50/p95/p99 are computed
+    from it on demand, so recording a sample is a single array store.
+
+    A disabled profiler hands out a shared no-op timer, so leaving the
+    `with` blocks in the loop costs next to nothing.
+
+    The profiler may be read (summary(), fps) from other threads than
+    the loop, such as the metrics server or a render thread: all its
+    state is guarded by one lock, and the quantiles are computed on a
+    copy outside of it.
+    """
+    def __init__(self, enabled=True, window=300):
+        self.enabled = enabled
+        self.window = window
+        self._lock = threading.Lock()
+        self._stages = {}
+        self._frame = _StageTimer(window, self._lock)
+        self._fps = RateMeter()
+        self._frame_started = None
+        # (monotonic time, summary) of the last snapshot
+        self._cached = None
+
+    def stage(self, name):
+        """
+        Returns the timer of a stage, to be used as a context manager.
+        """
+        if not self.enabled:
+            return _NULL_STAGE
+
+        timer = self._stages.get(name)
+        if timer is None:
+            with self._lock:
+                timer = self._stages.setdefault(
+                    name, _StageTimer(self.window, self._lock)
+                )
+        return timer
+
+    def frame_done(self):
+        """
+        Marks the end of a frame: records the time since the previous
+        call as the frame time and updates the FPS counter.
+        """
+        if not self.enabled:
+            return
+
+        now = time.perf_counter()
+        if self._frame_started is not None:
+            self._frame.record(now - self._frame_started)
+        self._frame_started = now
+        with self._lock:
+            self._fps.tick(time.monotonic())
+
+    @property
+    def fps(self):
+        with self._lock:
+            return self._fps.rate()
+
+    def summary(self, max_age=0.0):
+        """
+        Returns a JSON-serializable snapshot: the current FPS and, for
+        the whole frame and each stage, the sample count, total seconds
+        and rolling mean/quantiles in milliseconds.
+
+        Computing the quantiles takes about a millisecond, so callers
+        that run every frame pass `max_age` (seconds) to reuse a recent
+        snapshot.
+        """
+        now = time.monotonic()
+        with self._lock:
+            cached = self._cached
+            if cached is not None and now - cached[0] < max_age:
+                return cached[1]
+
+            fps = self._fps.rate()
+            stages = {"frame": self._frame.snapshot()}
+            for name, timer in self._stages.items():
+                stages[name] = timer.snapshot()
+
+        summary = {
+            "fps": round(fps, 2),
+            "stages": {
+                name: _describe(*snapshot)
+                for name, snapshot in stages.items()
+            },
+        }
+        with self._lock:
+            self._cached = (now, summary)
+        return summary
+
+    def reset(self):
+        """
+        Drops all recorded samples.
+        """
+        with self._lock:
+            self._stages = {}
+            self._frame = _StageTimer(self.window, self._lock)
+            self._fps = RateMeter()
+            self._frame_started = None
+            self._cached = None
+
+
+def _describe(count, total, recent):
+    recent = recent * 1000.0
+    stats = {"count": count, "total_s": round(total, 6)}
+    if len(recent):
+        stats["mean_ms"] = round(float(recent.mean()), 3)
+        for q, value in zip(QUANTILES, np.quantile(recent, QUANTILES)):
+            stats[f"p{round(q * 100)}_ms"] = round(float(value), 3)
+    return stats
+
+
+def draw_hud(frame, profiler, stages=None, refresh=0.5, summary=None):
+    """
+    Draws FPS and per-stage p50/p95 latencies in the top right corner.
+
+    `stages` limits the listed stages (default: all recorded stages);
+    the numbers are refreshed every `refresh` seconds. A `summary` taken
+    elsewhere (for example on the thread that owns the profiler) is
+    drawn instead of reading the profiler.
+    """
+    if summary is None:
+        summary = profiler.summary(max_age=refresh)
+    lines = [f"{summary['fps']:.1f} FPS"]
+    for name, stats in summary["stages"].items():
+        if "mean_ms" not in stats or (stages is not None and name not in stages):
+            continue
+        lines.append(f"{name} {stats['p50_ms']:.1f}/{stats['p95_ms']:.1f} ms")
+
+    W = frame.shape[1]
+    for i, line in enumerate(lines):
+        (tw, th), _ = cv2.getTextSize(line, cv2.FONT_HERSHEY_SIMPLEX, 0.5, 1)
+        org = (W - tw - 10, 20 + i * (th + 8))
+        cv2.putText(
+            frame, line, org, cv2.FONT_HERSHEY_SIMPLEX,
+            0.5, (0, 0, 0), 3, cv2.LINE_AA
+        )
+        cv2.putText(
+            frame, line, org, cv2.FONT_HERSHEY_SIMPLEX,
+            0.5, (255, 255, 255), 1, cv2.LINE_AA
+        )
+
+
+def to_prometheus(summary, prefix="handtracker"):
+    """
+    Formats a StageProfiler summary in the Prometheus text format.
+
+    Stage latencies become a summary metric in seconds, labelled by
+    stage, with the rolling quantiles and the all-time count and sum.
+    """
+    metric = f"{prefix}_stage_seconds"
+    lines = [
+        f"# HELP {prefix}_fps Frames per second over the last second.",
+        f"# TYPE {prefix}_fps gauge",
+        f"{prefix}_fps {summary['fps']}",
+        f"# HELP {metric} Latency of each frame loop stage.",
+        f"# TYPE {metric} summary",
+    ]
+    for name, stats in summary["stages"].items():
+        for q in QUANTILES:
+            key = f"p{round(q * 100)}_ms"
+            if key in stats:
+                lines.append(
+                    f'{metric}{{stage="{name}",quantile="{q}"}} '
+                    f"{stats[key] / 1000.0:.6f}"
+                )
+        lines.append(f'{metric}_sum{{stage="{name}"}} {stats["total_s"]}')
+        lines.append(f'{metric}_count{{stage="{name}"}} {stats["count"]}')
+    return "\n".join(lines) + "\n"
+
+
+class MetricsExporter:
+    """
+    Publishes StageProfiler summaries outside the process.
+
+    With `path`, maybe_export() rewrites a JSON file at most every
+    `interval` seconds; the file is replaced atomically, so readers
+    never see a partial write. With `port`, a local HTTP server on a
+    background thread serves the Prometheus text format at /metrics.
+    """
+    def __init__(
+        self,
+        profiler,
+        path=None,
+        port=None,
+        host="127.0.0.1",
+        interval=5.0,
+    ):
+        self.profiler = profiler
+        self.path = path
+        self.interval = interval
+        self._last_export = None
+        self._server = None
+
+        if port is not None:
+            self._server = _serve_metrics(profiler, host, port)
+
+    @property
+    def address(self):
+        """
+        (host, port) of the metrics server, or None.
+        """
+        return self._server.server_address if self._server else None
+
+    def maybe_export(self, now=None):
+        """
+        Writes the JSON file if `interval` seconds have passed since the
+        last write. Returns True when a file was written.
+        """
+        if self.path is None:
+            return False
+
+        if now is None:
+            now = time.monotonic()
+        if self._last_export is not None and now - self._last_export < self.interval:
+            return False
+
+        self._last_export = now
+        self.export()
+        return True
+
+    def export(self):
+        """
+        Writes the current summary to the JSON file.
+        """
+        summary = dict(self.profiler.summary(), time=time.time())
+
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+        os.replace(tmp, self.path)
+
+    def close(self):
+        """
+        Writes a final JSON summary and stops the metrics server.
+        """
+        if self.path is not None:
+            self.export()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _serve_metrics(profiler, host, port):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] not in ("/", "/metrics"):
+                self.send_error(404)
+                return
+
+            body = to_prometheus(profiler.summary()).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            # Keep scrapes out of the demo's console output
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(
+        target=server.serve_forever, name="metrics", daemon=True
+    ).start()
+    return server
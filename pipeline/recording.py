@@ -0,0 +1,282 @@
+"""
+Binary recordings of hand landmarks, for replaying sessions through the
+gesture classifiers without running MediaPipe again.
+
+File layout (little-endian):
+    header   32 bytes: magic b"HLMK", version (u16), floats per record
+             (u16), number of frames (u64), number of hand records (u64),
+             frame width and height in pixels (u32 each, 0 when unknown)
+    records  one fixed-stride float32 record per detected hand:
+             21 x (x, y, z) landmarks, handedness (0 = Left, 1 = Right,
+             NaN = unknown), handedness score
+    index    three columns with one entry per frame: capture timestamps
+             in seconds (f64, NaN when unknown), the number of hand
+             records of the frame (u16) and frame flags (u8, bit 0 set
+             when the landmarks were extrapolated rather than inferred)
+
+The hand records of frame i start at the sum of the counts of the frames
+before it. Frames without hands have a count of 0, so the index keeps
+the original timing. The header is written last, so a recording that
+was not closed is reported as incomplete. Version 1 recordings have no
+flags column and no frame size; they are read as having no extrapolated
+frames and an unknown frame size.
+"""
+import struct
+import time
+
+import numpy as np
+
+from gestures.classifier import NUM_LANDMARKS, multi_hand_to_array
+
+MAGIC = b"HLMK"
+VERSION = 2
+HEADER = struct.Struct("<4sHHQQII")
+
+# Landmarks, then handedness and score
+RECORD_FLOATS = NUM_LANDMARKS * 3 + 2
+HANDEDNESS = ("Left", "Right")
+
+# Frame flags
+EXTRAPOLATED = 1
+
+
+class LandmarkRecorder:
+    """
+    Writes timestamped landmarks, handedness and scores to a recording.
+
+    Hand records are appended to the file as frames arrive; the frame
+    index and the header are written by close().
+
+    `frame_size` is the (width, height) of the frames the landmarks were
+    found in, so that replays can correct for the aspect ratio; it may
+    also be set any time before close().
+    """
+    def __init__(self, path, max_num_hands=2, frame_size=None):
+        self.path = path
+        self.frame_size = frame_size
+        self._file = open(path, "wb")
+        self._file.write(bytes(HEADER.size))
+
+        self._timestamps = []
+        self._counts = []
+        self._flags = []
+        self.num_records = 0
+
+        # Reusable buffers for one frame
+        self._rows = np.empty((max_num_hands, RECORD_FLOATS), dtype=np.float32)
+        self._points = np.empty(
+            (max_num_hands, NUM_LANDMARKS, 3), dtype=np.float32
+        )
+
+    def write(self, timestamp, points, handedness=(), extrapolated=False):
+        """
+        Appends one frame.
+
+        `points` is a (hands, 21, 3) landmark array and `handedness` a
+        list of (label, score) pairs, one per hand when known. Mark
+        frames whose landmarks were predicted rather than inferred as
+        `extrapolated`.
+        """
+        k = len(points)
+        if k > len(self._rows):
+            self._rows = np.empty((k, RECORD_FLOATS), dtype=np.float32)
+
+        rows = self._rows[:k]
+        rows[:, :-2] = np.reshape(points, (k, NUM_LANDMARKS * 3))
+        rows[:, -2:] = np.nan
+        for i, (label, score) in enumerate(handedness[:k]):
+            if label in HANDEDNESS:
+                rows[i, -2] = HANDEDNESS.index(label)
+            rows[i, -1] = score
+
+        self._file.write(rows.tobytes())
+        self._timestamps.append(np.nan if timestamp is None else timestamp)
+        self._counts.append(k)
+        self._flags.append(EXTRAPOLATED if extrapolated else 0)
+        self.num_records += k
+
+    def write_result(self, timestamp, result):
+        """
+        Appends the hands of a MediaPipe Hands result.
+        """
+        hands_lm = result.multi_hand_landmarks or []
+        if len(hands_lm) > len(self._points):
+            self._points = np.empty(
+                (len(hands_lm), NUM_LANDMARKS, 3), dtype=np.float32
+            )
+        points = multi_hand_to_array(hands_lm, self._points[:len(hands_lm)])
+        handedness = [
+            (h.classification[0].label, h.classification[0].score)
+            for h in result.multi_handedness or []
+        ]
+        self.write(timestamp, points, handedness)
+
+    def __len__(self):
+        return len(self._counts)
+
+    def close(self):
+        """
+        Writes the frame index and the header, and closes the file.
+        """
+        if self._file.closed:
+            return
+
+        self._file.write(np.asarray(self._timestamps, dtype="<f8").tobytes())
+        self._file.write(np.asarray(self._counts, dtype="<u2").tobytes())
+        self._file.write(np.asarray(self._flags, dtype="u1").tobytes())
+        width, height = self.frame_size or (0, 0)
+        self._file.seek(0)
+        self._file.write(HEADER.pack(
+            MAGIC, VERSION, RECORD_FLOATS, len(self._counts),
+            self.num_records, width, height,
+        ))
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class LandmarkRecording:
+    """
+    Read-only, memory-mapped view of a recording.
+
+    Opening a recording only reads the header and the index counts; the
+    arrays below are views into the mapped file, so a session of any
+    length can be replayed or classified in bulk without loading it.
+
+    Attributes:
+        timestamps    (frames,) capture times in seconds
+        counts        (frames,) number of hands per frame
+        extrapolated  (frames,) True where the landmarks were predicted
+        offsets       (frames + 1,) first hand record of each frame
+        points        (records, 21, 3) landmarks of every recorded hand
+        handedness    (records,) 0 = Left, 1 = Right, NaN = unknown
+        scores        (records,) handedness scores
+        frame_size    (width, height) of the recorded frames, or None
+    """
+    def __init__(self, path):
+        self.path = path
+        self._mm = np.memmap(path, dtype=np.uint8, mode="r")
+
+        if len(self._mm) < HEADER.size:
+            raise ValueError(f"Not a landmark recording: {path}")
+        (
+            magic, version, floats, num_frames, num_records, width, height
+        ) = HEADER.unpack(self._mm[:HEADER.size].tobytes())
+        if magic == bytes(4):
+            raise ValueError(f"Incomplete recording (not closed): {path}")
+        if magic != MAGIC:
+            raise ValueError(f"Not a landmark recording: {path}")
+        if version not in (1, VERSION) or floats != RECORD_FLOATS:
+            raise ValueError(
+                f"Unsupported recording version {version} "
+                f"with {floats} floats per record: {path}"
+            )
+
+        self.frame_size = (width, height) if width and height else None
+
+        index_offset = HEADER.size + num_records * RECORD_FLOATS * 4
+        index_size = 10 if version == 1 else 11
+        if len(self._mm) != index_offset + num_frames * index_size:
+            raise ValueError(f"Truncated recording: {path}")
+
+        records = np.frombuffer(
+            self._mm, dtype="<f4", count=num_records * RECORD_FLOATS,
+            offset=HEADER.size,
+        ).reshape(num_records, RECORD_FLOATS)
+        self.points = records[:, :-2].reshape(num_records, NUM_LANDMARKS, 3)
+        self.handedness = records[:, -2]
+        self.scores = records[:, -1]
+
+        self.timestamps = np.frombuffer(
+            self._mm, dtype="<f8", count=num_frames, offset=index_offset
+        )
+        self.counts = np.frombuffer(
+            self._mm, dtype="<u2", count=num_frames,
+            offset=index_offset + num_frames * 8,
+        )
+        if version == 1:
+            self.extrapolated = np.zeros(num_frames, dtype=bool)
+        else:
+            flags = np.frombuffer(
+                self._mm, dtype="u1", count=num_frames,
+                offset=index_offset + num_frames * 10,
+            )
+            self.extrapolated = (flags & EXTRAPOLATED) != 0
+        self.offsets = np.zeros(num_frames + 1, dtype=np.int64)
+        np.cumsum(self.counts, out=self.offsets[1:])
+
+    def __len__(self):
+        return len(self.counts)
+
+    @property
+    def aspect(self):
+        """
+        Width / height ratio of the recorded frames, or None if unknown.
+        """
+        if self.frame_size is None:
+            return None
+        width, height = self.frame_size
+        return width / height
+
+    def frame(self, i):
+        """
+        Returns (timestamp, points, handedness) of frame i, where points
+        is a (hands, 21, 3) view and handedness a list of (label, score).
+        """
+        a = self.offsets[i]
+        b = self.offsets[i + 1]
+
+        # Handedness is known for the first hands of a frame, if any
+        handedness = []
+        for h, s in zip(self.handedness[a:b].tolist(), self.scores[a:b].tolist()):
+            if h != h:
+                break
+            handedness.append((HANDEDNESS[int(h)], s))
+        return float(self.timestamps[i]), self.points[a:b], handedness
+
+    def frames(self, start=0, stop=None, realtime=False, speed=1.0):
+        """
+        Yields (index, timestamp, points, handedness) for frames
+        [start, stop).
+
+        By default frames are yielded as fast as they are consumed. With
+        `realtime`, they are paced by their timestamps, divided by
+        `speed`; frames without a timestamp are not delayed.
+        """
+        stop = len(self) if stop is None else min(stop, len(self))
+        origin = None
+
+        for i in range(start, stop):
+            timestamp, points, handedness = self.frame(i)
+
+            if realtime and not np.isnan(timestamp):
+                now = time.monotonic()
+                if origin is None:
+                    origin = now - timestamp / speed
+                delay = origin + timestamp / speed - now
+                if delay > 0:
+                    time.sleep(delay)
+
+            yield i, timestamp, points, handedness
+
+    def __iter__(self):
+        return self.frames()
+
+    def close(self):
+        """
+        Drops the recording's references to the mapped file. The file is
+        unmapped once no array taken from it is referenced any more.
+        """
+        self._mm = None
+        self.points = self.handedness = self.scores = None
+        self.timestamps = self.counts = self.extrapolated = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
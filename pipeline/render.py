@@ -0,0 +1,192 @@
+import threading
+import time
+
+import cv2
+import numpy as np
+
+from pipeline.capture import RateMeter
+from pipeline.profiler import StageProfiler
+
+
+class AsyncRenderer:
+    """
+    Draws and displays frames on a consumer thread, so that the
+    inference loop never waits for drawing, cv2.imshow or cv2.waitKey.
+
+    The producer hands over each frame with submit(), together with the
+    state to draw (landmarks, active gesture, ...). Frames are copied
+    into a pool of three buffers, since the producer reuses its own: one
+    frame is being rendered, one is waiting, and the third receives the
+    next submit(). Only the newest waiting frame is kept; when rendering
+    falls behind, older frames are skipped rather than queued, and
+    rendering never runs faster than `max_fps` (the display rate).
+
+    `draw(frame, *state)` draws the overlays on the copied frame, and
+    `show(frame)` displays it and returns the key pressed, or -1 (by
+    default, in a HighGUI window). With a `profiler`, showing the frame
+    is timed as the "display" stage.
+
+    HighGUI windows must be driven from the main thread on some
+    platforms (macOS), so run() renders on the calling thread; run the
+    inference loop on another thread. start() renders on a background
+    thread instead, where the platform allows it.
+    """
+    def __init__(
+        self,
+        draw,
+        window="Hand Tracking",
+        max_fps=60.0,
+        profiler=None,
+        show=None,
+    ):
+        self.draw = draw
+        self.show = show
+        self.window = window
+        self.max_fps = max_fps
+        self.profiler = profiler or StageProfiler(enabled=False)
+
+        self._cond = threading.Condition()
+        self._spare = [None, None, None]
+        self._pending = None
+        self._running = True
+        self._thread = None
+
+        # Last key pressed in the window (-1 for none) and ESC state
+        self.key = -1
+        self.closed = False
+
+        # Counters
+        self.frames_submitted = 0
+        self.frames_rendered = 0
+        self.frames_skipped = 0
+        self._render_rate = RateMeter()
+
+    def submit(self, frame, *state):
+        """
+        Queues a frame and its state for rendering, replacing a frame
+        that is still waiting. Returns False once the renderer is closed.
+        """
+        with self._cond:
+            if self.closed or not self._running:
+                return False
+
+            buf = self._spare.pop()
+            if buf is None or buf.shape != frame.shape:
+                buf = np.empty_like(frame)
+            np.copyto(buf, frame)
+
+            if self._pending is not None:
+                self._spare.append(self._pending[0])
+                self.frames_skipped += 1
+            self._pending = (buf, state)
+            self.frames_submitted += 1
+            self._cond.notify_all()
+        return True
+
+    def run(self):
+        """
+        Renders submitted frames on the calling thread until stop() is
+        called or ESC is pressed in the window.
+        """
+        interval = 1.0 / self.max_fps if self.max_fps else 0.0
+        last = 0.0
+
+        while True:
+            # Keep the window responsive while waiting for a frame
+            with self._cond:
+                self._cond.wait_for(
+                    lambda: self._pending is not None or not self._running,
+                    timeout=0.05,
+                )
+                if not self._running:
+                    break
+                job = None
+                if time.monotonic() - last >= interval:
+                    job, self._pending = self._pending, None
+
+            if job is None:
+                # Nothing new yet, or too soon after the last frame
+                delay = last + interval - time.monotonic()
+                key = self._idle(max(1, round(delay * 1000)))
+            else:
+                frame, state = job
+                self.draw(frame, *state)
+                with self.profiler.stage("display"):
+                    key = self._show(frame)
+                last = time.monotonic()
+
+                with self._cond:
+                    self._spare.append(frame)
+                    self.frames_rendered += 1
+                    self._render_rate.tick(last)
+
+            if key != -1:
+                self.key = key
+            if key == 27:
+                with self._cond:
+                    self.closed = True
+                    self._cond.notify_all()
+                break
+
+    def _show(self, frame):
+        if self.show is not None:
+            return self.show(frame)
+        cv2.imshow(self.window, frame)
+        key = cv2.waitKey(1) & 0xFF
+        return -1 if key == 0xFF else key
+
+    def _idle(self, ms):
+        # The window only processes its events inside cv2.waitKey
+        if self.show is not None:
+            time.sleep(ms / 1000.0)
+            return -1
+        key = cv2.waitKey(ms) & 0xFF
+        return -1 if key == 0xFF else key
+
+    def start(self):
+        """
+        Starts rendering on a background thread. Returns self.
+        """
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self.run, name="render", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    @property
+    def render_fps(self):
+        """
+        Rate at which frames are displayed.
+        """
+        with self._cond:
+            return self._render_rate.rate()
+
+    def stats(self):
+        """
+        Returns a snapshot of the render counters.
+        """
+        return {
+            "render_fps": self.render_fps,
+            "frames_submitted": self.frames_submitted,
+            "frames_rendered": self.frames_rendered,
+            "frames_skipped": self.frames_skipped,
+        }
+
+    def stop(self):
+        """
+        Stops rendering; run() returns after the current frame.
+        """
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
@@ -0,0 +1,165 @@
+"""
+Replays a landmark recording through the gesture classifier and the
+temporal smoothers, without running MediaPipe, and writes one result
+per frame in the same JSONL/CSV format as pipeline.batch.
+
+Usage (from the project root):
+    python -m pipeline.batch session.mp4 --record session.lmk
+    python -m pipeline.replay session.lmk -o session.jsonl
+    python -m pipeline.replay session.lmk --realtime
+    python -m pipeline.replay session.lmk --normalize
+"""
+import argparse
+import sys
+from pathlib import Path
+
+import numpy as np
+
+from gestures.classifier import classify_batch
+from gestures.learned import LearnedClassifier
+from gestures.normalize import classify_normalized_batch
+from pipeline.batch import WRITERS, make_record, smooth
+from pipeline.recording import LandmarkRecording
+
+
+def replay(
+    recording,
+    realtime=False,
+    speed=1.0,
+    include_landmarks=False,
+    normalize=False,
+    aspect=None,
+    model=None,
+):
+    """
+    Yields one unsmoothed result dict per frame of a LandmarkRecording.
+
+    At full speed, all hands of the recording are classified in a single
+    vectorized call. With `realtime`, frames are paced by their
+    timestamps (divided by `speed`) and classified as they arrive, like
+    a live camera.
+
+    With `normalize`, gestures are classified on landmarks in the
+    palm-aligned hand frame (see gestures.normalize). A `model`
+    (gestures.learned.LearnedClassifier) replaces the rules. Both use
+    the width / height ratio of the recorded frames, or `aspect` when
+    given (1.0 if the recording has no frame size).
+    """
+    if aspect is None:
+        aspect = recording.aspect or 1.0
+    if model is not None:
+        def classify(points):
+            return model.classify_batch(points, aspect)
+    elif normalize:
+        def classify(points):
+            return classify_normalized_batch(points, aspect)
+    else:
+        classify = classify_batch
+
+    matches = None if realtime else classify(recording.points)
+
+    for i, timestamp, points, handedness in recording.frames(
+        realtime=realtime, speed=speed
+    ):
+        if matches is not None:
+            frame_matches = matches[recording.offsets[i]:recording.offsets[i + 1]]
+        else:
+            frame_matches = classify(points) if len(points) else None
+
+        yield make_record(
+            i, points, frame_matches, handedness,
+            timestamp_ms=None if timestamp != timestamp else timestamp * 1000.0,
+            extrapolated=bool(recording.extrapolated[i]),
+            include_landmarks=include_landmarks,
+        )
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Replay a landmark recording through the gesture "
+                    "classifier without running MediaPipe."
+    )
+    parser.add_argument("recording", help="recording written with --record")
+    parser.add_argument(
+        "-o", "--output", help="output file (default: stdout)"
+    )
+    parser.add_argument(
+        "--format", choices=sorted(WRITERS),
+        help="output format (default: from the output extension, else jsonl)"
+    )
+    parser.add_argument(
+        "--realtime", action="store_true",
+        help="pace frames by their recorded timestamps"
+    )
+    parser.add_argument(
+        "--speed", type=float, default=1.0,
+        help="playback speed factor with --realtime"
+    )
+    parser.add_argument(
+        "--landmarks", action="store_true",
+        help="include the 21 landmarks per hand (JSONL only)"
+    )
+    parser.add_argument(
+        "--normalize", action="store_true",
+        help="classify rotation- and scale-invariant normalized landmarks"
+    )
+    parser.add_argument(
+        "--aspect", type=float,
+        help="override the width / height of the recorded frames, with "
+             "--normalize or --model"
+    )
+    parser.add_argument(
+        "--model", metavar="PATH",
+        help="classify with a learned model (see pipeline.train)"
+    )
+    parser.add_argument("--on-frames", type=int, default=3)
+    parser.add_argument("--off-frames", type=int, default=5)
+    parser.add_argument(
+        "--on-ms", type=float,
+        help="smooth on timestamps: activate after this many ms of detections"
+    )
+    parser.add_argument(
+        "--off-ms", type=float,
+        help="smooth on timestamps: deactivate after this many ms of misses"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    recording = LandmarkRecording(args.recording)
+
+    timed = args.on_ms is not None or args.off_ms is not None
+    if timed and np.isnan(recording.timestamps).any():
+        sys.exit("--on-ms/--off-ms need a recording with timestamps")
+
+    fmt = args.format
+    if fmt is None:
+        suffix = Path(args.output).suffix.lstrip(".") if args.output else ""
+        fmt = suffix if suffix in WRITERS else "jsonl"
+
+    records = smooth(
+        replay(
+            recording,
+            realtime=args.realtime,
+            speed=args.speed,
+            include_landmarks=args.landmarks,
+            normalize=args.normalize,
+            aspect=args.aspect,
+            model=LearnedClassifier.load(args.model) if args.model else None,
+        ),
+        args.on_frames,
+        args.off_frames,
+        args.on_ms,
+        args.off_ms,
+    )
+
+    if args.output:
+        with open(args.output, "w", newline="") as out:
+            WRITERS[fmt](records, out)
+    else:
+        WRITERS[fmt](records, sys.stdout)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+import cv2
+import numpy as np
+
+from pipeline.preprocess import FramePreprocessor, buffer_like
+
+
+class RoiHandTracker:
+    """
+    Runs a MediaPipe Hands instance on a smaller input than the full
+    camera frame.
+
+    Without a tracked hand, the whole frame is downscaled to at most
+    `max_width` pixels wide before inference. Once hands are tracked,
+    frames are cropped to a padded square around them (also downscaled
+    to at most `max_width`). Landmarks are remapped to full-frame
+    normalized coordinates in place, so the result can be classified
+    and drawn as if the full frame had been processed.
+
+    MediaPipe tracks hands in the coordinates of its input image, so the
+    crop is kept still while the hands stay well inside it and only
+    moves when they approach its border. After a move, MediaPipe may
+    need one frame to re-detect the hand inside the new crop.
+    """
+    def __init__(
+        self,
+        hands,
+        max_width=640,
+        padding=0.75,
+        margin=0.15,
+        min_size=0.2,
+        lost_frames=2,
+    ):
+        self.hands = hands
+        self.max_width = max_width
+
+        # Padding on each side of the landmark bounding box, relative to
+        # its size; the palm detector needs context around the hand
+        self.padding = padding
+
+        # The crop moves when the hands come closer than this fraction
+        # of its side to its border
+        self.margin = margin
+
+        # Smallest crop side, relative to the shorter frame side
+        self.min_size = min_size
+
+        # Consecutive empty crops before falling back to the full frame
+        self.lost_frames = lost_frames
+
+        # Current crop box (x0, y0, x1, y1) in pixels, if any
+        self.roi = None
+        self._misses = 0
+
+        # Reusable buffers for the downscaled and RGB inputs
+        self._small = None
+        self._preprocess = FramePreprocessor()
+
+    def process(self, frame_bgr):
+        """
+        Runs hand tracking on a BGR frame and returns the MediaPipe
+        result with landmarks in full-frame normalized coordinates.
+        """
+        H, W = frame_bgr.shape[:2]
+        box = self.roi if self.roi is not None else (0, 0, W, H)
+        result = self._run(frame_bgr, box)
+
+        if not result.multi_hand_landmarks:
+            # Give MediaPipe a chance to re-detect inside the crop before
+            # going back to the full frame
+            self._misses += 1
+            if self._misses >= self.lost_frames:
+                self.roi = None
+            return result
+
+        self._misses = 0
+        self._update_roi(result, W, H)
+        return result
+
+    def reset(self):
+        """
+        Forgets the tracked region; the next frame uses the full frame.
+        """
+        self.roi = None
+        self._misses = 0
+
+    @property
+    def state(self):
+        """
+        The tracked region and miss count. Assigning a saved state lets
+        one tracker (and its Hands instance) serve several streams in
+        turn, each continuing from its own last crop.
+        """
+        return self.roi, self._misses
+
+    @state.setter
+    def state(self, state):
+        self.roi, self._misses = state
+
+    def _run(self, frame_bgr, box):
+        H, W = frame_bgr.shape[:2]
+        x0, y0, x1, y1 = box
+        crop = frame_bgr[y0:y1, x0:x1]
+
+        # Downscale wide inputs; normalized coordinates are unaffected
+        cw = x1 - x0
+        ch = y1 - y0
+        if cw > self.max_width:
+            size = (self.max_width, max(1, round(ch * self.max_width / cw)))
+            self._small = buffer_like(self._small, (size[1], size[0], 3))
+            crop = cv2.resize(
+                crop, size, dst=self._small, interpolation=cv2.INTER_LINEAR
+            )
+
+        rgb = self._preprocess.to_rgb(crop)
+        result = self.hands.process(rgb)
+
+        # Remap crop-normalized landmarks to the full frame
+        if result.multi_hand_landmarks and box != (0, 0, W, H):
+            sx = cw / W
+            sy = ch / H
+            ox = x0 / W
+            oy = y0 / H
+            for hand_lm in result.multi_hand_landmarks:
+                for p in hand_lm.landmark:
+                    p.x = ox + p.x * sx
+                    p.y = oy + p.y * sy
+                    # z uses the same scale as x
+                    p.z = p.z * sx
+
+        return result
+
+    def _update_roi(self, result, W, H):
+        xy = np.array([
+            (p.x * W, p.y * H)
+            for hand_lm in result.multi_hand_landmarks
+            for p in hand_lm.landmark
+        ])
+        lo = xy.min(axis=0)
+        hi = xy.max(axis=0)
+
+        # Keep the current crop while the hands stay well inside it
+        if self.roi is not None:
+            x0, y0, x1, y1 = self.roi
+            inset = self.margin * min(x1 - x0, y1 - y0)
+            if (
+                lo[0] >= x0 + inset and lo[1] >= y0 + inset
+                and hi[0] <= x1 - inset and hi[1] <= y1 - inset
+            ):
+                return
+
+        # Padded square around all hands, shifted to stay in the frame
+        side = (hi - lo).max() * (1 + 2 * self.padding)
+        side = int(min(max(side, self.min_size * min(W, H)), min(W, H)))
+        cx, cy = (lo + hi) / 2
+        x0 = int(min(max(0, cx - side / 2), W - side))
+        y0 = int(min(max(0, cy - side / 2), H - side))
+
+        # Not worth cropping when the box covers most of the frame
+        if side * side > 0.8 * W * H:
+            self.roi = None
+        else:
+            self.roi = (x0, y0, x0 + side, y0 + side)
@@ -0,0 +1,173 @@
+import math
+import time
+
+import numpy as np
+
+
+class AdaptiveInferenceScheduler:
+    """
+    Decides on which frames to run the hand model and extrapolates
+    landmarks on the frames in between.
+
+    The model runs every k-th frame. k grows when the hands are still
+    and shrinks when they move fast, and it is raised further when
+    inference takes more than `cpu_budget` of the frame interval. On
+    skipped frames, landmarks are extrapolated at constant velocity
+    from the last two inferences.
+
+    Typical use:
+        if scheduler.should_infer(t):
+            points = run_model(frame)
+            scheduler.observe(points, t, inference_time)
+        else:
+            points = scheduler.predict(t)
+    """
+    def __init__(
+        self,
+        max_skip=4,
+        slow_motion=0.1,
+        fast_motion=0.6,
+        idle_skip=2,
+        cpu_budget=0.5,
+    ):
+        # Largest k (run the model on 1 of every max_skip frames)
+        self.max_skip = max_skip
+
+        # Palm speed thresholds, in normalized image units per second:
+        # at or below slow_motion k = max_skip, at or above fast_motion k = 1
+        self.slow_motion = slow_motion
+        self.fast_motion = fast_motion
+
+        # k used while no hand is tracked
+        self.idle_skip = idle_skip
+
+        # Target share of each frame interval spent on inference
+        self.cpu_budget = cpu_budget
+
+        self.skip = 1
+        self.frames = 0
+        self.inferences = 0
+
+        self._since_infer = 0
+        self._last_frame = None
+        self._frame_interval = None
+        self._infer_time = None
+
+        # Last two observations: (timestamp, points)
+        self._t0 = None
+        self._p0 = None
+        self._t1 = None
+        self._p1 = None
+        self._velocity = None
+        self.motion = 0.0
+
+    def should_infer(self, timestamp=None):
+        """
+        Registers a new frame and returns True if the model should run
+        on it.
+        """
+        now = time.monotonic() if timestamp is None else timestamp
+        self.frames += 1
+
+        if self._last_frame is not None:
+            self._frame_interval = _ema(
+                self._frame_interval, now - self._last_frame
+            )
+        self._last_frame = now
+
+        # Always infer until there is something to extrapolate from
+        if self._t1 is None or self._since_infer + 1 >= self.skip:
+            self._since_infer = 0
+            return True
+
+        self._since_infer += 1
+        return False
+
+    def observe(self, points, timestamp=None, inference_time=None):
+        """
+        Records the result of an inference: an (N, 21, 3) landmark array,
+        or None when no hand was found. `inference_time` is the model's
+        run time in seconds.
+        """
+        now = time.monotonic() if timestamp is None else timestamp
+        self.inferences += 1
+
+        if inference_time is not None:
+            self._infer_time = _ema(self._infer_time, inference_time)
+
+        if points is not None and len(points) == 0:
+            points = None
+        if points is not None:
+            points = np.array(points, dtype=np.float32)
+
+        self._t0, self._p0 = self._t1, self._p1
+        self._t1, self._p1 = now, points
+
+        # Velocity needs two observations of the same number of hands
+        self._velocity = None
+        self.motion = 0.0
+        if (
+            self._p0 is not None
+            and self._p1 is not None
+            and self._p0.shape == self._p1.shape
+            and self._t1 > self._t0
+        ):
+            self._velocity = (self._p1 - self._p0) / (self._t1 - self._t0)
+
+            # Palm speed: mean landmark velocity in x/y, fastest hand
+            palm = self._velocity[..., :2].mean(axis=-2)
+            self.motion = float(np.linalg.norm(palm, axis=-1).max())
+
+        self.skip = self._choose_skip(points is not None)
+
+    def predict(self, timestamp=None):
+        """
+        Returns landmarks extrapolated to `timestamp`, or None when no
+        hand is tracked.
+        """
+        if self._p1 is None:
+            return None
+        if self._velocity is None:
+            return self._p1.copy()
+
+        now = time.monotonic() if timestamp is None else timestamp
+        return self._p1 + self._velocity * (now - self._t1)
+
+    @property
+    def inference_ratio(self):
+        """
+        Fraction of frames on which the model ran.
+        """
+        return self.inferences / self.frames if self.frames else 1.0
+
+    def _choose_skip(self, tracking):
+        # Skip needed to keep inference within the CPU budget
+        cpu_skip = 1
+        if self._infer_time and self._frame_interval:
+            load = self._infer_time / self._frame_interval
+            cpu_skip = math.ceil(load / self.cpu_budget)
+
+        if not tracking:
+            motion_skip = self.idle_skip
+        elif self._velocity is None:
+            # Motion unknown yet: infer again to measure it
+            motion_skip = 1
+        elif self.motion >= self.fast_motion:
+            motion_skip = 1
+        elif self.motion <= self.slow_motion:
+            motion_skip = self.max_skip
+        else:
+            # Interpolate linearly between the two thresholds
+            f = (self.fast_motion - self.motion) / (
+                self.fast_motion - self.slow_motion
+            )
+            motion_skip = 1 + round(f * (self.max_skip - 1))
+
+        return int(min(max(motion_skip, cpu_skip, 1), self.max_skip))
+
+
+def _ema(avg, value, alpha=0.1):
+    """
+    Exponential moving average helper.
+    """
+    return value if avg is None else avg + alpha * (value - avg)
@@ -0,0 +1,548 @@
+"""
+Serves gesture recognition for several camera or video streams from a
+fixed pool of hand-model worker processes.
+
+Every worker loads one MediaPipe Hands model and takes frames from any
+stream, so N cameras need as many models as there are workers, not N.
+The models run in static image mode, since consecutive frames of a
+worker come from different streams. With `crop`, frames are cropped
+around the hands found in the previous frame of their stream (see
+RoiHandTracker); that crop is the stream's tracking state, and it
+travels with the stream's frames from worker to worker. Classification
+and temporal smoothing run in the server process, with one smoothing
+bank per stream.
+
+Frames reach the workers through shared memory: each stream decodes or
+copies its frames into a SharedFrameRing, and only the slot index goes
+through the task queue. Workers read the slot in place, and send back
+landmarks only.
+
+Scheduling is fair: each stream has at most one frame in flight, and
+free workers go to the streams in round-robin order. A busy stream
+therefore gets at most its share of the workers. Video files are read
+only when their next frame can be scheduled (backpressure); cameras keep
+capturing and only their newest frame is sent.
+
+Usage (from the project root):
+    python -m pipeline.server 0 1 --workers 2
+    python -m pipeline.server a.mp4 b.mp4 c.mp4 --workers 3 -o out.jsonl
+    python -m pipeline.server 0 1 --events
+"""
+import argparse
+import json
+import multiprocessing
+import queue
+import sys
+import time
+
+import cv2
+import numpy as np
+
+from gestures.classifier import GESTURES, classify_batch, multi_hand_to_array
+from gestures.state import GestureStateBank
+from pipeline.batch import make_record
+from pipeline.capture import ThreadedCapture
+from pipeline.events import GestureEventEmitter, JsonlEventSink
+from pipeline.roi import RoiHandTracker
+from pipeline.shm import SharedFrameRing
+
+
+def _worker(tasks, results, options):
+    """
+    Worker process: runs one Hands model over frames of any stream.
+    """
+    # Imported in the worker, which is a fresh (spawned) interpreter
+    import mediapipe as mp
+
+    with mp.solutions.hands.Hands(
+        static_image_mode=True,
+        max_num_hands=options["max_num_hands"],
+        model_complexity=options["model_complexity"],
+        min_detection_confidence=options["min_detection_confidence"],
+    ) as hands:
+        tracker = RoiHandTracker(hands, options["max_width"])
+
+        # Frame ring of each stream, attached on its first frame
+        rings = {}
+
+        # The model is loaded
+        results.put(None)
+
+        while True:
+            job = tasks.get()
+            if job is None:
+                break
+
+            stream_id, frame_id, timestamp, spec, slot, state = job
+            ring = rings.get(stream_id)
+            if ring is None or ring.spec != spec:
+                if ring is not None:
+                    ring.close()
+                ring = rings[stream_id] = SharedFrameRing.attach(spec)
+
+            if options["crop"]:
+                tracker.state = state
+            else:
+                tracker.reset()
+
+            started = time.perf_counter()
+            result = tracker.process(ring[slot])
+            elapsed = time.perf_counter() - started
+
+            hands_lm = result.multi_hand_landmarks or []
+            handedness = [
+                (h.classification[0].label, h.classification[0].score)
+                for h in result.multi_handedness or []
+            ]
+            results.put((
+                stream_id, frame_id, timestamp,
+                multi_hand_to_array(hands_lm), handedness,
+                tracker.state if options["crop"] else (None, 0), elapsed,
+            ))
+
+    for ring in rings.values():
+        ring.close()
+
+
+class _Stream:
+    """
+    Server-side state of one stream: its source, frame ring, tracking
+    crop and gesture smoothing.
+
+    The ring has two slots: one for the frame in flight, and one where
+    a video decodes its next frame in the meantime (prefetch()).
+    """
+    def __init__(
+        self, stream_id, source, live, on_frames, off_frames, listener
+    ):
+        self.id = stream_id
+        self.source = source
+        self.live = live
+        if live:
+            self.cap = ThreadedCapture(source).start()
+        else:
+            self.cap = cv2.VideoCapture(source)
+
+        self.state = GestureStateBank(
+            on_frames=on_frames, off_frames=off_frames
+        )
+        self.events = GestureEventEmitter(GESTURES)
+        self.events.add_listener(listener)
+        self.tracking = (None, 0)
+        self.finished = False
+        self.frames = 0
+        self.timestamp = 0.0
+
+        # Ring and slot of the frame in flight, if any
+        self.in_flight = None
+
+        self.ring = None
+        self._retired = []
+        self._prefetched = None
+
+    def read(self):
+        """
+        Returns (timestamp, ring, slot) of the next frame to process, or
+        None if a camera has no new frame yet or the stream has ended.
+        """
+        if self._prefetched is not None:
+            frame, self._prefetched = self._prefetched, None
+            return frame
+        return self._read()
+
+    def prefetch(self):
+        """
+        Decodes the next frame of a video while the current one is in
+        flight.
+        """
+        if not self.live and not self.finished and self._prefetched is None:
+            self._prefetched = self._read()
+
+    def _read(self):
+        if self.live:
+            ok, frame = self.cap.read(timeout=0)
+            if not ok:
+                self.finished = self.cap.finished
+                return None
+            ring = self._ring_for(frame.shape)
+            return self.cap.timestamp, ring, ring.write(frame)
+
+        if self.ring is not None:
+            ok, slot, frame = self.ring.read_from(self.cap)
+        else:
+            (ok, frame), slot = self.cap.read(), None
+        if not ok:
+            self.finished = True
+            return None
+
+        ring = self.ring
+        if slot is None:
+            # First frame, or the frame size changed
+            ring = self._ring_for(frame.shape)
+            slot = ring.write(frame)
+        return self.cap.get(cv2.CAP_PROP_POS_MSEC) / 1000.0, ring, slot
+
+    def _ring_for(self, shape):
+        if self.ring is None or self.ring.shape != shape:
+            if self.ring is not None:
+                # Closed once its frames are processed
+                self._retired.append(self.ring)
+            self.ring = SharedFrameRing(shape, slots=2)
+        return self.ring
+
+    def done(self):
+        """
+        Frees the slot of the frame in flight.
+        """
+        ring, slot = self.in_flight
+        ring.release(slot)
+        self.in_flight = None
+
+        for old in [r for r in self._retired if not r.in_use]:
+            old.close()
+            self._retired.remove(old)
+
+    def release(self):
+        self.cap.release()
+        for ring in self._retired + [self.ring]:
+            if ring is not None:
+                ring.close()
+        self.ring = None
+        self._retired = []
+
+
+class GestureServer:
+    """
+    Runs gesture recognition on several streams with a shared pool of
+    `workers` hand-model processes.
+
+    `sources` are camera indices or video paths. Cameras (int sources,
+    or all sources with `live`) drop frames they cannot keep up with;
+    videos are processed frame by frame.
+
+    `crop` runs the model on a crop around the hands of the previous
+    frame, which is cheaper on large frames; in static image mode the
+    palm detector can miss hands in the crop that it finds in the full
+    frame, so it is off by default.
+
+    Iterate over the server, or over results(), to run it: one result
+    dict per processed frame, in the pipeline.batch format plus the
+    "stream" index and the "active" gestures of that stream.
+
+    `events` is a GestureEventEmitter with the gesture_started /
+    gesture_ended events of all streams, each with its "stream" index;
+    add listeners to it to follow gestures without reading every result.
+    """
+    # Entry point of the worker processes, called with the task and
+    # result queues and the model options; a subclass may replace it, for
+    # example with a stub model in tests
+    worker = staticmethod(_worker)
+
+    def __init__(
+        self,
+        sources,
+        workers=2,
+        live=None,
+        max_num_hands=2,
+        model_complexity=1,
+        min_detection_confidence=0.6,
+        max_width=640,
+        crop=False,
+        on_frames=3,
+        off_frames=5,
+        include_landmarks=False,
+    ):
+        self.sources = list(sources)
+        self.num_workers = workers
+        self.include_landmarks = include_landmarks
+
+        self._live = live
+        self._smoothing = (on_frames, off_frames)
+        self._options = {
+            "max_num_hands": max_num_hands,
+            "model_complexity": model_complexity,
+            "min_detection_confidence": min_detection_confidence,
+            "max_width": max_width,
+            "crop": crop,
+        }
+
+        self.events = GestureEventEmitter(GESTURES)
+
+        self._streams = []
+        self._workers = []
+        self._tasks = None
+        self._results = None
+        self._running = False
+
+        # Frames handed to a worker and not answered yet
+        self._busy = 0
+        self._next = 0
+
+        # Counters
+        self.frames_processed = 0
+        self.inference_seconds = 0.0
+
+    def start(self):
+        """
+        Starts the worker processes and waits until their models are
+        loaded; opens the streams. Returns self.
+
+        After stop(), starting again resumes the streams where they
+        were.
+        """
+        if self._workers:
+            self._running = True
+            return self
+
+        # Spawned workers start without any MediaPipe state from here
+        ctx = multiprocessing.get_context("spawn")
+        self._tasks = ctx.Queue()
+        self._results = ctx.Queue()
+        for i in range(self.num_workers):
+            worker = ctx.Process(
+                target=self.worker,
+                args=(self._tasks, self._results, self._options),
+                name=f"hands-{i}",
+                daemon=True,
+            )
+            worker.start()
+            self._workers.append(worker)
+
+        for _ in self._workers:
+            self._get()
+
+        for i, source in enumerate(self.sources):
+            live = isinstance(source, int) if self._live is None else self._live
+            self._streams.append(_Stream(
+                i, source, live, *self._smoothing, self.events.emit
+            ))
+
+        self._running = True
+        return self
+
+    def _get(self, timeout=None):
+        """
+        Returns the next worker message (None when `timeout` expires
+        first), failing if a worker died.
+        """
+        while True:
+            try:
+                return self._results.get(timeout=timeout or 1.0)
+            except queue.Empty:
+                dead = [w.name for w in self._workers if not w.is_alive()]
+                if dead:
+                    raise RuntimeError(f"Hand model workers died: {dead}")
+                if timeout is not None:
+                    return None
+
+    def _dispatch(self):
+        """
+        Hands frames to free workers, one stream after the other.
+        """
+        n = len(self._streams)
+        for _ in range(n):
+            if self._busy >= self.num_workers:
+                break
+            stream = self._streams[self._next]
+            self._next = (self._next + 1) % n
+
+            if stream.in_flight or stream.finished:
+                continue
+            frame = stream.read()
+            if frame is None:
+                continue
+
+            timestamp, ring, slot = frame
+            self._tasks.put((
+                stream.id, stream.frames, timestamp, ring.spec, slot,
+                stream.tracking,
+            ))
+            stream.frames += 1
+            stream.in_flight = (ring, slot)
+            self._busy += 1
+
+        # Overlap decoding with inference
+        for stream in self._streams:
+            if stream.in_flight:
+                stream.prefetch()
+
+    def _finish(self, payload):
+        """
+        Classifies and smooths one worker result; returns its record.
+        """
+        stream_id, frame_id, timestamp, batch, handedness, tracking, elapsed = (
+            payload
+        )
+        stream = self._streams[stream_id]
+        stream.done()
+        stream.tracking = tracking
+        self._busy -= 1
+        self.frames_processed += 1
+        self.inference_seconds += elapsed
+
+        matches = classify_batch(batch) if len(batch) else None
+        detected = (
+            matches.any(axis=0) if matches is not None
+            else np.zeros(len(GESTURES), dtype=bool)
+        )
+        stream.state.update(detected)
+        stream.timestamp = timestamp
+        stream.events.update(
+            stream.state.show, timestamp,
+            max((s for _, s in handedness), default=None),
+            stream=stream_id,
+        )
+
+        record = make_record(
+            frame_id, batch, matches, handedness,
+            timestamp_ms=timestamp * 1000.0,
+            include_landmarks=self.include_landmarks,
+        )
+        hands = record.pop("hands")
+        record["stream"] = stream_id
+        record["active"] = [
+            g for g, s in zip(GESTURES, stream.state.show[0]) if s
+        ]
+        record["hands"] = hands
+        return record
+
+    def results(self):
+        """
+        Runs the server and yields one result per processed frame, until
+        every stream has ended or stop() is called.
+        """
+        self.start()
+        try:
+            while self._running:
+                self._dispatch()
+
+                if self._busy == 0:
+                    if all(s.finished for s in self._streams):
+                        break
+                    # Cameras without a new frame yet
+                    time.sleep(0.002)
+                    continue
+
+                payload = self._get(timeout=0.05)
+                if payload is not None:
+                    yield self._finish(payload)
+
+            # Stopped: the frames in flight still get their results
+            while self._busy:
+                yield self._finish(self._get())
+        finally:
+            # The caller left the loop early: free the slots in flight
+            # so that the streams can resume
+            while self._busy:
+                self._finish(self._get())
+            self._running = False
+
+        # Gestures still shown when the streams end
+        for stream in self._streams:
+            stream.events.finish(stream.timestamp, stream=stream.id)
+
+    def __iter__(self):
+        return self.results()
+
+    def stop(self):
+        """
+        Makes results() return after yielding the results of the frames
+        in flight. May be called from any thread; start() or iterating
+        again resumes the streams.
+        """
+        self._running = False
+
+    def close(self):
+        """
+        Stops the workers and releases the streams.
+        """
+        self._running = False
+        if self._tasks is not None:
+            for _ in self._workers:
+                self._tasks.put(None)
+            for worker in self._workers:
+                worker.join(timeout=5)
+                if worker.is_alive():
+                    worker.terminate()
+        self._workers = []
+
+        for stream in self._streams:
+            stream.release()
+        self._streams = []
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Run gesture recognition on several cameras or videos "
+                    "with a shared pool of hand-model workers."
+    )
+    parser.add_argument(
+        "sources", nargs="+",
+        help="camera indices or video files"
+    )
+    parser.add_argument(
+        "-o", "--output", help="JSONL output file (default: stdout)"
+    )
+    parser.add_argument(
+        "--workers", type=int, default=2,
+        help="number of hand-model worker processes"
+    )
+    parser.add_argument("--max-hands", type=int, default=2)
+    parser.add_argument(
+        "--model-complexity", type=int, choices=(0, 1), default=1
+    )
+    parser.add_argument(
+        "--max-width", type=int, default=640,
+        help="largest inference input width"
+    )
+    parser.add_argument(
+        "--crop", action="store_true",
+        help="run the model on a crop around the last detected hands"
+    )
+    parser.add_argument(
+        "--events", action="store_true",
+        help="write gesture start/end events instead of per-frame results"
+    )
+    parser.add_argument(
+        "--landmarks", action="store_true",
+        help="include the 21 landmarks per hand"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    sources = [int(s) if s.isdigit() else s for s in args.sources]
+
+    out = open(args.output, "w") if args.output else sys.stdout
+    server = GestureServer(
+        sources,
+        workers=args.workers,
+        max_num_hands=args.max_hands,
+        model_complexity=args.model_complexity,
+        max_width=args.max_width,
+        crop=args.crop,
+        include_landmarks=args.landmarks,
+    )
+    if args.events:
+        server.events.add_listener(JsonlEventSink(out))
+    try:
+        with server:
+            for record in server:
+                if not args.events:
+                    out.write(json.dumps(record) + "\n")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+from collections import deque
+from multiprocessing import shared_memory
+
+import numpy as np
+
+
+class SharedFrameRing:
+    """
+    A ring of fixed-size BGR frame slots in shared memory, for handing
+    frames to other processes without copying them through a pipe.
+
+    The process that creates the ring owns it: it takes a free slot
+    with acquire(), fills it (write() copies a frame in, read_from()
+    decodes straight into it), sends the slot index to a consumer and
+    release()s the slot once the consumer is done with it. Consumers
+    attach() to the ring by the `spec` sent to them and read ring[slot]
+    as a NumPy view of the shared block, without a copy. Only the owner
+    keeps track of free slots; a slot must not be written while a
+    consumer still reads it.
+    """
+    def __init__(self, shape, slots=2, name=None):
+        self.shape = tuple(shape)
+        self.slots = slots
+        self.owner = name is None
+
+        size = slots * int(np.prod(self.shape))
+        self._shm = shared_memory.SharedMemory(
+            name=name, create=self.owner, size=size
+        )
+        self._frames = np.ndarray(
+            (slots,) + self.shape, dtype=np.uint8, buffer=self._shm.buf
+        )
+        self._free = deque(range(slots)) if self.owner else None
+
+    @classmethod
+    def attach(cls, spec):
+        """
+        Opens a ring created by another process, from its `spec`.
+        """
+        name, shape, slots = spec
+        return cls(shape, slots, name=name)
+
+    @property
+    def name(self):
+        return self._shm.name
+
+    @property
+    def spec(self):
+        """
+        (name, shape, slots): what attach() needs, small to send.
+        """
+        return self.name, self.shape, self.slots
+
+    def __getitem__(self, slot):
+        """
+        Returns the frame in `slot` as a view of the shared block.
+        """
+        return self._frames[slot]
+
+    @property
+    def in_use(self):
+        """
+        Number of acquired slots (owner only).
+        """
+        return self.slots - len(self._free)
+
+    def acquire(self):
+        """
+        Returns the index of a free slot, or None if all are in use.
+        """
+        return self._free.popleft() if self._free else None
+
+    def release(self, slot):
+        """
+        Returns a slot to the free list once its consumer is done.
+        """
+        self._free.append(slot)
+
+    def write(self, frame):
+        """
+        Copies a frame into a free slot; returns the slot, or None if
+        all slots are in use.
+        """
+        slot = self.acquire()
+        if slot is not None:
+            np.copyto(self._frames[slot], frame)
+        return slot
+
+    def read_from(self, cap):
+        """
+        Decodes the next frame of a cv2.VideoCapture straight into a
+        free slot. Returns (ok, slot, frame) with the decoded frame;
+        `slot` is None when the frame is not in the ring: there was no
+        free slot, no frame, or a frame of another size.
+        """
+        slot = self.acquire()
+        if slot is None:
+            ok, frame = cap.read()
+            return ok, None, frame
+
+        view = self._frames[slot]
+        ok, frame = cap.read(view)
+        if not ok or frame.shape != self.shape:
+            # OpenCV allocates a new array for frames of another size
+            self.release(slot)
+            return ok, None, frame
+        return True, slot, view
+
+    def close(self):
+        """
+        Unmaps the block; the owner also frees it.
+        """
+        if self._shm is None:
+            return
+        self._frames = None
+        self._shm.close()
+        if self.owner:
+            self._shm.unlink()
+        self._shm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
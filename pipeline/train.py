@@ -0,0 +1,141 @@
+"""
+Trains a LearnedClassifier (gestures.learned) from recorded landmarks.
+
+Inputs are landmark recordings of one gesture each, written with
+pipeline.batch --record or handTracker.main(record_path=...), given as
+PATH:CLASS, or labeled .npz files in the benchmark fixture format
+(points and per-frame labels indexing GESTURES, -1 for no gesture):
+
+Usage (from the project root):
+    python -m pipeline.train peace.lmk:PEACE fist.lmk:FIST none.lmk:NONE \\
+        -o gestures.npz
+    python -m pipeline.train benchmarks/data/*.npz -o gestures.npz
+"""
+import argparse
+import sys
+
+import numpy as np
+
+from gestures.classifier import GESTURES
+from gestures.learned import NONE, LearnedClassifier
+from pipeline.recording import LandmarkRecording
+
+
+def load_labeled(source):
+    """
+    Returns the landmarks of one training input, the class name of each
+    hand and the width / height of its frames (None when unknown).
+    Extrapolated frames of recordings are left out.
+    """
+    aspect = None
+    if source.endswith(".npz"):
+        with np.load(source) as data:
+            points = data["points"]
+            names = [GESTURES[i] if i >= 0 else NONE for i in data["labels"]]
+    else:
+        path, sep, name = source.rpartition(":")
+        if not sep:
+            raise ValueError(
+                f"Recordings need a class, as PATH:CLASS: {source}"
+            )
+        with LandmarkRecording(path) as recording:
+            # Extrapolated hands were never seen by the model
+            inferred = np.repeat(~recording.extrapolated, recording.counts)
+            points = np.array(recording.points[inferred])
+            aspect = recording.aspect
+        names = [name] * len(points)
+    return points, names, aspect
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Train a learned gesture classifier from recorded "
+                    "landmarks."
+    )
+    parser.add_argument(
+        "inputs", nargs="+",
+        help="recordings as PATH:CLASS, or labeled .npz fixtures"
+    )
+    parser.add_argument(
+        "-o", "--output", required=True, help="model file (.npz)"
+    )
+    parser.add_argument(
+        "--aspect", type=float,
+        help="width / height of the recorded frames (default: from the "
+             "recordings, else 1.0)"
+    )
+    parser.add_argument("--epochs", type=int, default=500)
+    parser.add_argument("--learning-rate", type=float, default=0.5)
+    parser.add_argument(
+        "--min-confidence", type=float, default=0.6,
+        help="probability below which a hand shows no gesture"
+    )
+    parser.add_argument(
+        "--holdout", type=float, default=0.2,
+        help="fraction of hands kept out of training to measure accuracy"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    points = []
+    names = []
+    aspects = set()
+    for source in args.inputs:
+        try:
+            p, n, aspect = load_labeled(source)
+        except (OSError, ValueError) as exc:
+            sys.exit(str(exc))
+        points.append(p)
+        names.extend(n)
+        if aspect is not None:
+            aspects.add(round(aspect, 4))
+    points = np.concatenate(points)
+
+    # One aspect ratio for all hands
+    aspect = args.aspect
+    if aspect is None:
+        if len(aspects) > 1:
+            sys.exit("Recordings have different frame sizes; pass --aspect")
+        aspect = aspects.pop() if aspects else 1.0
+
+    # Built-in gestures first, in their usual order, then new ones
+    classes = [c for c in GESTURES + (NONE,) if c in names]
+    classes += sorted(set(names) - set(classes))
+    labels = np.array([classes.index(n) for n in names], dtype=np.int64)
+
+    # Held-out hands for an accuracy estimate
+    rng = np.random.default_rng(args.seed)
+    test = rng.random(len(points)) < args.holdout
+    if test.all():
+        sys.exit("--holdout leaves no hands to train on")
+
+    model = LearnedClassifier.fit(
+        points[~test],
+        labels[~test],
+        classes,
+        aspect=aspect,
+        epochs=args.epochs,
+        learning_rate=args.learning_rate,
+        min_confidence=args.min_confidence,
+    )
+
+    print(f"{(~test).sum()} training hands, {test.sum()} held out")
+    if test.any():
+        predicted = model.predict(points[test], aspect)
+        for c, name in enumerate(classes):
+            mask = labels[test] == c
+            if mask.any():
+                accuracy = (predicted[mask] == c).mean()
+                print(f"{name:<12}{mask.sum():>7} hands {accuracy:>7.1%}")
+        print(f"{'all':<12}{test.sum():>7} hands "
+              f"{(predicted == labels[test]).mean():>7.1%}")
+
+    model.save(args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Tests of pipeline.preprocess.FramePreprocessor.
+
+Run from the project root:
+    python -m pytest tests
+"""
+import tracemalloc
+import unittest
+
+import numpy as np
+
+from pipeline.preprocess import FramePreprocessor
+
+FRAME_SIZE = (720, 1280)
+NUM_FRAMES = 20
+
+
+class FramePreprocessorTest(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.frames = [
+            rng.integers(0, 256, FRAME_SIZE + (3,), dtype=np.uint8)
+            for _ in range(4)
+        ]
+
+    def test_no_per_frame_allocations(self):
+        preprocess = FramePreprocessor()
+
+        # Warm-up: the buffers are allocated on the first frame
+        preprocess(self.frames[0])
+
+        tracemalloc.start()
+        try:
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            for i in range(NUM_FRAMES):
+                frame = self.frames[i % len(self.frames)]
+                preprocess.flip(frame)
+                preprocess.to_rgb(frame)
+            current, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        # A fresh array per call would allocate a whole frame
+        frame_bytes = self.frames[0].nbytes
+        self.assertLess((current - before) / NUM_FRAMES, frame_bytes / 100)
+        self.assertLess(peak - before, frame_bytes / 10)
+
+    def test_matches_cv2(self):
+        preprocess = FramePreprocessor()
+        frame = self.frames[0]
+
+        flipped, rgb = preprocess(frame)
+        np.testing.assert_array_equal(flipped, frame[:, ::-1])
+        np.testing.assert_array_equal(rgb, frame[:, ::-1, ::-1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+"""
+Tests of pipeline.server.GestureServer on synthetic videos.
+
+The videos are written like those of benchmarks.bench_server. Run from
+the project root:
+    python -m pytest tests
+"""
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+from benchmarks.bench_server import SCREENSHOTS, write_stream
+from pipeline.server import GestureServer
+
+NUM_STREAMS = 3
+NUM_FRAMES = 30
+
+# Workers compared with one worker in the throughput test, and the
+# fixed time the stub model takes per frame
+NUM_WORKERS = 3
+STUB_SECONDS = 0.02
+
+
+def _stub_worker(tasks, results, options):
+    """
+    Worker speaking the GestureServer protocol with a model that sleeps
+    STUB_SECONDS per frame and finds no hands. Sleeping workers overlap
+    on any number of cores, so their throughput scales deterministically.
+    """
+    results.put(None)
+    while True:
+        job = tasks.get()
+        if job is None:
+            break
+
+        stream_id, frame_id, timestamp, spec, slot, state = job
+        time.sleep(STUB_SECONDS)
+        results.put((
+            stream_id, frame_id, timestamp,
+            np.zeros((0, 21, 3), dtype=np.float32), [],
+            (None, 0), STUB_SECONDS,
+        ))
+
+
+class StubServer(GestureServer):
+    worker = staticmethod(_stub_worker)
+
+
+def throughput(paths, workers):
+    """
+    Returns the frames per second and per-stream frame counts of a
+    StubServer.
+    """
+    counts = [0] * len(paths)
+    with StubServer(paths, workers=workers) as server:
+        started = time.perf_counter()
+        for record in server:
+            counts[record["stream"]] += 1
+        elapsed = time.perf_counter() - started
+    return sum(counts) / elapsed, counts
+
+
+class GestureServerTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls._tmp = tempfile.TemporaryDirectory()
+        cls.paths = []
+        for i in range(NUM_STREAMS):
+            path = Path(cls._tmp.name) / f"stream{i}.avi"
+            write_stream(path, SCREENSHOTS[i % len(SCREENSHOTS)], NUM_FRAMES)
+            cls.paths.append(str(path))
+
+    @classmethod
+    def tearDownClass(cls):
+        cls._tmp.cleanup()
+
+    def test_workers_increase_throughput(self):
+        single_fps, single_counts = throughput(self.paths, 1)
+        pooled_fps, pooled_counts = throughput(self.paths, NUM_WORKERS)
+
+        expected = [NUM_FRAMES] * NUM_STREAMS
+        self.assertEqual(single_counts, expected)
+        self.assertEqual(pooled_counts, expected)
+
+        # One worker is bound by the stub's cost per frame; with one
+        # frame in flight per stream, the pool overlaps NUM_WORKERS
+        self.assertLess(single_fps, 1.0 / STUB_SECONDS)
+        self.assertGreater(pooled_fps, 0.5 * NUM_WORKERS * single_fps)
+
+    def test_stop_and_resume(self):
+        frames = []
+        with GestureServer(self.paths, workers=2) as server:
+            for record in server:
+                frames.append((record["stream"], record["frame"]))
+                if len(frames) == 5:
+                    server.stop()
+
+            # The frames in flight were answered and their slots freed
+            self.assertEqual(server._busy, 0)
+            self.assertTrue(all(s.in_flight is None for s in server._streams))
+
+            frames.extend((r["stream"], r["frame"]) for r in server)
+
+        self.assertEqual(len(frames), NUM_STREAMS * NUM_FRAMES)
+        self.assertEqual(len(set(frames)), len(frames))
+
+
+if __name__ == "__main__":
+    unittest.main()